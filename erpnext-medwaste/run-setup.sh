@@ -31,37 +31,24 @@ echo "🔧 Running setup scripts..."
 
 # Copy setup scripts to container
 echo "📁 Copying setup scripts to container..."
-docker compose cp setup/scripts/setup-item-categories.py backend:/home/frappe/frappe-bench/
-docker compose cp setup/scripts/setup-stock-module.py backend:/home/frappe/frappe-bench/
-docker compose cp setup/scripts/create-custom-doctypes.py backend:/home/frappe/frappe-bench/
-docker compose cp setup/scripts/setup-manufacturing-workflows.py backend:/home/frappe/frappe-bench/
-docker compose cp setup/scripts/setup-buying-module.py backend:/home/frappe/frappe-bench/
-docker compose cp setup/scripts/create-compliance-reports.py backend:/home/frappe/frappe-bench/
+docker compose cp setup/scripts/. backend:/home/frappe/frappe-bench/
 
-# Run the setup scripts in sequence
-echo "📦 Step 1/6: Setting up item categories..."
-docker compose exec backend bench --site frontend execute setup-item-categories.main
+# Report exports run as background jobs on the long-queue worker
+docker compose cp setup/scripts/. queue-long:/home/frappe/frappe-bench/
 
-echo "📊 Step 2/6: Configuring stock module..."
-docker compose exec backend bench --site frontend execute setup-stock-module.main
+# Report data and rollup maintenance run through Server Scripts
+docker compose exec backend bench set-config -g server_script_enabled 1
 
-echo "📋 Step 3/6: Creating custom doctypes..."
-docker compose exec backend bench --site frontend execute create-custom-doctypes.main
-
-echo "🔄 Migrating database after custom doctypes..."
-docker compose exec backend bench --site frontend migrate
-
-echo "🏭 Step 4/6: Setting up manufacturing workflows..."
-docker compose exec backend bench --site frontend execute setup-manufacturing-workflows.main
-
-echo "🛒 Step 5/6: Configuring buying module..."
-docker compose exec backend bench --site frontend execute setup-buying-module.main
-
-echo "📊 Step 6/6: Creating compliance reports..."
-docker compose exec backend bench --site frontend execute create-compliance-reports.main
-
-echo "🔄 Final database migration..."
-docker compose exec backend bench --site frontend migrate
+# Nothing to do when the site was set up from the same scripts, spec and
+# app versions; pass --force to run the setup anyway
+if [ "$1" != "--force" ] && docker compose exec -T backend bench --site frontend execute site_snapshot.is_provisioned | grep -q true; then
+    echo "⏭️  Site already set up from the current scripts and spec, skipping (use --force to re-run)"
+# All setup steps run in one process, in dependency order; DocTypes the
+# steps add or customize are synced in place instead of a full migrate
+elif ! docker compose exec backend bench --site frontend execute setup_pipeline.run; then
+    echo "❌ Setup failed, see the output above"
+    exit 1
+fi
 
 echo "✅ Medical waste management setup completed!"
 echo ""
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Incident Summary Report Benchmark
+Compares the legacy DATE()/JOIN query with the half-open range query at scale
+"""
+
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import frappe
+
+import report_queries
+
+BENCH_PREFIX = "BENCH-INC-"
+BENCH_EMPLOYEE_PREFIX = "BENCH-EMP-"
+
+SEVERITIES = ["Low", "Medium", "High", "Critical"]
+INCIDENT_TYPES = ["Spill", "Needlestick", "Exposure", "Improper Disposal", "Container Overflow"]
+
+# Date ranges typical of compliance reviews: a week, a month, a quarter
+RANGES = [("1 week", 7), ("1 month", 30), ("1 quarter", 91)]
+
+LEGACY_QUERY = """
+    SELECT
+        ir.incident_date,
+        ir.incident_type,
+        ir.severity,
+        ir.location,
+        ir.department,
+        e.employee_name as reported_by,
+        CASE
+            WHEN ir.docstatus = 0 THEN 'Draft'
+            WHEN ir.docstatus = 1 THEN 'Submitted'
+            ELSE 'Cancelled'
+        END as status
+    FROM `tabIncident Report` ir
+    LEFT JOIN `tabEmployee` e ON ir.reported_by = e.name
+    WHERE (%(from_date)s IS NULL OR DATE(ir.incident_date) >= %(from_date)s)
+    AND (%(to_date)s IS NULL OR DATE(ir.incident_date) <= %(to_date)s)
+    ORDER BY ir.incident_date DESC
+"""
+
+def seed(incidents=1_000_000, employees=2_000, years=5, seed_value=42):
+    """Bulk-load synthetic incidents and reporting employees"""
+
+    rng = random.Random(seed_value)
+    now = datetime.now().replace(microsecond=0)
+    span_seconds = years * 365 * 24 * 3600
+    departments = frappe.get_all("Department", pluck="name") or [None]
+
+    existing = frappe.db.count("Incident Report", {"name": ["like", f"{BENCH_PREFIX}%"]})
+    if existing >= incidents:
+        print(f"⚠️  {existing} benchmark incidents already seeded")
+        return
+
+    print(f"🌱 Seeding {employees} employees and {incidents - existing} incidents...")
+
+    employee_ids = [f"{BENCH_EMPLOYEE_PREFIX}{i:05d}" for i in range(employees)]
+    frappe.db.bulk_insert(
+        "Employee",
+        ["name", "employee_name", "first_name", "status", "creation", "modified", "owner", "modified_by"],
+        [(e, f"Bench Employee {e[-5:]}", "Bench", "Active", now, now, "Administrator", "Administrator")
+         for e in employee_ids],
+        ignore_duplicates=True
+    )
+
+    def rows(start, end):
+        for i in range(start, end):
+            yield (
+                f"{BENCH_PREFIX}{i:08d}",
+                now - timedelta(seconds=rng.randrange(span_seconds)),
+                rng.choice(employee_ids),
+                rng.choice(INCIDENT_TYPES),
+                rng.choices(SEVERITIES, weights=[60, 25, 12, 3])[0],
+                f"Room {rng.randrange(1, 400)}",
+                rng.choice(departments),
+                "Benchmark incident",
+                rng.choice([0, 1, 1, 1, 2]),
+                now, now, "Administrator", "Administrator"
+            )
+
+    # bulk_insert needs a sized sequence, so feed it one chunk at a time
+    chunk_size = 10_000
+    for start in range(existing, incidents, chunk_size):
+        frappe.db.bulk_insert(
+            "Incident Report",
+            ["name", "incident_date", "reported_by", "incident_type", "severity", "location",
+             "department", "description", "docstatus", "creation", "modified", "owner", "modified_by"],
+            list(rows(start, min(start + chunk_size, incidents))),
+            ignore_duplicates=True
+        )
+        frappe.db.commit()
+    print("✅ Seeding complete")
+
+def _time(fn, repeat):
+    timings = []
+    row_count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        row_count = len(fn())
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), row_count
+
+def run(incidents=1_000_000, repeat=5, cleanup_after=False):
+    """Seed (if needed) and time both queries for each date range
+
+        bench --site frontend execute incident_summary_benchmark.run
+        bench --site frontend execute incident_summary_benchmark.run --kwargs "{'incidents': 100000}"
+    """
+
+    seed(incidents=incidents)
+
+    print(f"\n⏱️  Incident Summary Report, {incidents} incidents, median of {repeat} runs")
+    print(f"{'Range':<12}{'Rows':>10}{'Before (s)':>14}{'After (s)':>12}{'Speedup':>10}")
+
+    today = datetime.now().date()
+    for label, days in RANGES:
+        filters = frappe._dict(from_date=today - timedelta(days=days), to_date=today)
+
+        before, before_rows = _time(
+            lambda: frappe.db.sql(LEGACY_QUERY, filters, as_dict=1), repeat
+        )
+        after, after_rows = _time(
+            lambda: report_queries._compute_incident_summary_data(filters), repeat
+        )
+
+        if before_rows != after_rows:
+            print(f"❌ Row count mismatch for {label}: {before_rows} vs {after_rows}")
+
+        speedup = before / after if after else float("inf")
+        print(f"{label:<12}{after_rows:>10}{before:>14.3f}{after:>12.3f}{speedup:>9.1f}x")
+
+    if cleanup_after:
+        cleanup()
+
+def cleanup():
+    """Remove every seeded incident and employee"""
+
+    frappe.db.sql("DELETE FROM `tabIncident Report` WHERE name LIKE %s", f"{BENCH_PREFIX}%")
+    frappe.db.sql("DELETE FROM `tabEmployee` WHERE name LIKE %s", f"{BENCH_EMPLOYEE_PREFIX}%")
+    frappe.db.commit()
+    print("🧹 Benchmark data removed")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Benchmark Suite
+Seeds a site at a chosen scale and times the compliance reports and setup scripts
+"""
+
+import contextlib
+import importlib
+import io
+import json
+import resource
+import sys
+import time
+
+import frappe
+from frappe.utils import add_days, now_datetime, today
+
+import incident_summary_benchmark
+import medical_waste_items
+import training_expiry_summary
+import waste_data_generator
+import waste_generation_rollup
+from sql_tracking import track_sql
+
+BENCH_PREFIX = "BENCH-"
+
+# (case, report, filters); date filters are resolved relative to today at run time
+REPORT_CASES = [
+    ("generation_1_year", "Medical Waste Generation Report", {"days": 365}),
+    ("generation_all", "Medical Waste Generation Report", {}),
+    ("disposal_first_page", "Waste Disposal Tracking Report", {"days": 365, "paginate": 1}),
+    ("disposal_1_year", "Waste Disposal Tracking Report", {"days": 365, "paginate": 0}),
+    ("training_summary", "Training Compliance Report", {"summary": 1}),
+    ("training_expiring", "Training Compliance Report", {"summary": 0, "expiry_bucket": "< 30 Days"}),
+    ("incident_1_month", "Incident Summary Report", {"days": 30}),
+    ("incident_1_quarter", "Incident Summary Report", {"days": 91})
+]
+
+# Setup scripts in run-setup.sh order; re-running them measures the
+# "already configured" path every deploy takes
+SETUP_SCRIPTS = [
+    "setup-item-categories",
+    "setup-stock-module",
+    "create-custom-doctypes",
+    "setup-manufacturing-workflows",
+    "setup-buying-module",
+    "create-compliance-reports"
+]
+
+# A case regresses when a latency or memory figure grows by more than the
+# threshold and by more than this absolute amount (noise on fast cases)
+MIN_LATENCY_DELTA = 0.005
+MIN_RSS_DELTA_MB = 5
+
+def seed(scale="small", **overrides):
+    """Generate the synthetic workload for a scale and refresh the derived tables
+
+        bench --site frontend execute medwaste_benchmark.seed --kwargs "{'scale': 'medium'}"
+
+    See waste_data_generator.generate: rows are bulk-inserted without
+    validation and bypass stock valuation, so use a dedicated benchmark site.
+    """
+
+    return waste_data_generator.generate(scale, **overrides)
+
+def _percentile(values, percent):
+    """Linear interpolation between closest ranks"""
+
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def _reset_peak_rss():
+    """Reset the kernel's high-water mark so the next reading is per case"""
+
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+def _peak_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+
+    # Lifetime peak, in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def _measure(fn, repeat):
+    """Run `fn` `repeat` times; latency percentiles, queries and peak RSS"""
+
+    timings = []
+    queries = []
+    row_count = None
+
+    _reset_peak_rss()
+    for _ in range(repeat):
+        with track_sql() as stats:
+            start = time.perf_counter()
+            row_count = fn()
+            timings.append(time.perf_counter() - start)
+        queries.append(stats.queries)
+
+    return {
+        "p50": round(_percentile(timings, 50), 4),
+        "p95": round(_percentile(timings, 95), 4),
+        "queries": int(_percentile(queries, 50)),
+        "peak_rss_mb": _peak_rss_mb(),
+        "rows": row_count
+    }
+
+def _report_filters(filters):
+    filters = dict(filters)
+    days = filters.pop("days", None)
+    if days:
+        filters["from_date"] = add_days(today(), -days)
+        filters["to_date"] = today()
+    return frappe._dict(filters)
+
+def _run_report(report_name, filters):
+    report = frappe.get_doc("Report", report_name)
+
+    def execute():
+        columns, data = report.execute_script_report(filters)[:2]
+        return len(data)
+
+    return execute
+
+def _run_setup_script(module_name):
+    module = importlib.import_module(module_name)
+
+    def execute():
+        with contextlib.redirect_stdout(io.StringIO()):
+            module.main()
+
+    return execute
+
+def measure_reports(repeat=5):
+    """Time every report case with the result cache bypassed"""
+
+    results = {}
+    cache_disabled = frappe.local.conf.get("medwaste_report_cache_disabled")
+    frappe.local.conf.medwaste_report_cache_disabled = 1
+    try:
+        for case, report_name, filters in REPORT_CASES:
+            print(f"⏱️  report:{case}")
+            results[f"report:{case}"] = _measure(
+                _run_report(report_name, _report_filters(filters)), repeat
+            )
+    finally:
+        frappe.local.conf.medwaste_report_cache_disabled = cache_disabled
+    return results
+
+def measure_setup_scripts(repeat=3):
+    """Time each setup script's main() on the already configured site"""
+
+    results = {}
+    # The setup profiler's tracemalloc and file writes would be timed too
+    profile_disabled = frappe.local.conf.get("medwaste_profile_disabled")
+    frappe.local.conf.medwaste_profile_disabled = 1
+    try:
+        for module_name in SETUP_SCRIPTS:
+            print(f"⏱️  setup:{module_name}")
+            results[f"setup:{module_name}"] = _measure(_run_setup_script(module_name), repeat)
+    finally:
+        frappe.local.conf.medwaste_profile_disabled = profile_disabled
+    return results
+
+def compare(baseline, current, threshold=0.2):
+    """Print a case-by-case comparison and return the regressions
+
+    `baseline` and `current` are benchmark results (or paths to their JSON).
+    Latency and peak RSS regress when they grow by more than `threshold`;
+    any increase in the query count is a regression.
+    """
+
+    if isinstance(baseline, str):
+        with open(baseline) as f:
+            baseline = json.load(f)
+    if isinstance(current, str):
+        with open(current) as f:
+            current = json.load(f)
+
+    regressions = []
+    print(f"\n{'Case':<40}{'p50 base':>10}{'p50 now':>10}{'p95 base':>10}{'p95 now':>10}"
+          f"{'queries':>12}{'RSS MB':>14}")
+
+    for case, now in current["results"].items():
+        base = baseline["results"].get(case)
+        if not base:
+            print(f"{case:<40}{'-':>10}{now['p50']:>10.3f}{'-':>10}{now['p95']:>10.3f}"
+                  f"{now['queries']:>12}{now['peak_rss_mb']:>14}  (new)")
+            continue
+
+        problems = []
+        for metric in ("p50", "p95"):
+            if (now[metric] > base[metric] * (1 + threshold)
+                    and now[metric] - base[metric] > MIN_LATENCY_DELTA):
+                problems.append(f"{metric} {base[metric]:.3f}s -> {now[metric]:.3f}s")
+        if now["queries"] > base["queries"]:
+            problems.append(f"queries {base['queries']} -> {now['queries']}")
+        if (now["peak_rss_mb"] > base["peak_rss_mb"] * (1 + threshold)
+                and now["peak_rss_mb"] - base["peak_rss_mb"] > MIN_RSS_DELTA_MB):
+            problems.append(f"peak RSS {base['peak_rss_mb']} -> {now['peak_rss_mb']} MB")
+
+        marker = "  ❌" if problems else ""
+        print(f"{case:<40}{base['p50']:>10.3f}{now['p50']:>10.3f}{base['p95']:>10.3f}{now['p95']:>10.3f}"
+              f"{str(base['queries']) + '->' + str(now['queries']):>12}"
+              f"{str(base['peak_rss_mb']) + '->' + str(now['peak_rss_mb']):>14}{marker}")
+        regressions.extend(f"{case}: {problem}" for problem in problems)
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {threshold:.0%}:")
+        for regression in regressions:
+            print(f"   {regression}")
+    else:
+        print(f"\n✅ No regressions beyond {threshold:.0%}")
+    return regressions
+
+def run(scale="small", repeat=5, output=None, baseline=None, threshold=0.2,
+        seed_data=True, include_setup=True, **overrides):
+    """Seed, measure and record a baseline; compare against one if given
+
+        bench --site frontend execute medwaste_benchmark.run
+        bench --site frontend execute medwaste_benchmark.run --kwargs "{'scale': 'medium', 'output': 'medium.json'}"
+        bench --site frontend execute medwaste_benchmark.run --kwargs "{'baseline': 'medium.json', 'scale': 'medium'}"
+
+    Exits non-zero when the comparison finds regressions, so it can gate CI.
+    """
+
+    counts = seed(scale, **overrides) if seed_data else waste_data_generator.counts_for(scale, overrides)
+
+    results = measure_reports(repeat)
+    if include_setup:
+        results.update(measure_setup_scripts(max(int(repeat) // 2, 1)))
+
+    current = {
+        "scale": scale,
+        "counts": counts,
+        "repeat": repeat,
+        "recorded_at": str(now_datetime()),
+        "frappe_version": frappe.__version__,
+        "results": results
+    }
+
+    output = output or f"medwaste_benchmark_{scale}.json"
+    with open(output, "w") as f:
+        json.dump(current, f, indent=2, default=str)
+    print(f"💾 Results written to {output}")
+
+    if baseline:
+        if compare(baseline, current, float(threshold)):
+            sys.exit(1)
+    return current
+
+def cleanup():
+    """Remove every seeded benchmark row and refresh the derived tables"""
+
+    waste_data_generator.cleanup()
+
+    # Rows seeded before the generator took over
+    prefix = f"{BENCH_PREFIX}%"
+    for doctype in ("Stock Ledger Entry", "Medical Waste Manifest Item", "Medical Waste Manifest",
+                    "Waste Container Tracking", "Training Record", "Item"):
+        while frappe.db.sql(f"SELECT 1 FROM `tab{doctype}` WHERE name LIKE %s LIMIT 1", prefix):
+            frappe.db.sql(f"DELETE FROM `tab{doctype}` WHERE name LIKE %s LIMIT 50000", prefix)
+            frappe.db.commit()
+
+    incident_summary_benchmark.cleanup()
+    medical_waste_items.rebuild()
+    waste_generation_rollup.backfill()
+    training_expiry_summary.rebuild()
+
+if __name__ == "__main__":
+    run()
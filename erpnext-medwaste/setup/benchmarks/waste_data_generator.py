@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Synthetic Data Generator
+Bulk-loads production-scale waste workloads onto the setup scripts' DocTypes
+"""
+
+import itertools
+import math
+import multiprocessing
+import os
+import random
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+import frappe
+from frappe.utils import getdate, now_datetime, today
+
+import kpi_engine
+import medical_waste_items
+import report_cache
+import training_expiry_summary
+import waste_generation_rollup
+from setup_pipeline import connect_worker
+
+PREFIX = "SYN-"
+
+# Generated items carry real-looking codes (RB-001), so they are told
+# apart by their description instead of a name prefix
+ITEM_DESCRIPTION = "Synthetic waste item"
+
+# Row counts per generated DocType; any of them can be overridden in generate()
+SCALES = {
+    "small": {
+        "items": 50, "employees": 500, "sles": 100_000, "manifests": 5_000,
+        "containers": 10_000, "trainings": 10_000, "incidents": 50_000
+    },
+    "medium": {
+        "items": 200, "employees": 2_000, "sles": 1_000_000, "manifests": 50_000,
+        "containers": 100_000, "trainings": 100_000, "incidents": 500_000
+    },
+    "large": {
+        "items": 1_000, "employees": 10_000, "sles": 10_000_000, "manifests": 500_000,
+        "containers": 1_000_000, "trainings": 1_000_000, "incidents": 1_000_000
+    }
+}
+
+# One task per chunk; a multiple of LINES_PER_VOUCHER so no voucher spans two
+CHUNK_SIZE = 10_000
+YEARS = 5
+LINES_PER_VOUCHER = 5
+
+# (code, item name, classification, hazard, treatment, share of items,
+#  share of generated volume, lognormal mu/sigma of the quantity per line)
+ITEM_FAMILIES = [
+    ("RB", "Red Biohazard Bag", "Infectious", "High", "Autoclave", 0.35, 0.55, 1.1, 0.6),
+    ("SC", "Sharps Container", "Sharps", "High", "Incineration", 0.20, 0.20, 0.4, 0.5),
+    ("YB", "Yellow Trace Chemo Bag", "Chemotherapy", "High", "Incineration", 0.12, 0.08, 0.5, 0.5),
+    ("CHEMO", "Bulk Chemotherapy Container", "Chemotherapy", "Extreme", "Incineration", 0.08, 0.03, 0.0, 0.4),
+    ("PH", "Pharmaceutical Waste Bin", "Pharmaceutical", "Medium", "Incineration", 0.15, 0.10, 0.3, 0.5),
+    ("PATH", "Pathological Waste Container", "Pathological", "High", "Incineration", 0.10, 0.04, 0.0, 0.4)
+]
+
+# Container fill cycle in days (min, max) and typical full weight by type
+CONTAINERS = {
+    "Red Bag": ((1, 3), 9.0, 0.50),
+    "Yellow Bag": ((2, 7), 6.0, 0.12),
+    "Sharps Container": ((7, 30), 4.0, 0.20),
+    "Rigid Container": ((5, 14), 15.0, 0.13),
+    "Chemotherapy Container": ((7, 21), 8.0, 0.05)
+}
+
+# Activity by hour of day: day shift peak, quiet nights
+HOUR_WEIGHTS = [1, 1, 1, 1, 1, 2, 4, 8, 10, 10, 10, 9, 8, 9, 10, 9, 8, 6, 5, 4, 3, 2, 2, 1]
+HOUR_CUM_WEIGHTS = list(itertools.accumulate(HOUR_WEIGHTS))
+
+# Saturday and Sunday run at reduced census
+WEEKDAY_WEIGHTS = [1.0, 1.0, 1.0, 1.0, 0.95, 0.55, 0.45]
+
+MANIFEST_STATUSES = ["Draft", "In Transit", "Received", "Treated", "Completed"]
+
+# (training type, renewal period in days, share of records)
+TRAININGS = [
+    ("Bloodborne Pathogen", 365, 0.35),
+    ("Personal Protective Equipment", 365, 0.20),
+    ("Waste Segregation", 365, 0.20),
+    ("Compliance Training", 365, 0.12),
+    ("Spill Response", 730, 0.08),
+    ("Hazmat Transportation", 1095, 0.05)
+]
+
+# (incident type, share, severity weights Low/Medium/High/Critical)
+INCIDENTS = [
+    ("Needlestick", 0.38, [40, 40, 17, 3]),
+    ("Improper Disposal", 0.25, [70, 25, 5, 0]),
+    ("Spill", 0.15, [55, 30, 12, 3]),
+    ("Container Overflow", 0.12, [65, 30, 5, 0]),
+    ("Exposure", 0.08, [30, 40, 22, 8]),
+    ("Transportation Incident", 0.02, [35, 35, 20, 10])
+]
+SEVERITIES = ["Low", "Medium", "High", "Critical"]
+
+# The generated history ends on this day; kept on the site so a resumed run
+# dates its chunks like the ones already loaded
+END_DATE_DEFAULT = "medwaste_synthetic_end_date"
+
+# Shared with the forked workers, which inherit it instead of unpickling it per task
+_context = None
+
+def counts_for(scale, overrides=None):
+    """Row counts for a scale, with any of them overridden"""
+
+    if scale not in SCALES:
+        frappe.throw(f"Unknown scale {scale}, expected one of {', '.join(SCALES)}")
+    counts = dict(SCALES[scale])
+    counts.update({key: int(value) for key, value in (overrides or {}).items() if key in counts})
+    return counts
+
+def _zipf_cum_weights(count, exponent=1.0):
+    """Cumulative weights where the n-th choice is 1/n^exponent as likely as the first"""
+    return list(itertools.accumulate(1 / (rank + 1) ** exponent for rank in range(count)))
+
+def _day_weights(first_day, days):
+    """Relative activity per day: weekday census, winter peak and slow growth"""
+
+    weights = []
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        seasonal = 1 + 0.12 * math.cos(2 * math.pi * (day.timetuple().tm_yday - 15) / 365)
+        growth = 1 + 0.05 * offset / 365
+        weights.append(WEEKDAY_WEIGHTS[day.weekday()] * seasonal * growth)
+    return weights
+
+def _allocate(total, weights):
+    """Cumulative event counts per day for `total` events spread by `weights`
+
+    Deterministic (largest remainder), so event n falls on the same day in
+    every chunk and every run: bisect the list to find it.
+    """
+
+    per_weight = total / sum(weights)
+    exact = [weight * per_weight for weight in weights]
+    counts = [int(value) for value in exact]
+    by_remainder = sorted(range(len(exact)), key=lambda i: counts[i] - exact[i])
+    for i in by_remainder[:total - sum(counts)]:
+        counts[i] += 1
+    return list(itertools.accumulate(counts))
+
+def _item_rows(count, item_groups, now):
+    """Item codes by family, RB-001 upwards, with their volume weights"""
+
+    items = []
+    for family in ITEM_FAMILIES:
+        code, name, classification, hazard, treatment, item_share, volume_share, mu, sigma = family
+        family_count = max(1, round(count * item_share))
+        group = f"{classification} Waste" if f"{classification} Waste" in item_groups else item_groups[0]
+        # Within a family a few codes carry most of the volume
+        popularity = [1 / (rank + 1) for rank in range(family_count)]
+        family_weight = volume_share / sum(popularity)
+        for n in range(family_count):
+            items.append(frappe._dict(
+                code=f"{code}-{n + 1:03d}", name=f"{name} {n + 1}", group=group,
+                classification=classification, hazard=hazard, treatment=treatment,
+                weight=family_weight * popularity[n], mu=mu, sigma=sigma
+            ))
+
+    rows = [
+        (item.code, item.code, item.name, ITEM_DESCRIPTION, item.group, "Nos", 1,
+         item.classification, item.hazard, item.treatment, now, now, "Administrator", "Administrator")
+        for item in items
+    ]
+    return items, rows
+
+def _end_date(end_date=None):
+    """The run's last generated day: `end_date`, else the stored one, else today"""
+
+    stored = frappe.db.get_default(END_DATE_DEFAULT)
+    if end_date and stored and getdate(end_date) != getdate(stored):
+        frappe.throw(
+            f"Synthetic rows up to {stored} are already loaded; run cleanup() before generating up to {end_date}"
+        )
+    end_date = getdate(end_date or stored or today())
+    frappe.db.set_default(END_DATE_DEFAULT, str(end_date))
+    return end_date
+
+def _build_context(counts, seed, now, end_date):
+    item_groups = frappe.db.get_descendants("Item Group", medical_waste_items.ROOT_ITEM_GROUP)
+    warehouses = frappe.get_all("Warehouse", filters={"is_group": 0}, pluck="name", order_by="name")
+    departments = frappe.get_all("Department", filters={"is_group": 0}, pluck="name", order_by="name") or [None]
+    company = frappe.defaults.get_global_default("company") or frappe.db.get_value("Company", {}, "name")
+
+    if not item_groups:
+        frappe.throw("Run setup-item-categories first: the Medical Waste item groups are missing")
+    if not warehouses:
+        frappe.throw("Run setup-item-categories first: no warehouses to post waste to")
+
+    items, item_rows = _item_rows(counts["items"], item_groups, now)
+
+    # Each employee belongs to one department; larger departments first
+    rng = random.Random(f"{seed}-employees")
+    department_weights = _zipf_cum_weights(len(departments), 0.8)
+    employees = [
+        (f"{PREFIX}EMP-{i:06d}", f"Synthetic Employee {i:06d}", rng.choices(departments, cum_weights=department_weights)[0])
+        for i in range(counts["employees"])
+    ]
+
+    # Most of a department's waste goes to its own storage area
+    home_warehouses = {department: rng.choice(warehouses) for department in departments}
+
+    last_day = end_date
+    first_day = last_day - timedelta(days=YEARS * 365 - 1)
+    day_weights = _day_weights(first_day, YEARS * 365)
+
+    return frappe._dict(
+        seed=seed, now=now, company=company, today=last_day, first_day=first_day,
+        items=items, item_rows=item_rows,
+        item_cum_weights=list(itertools.accumulate(item.weight for item in items)),
+        warehouses=warehouses, departments=departments, department_weights=department_weights,
+        home_warehouses=home_warehouses, employees=employees,
+        hauler_weights=_zipf_cum_weights(12),
+        has_posting_datetime=frappe.db.has_column("Stock Ledger Entry", "posting_datetime"),
+        voucher_days=_allocate(max(counts["sles"] // LINES_PER_VOUCHER, 1), day_weights),
+        manifest_days=_allocate(max(counts["manifests"], 1), day_weights),
+        container_days=_allocate(max(counts["containers"], 1), day_weights),
+        training_days=_allocate(max(counts["trainings"], 1), day_weights),
+        incident_days=_allocate(max(counts["incidents"], 1), day_weights)
+    )
+
+def _day(cum_counts, index):
+    return _context.first_day + timedelta(days=bisect_right(cum_counts, index))
+
+def _time_of_day(rng):
+    return timedelta(hours=rng.choices(range(24), cum_weights=HOUR_CUM_WEIGHTS)[0], minutes=rng.randrange(60))
+
+def _stock_ledger_rows(rng, start, end):
+    """Waste Generation Stock Entries with LINES_PER_VOUCHER ledger rows each"""
+
+    ctx = _context
+    now = ctx.now
+    first_voucher = start // LINES_PER_VOUCHER
+    vouchers = (end - start) // LINES_PER_VOUCHER
+    item_picks = rng.choices(ctx.items, cum_weights=ctx.item_cum_weights, k=end - start)
+
+    entries = []
+    ledger = []
+    for v in range(vouchers):
+        voucher = first_voucher + v
+        voucher_no = f"{PREFIX}STE-{voucher:08d}"
+        posting_date = _day(ctx.voucher_days, voucher)
+        posting_datetime = datetime.combine(posting_date, datetime.min.time()) + _time_of_day(rng)
+        posting_time = posting_datetime.time()
+        department = rng.choices(ctx.departments, cum_weights=ctx.department_weights)[0]
+        warehouse = ctx.home_warehouses[department] if rng.random() < 0.8 else rng.choice(ctx.warehouses)
+
+        entries.append((
+            voucher_no, voucher_no, "Waste Generation", "Material Receipt", ctx.company,
+            posting_date, posting_time, 1, now, now, "Administrator", "Administrator"
+        ))
+        for line in range(LINES_PER_VOUCHER):
+            i = voucher * LINES_PER_VOUCHER + line
+            item = item_picks[i - start]
+            row = (
+                f"{PREFIX}SLE-{i:09d}", "Stock Entry", voucher_no, item.code, warehouse,
+                posting_date, posting_time, max(1, round(rng.lognormvariate(item.mu, item.sigma))),
+                0, 1, ctx.company, department, now, now, "Administrator", "Administrator"
+            )
+            ledger.append(row + (posting_datetime,) if ctx.has_posting_datetime else row)
+
+    return [
+        ("Stock Entry",
+         ["name", "title", "stock_entry_type", "purpose", "company", "posting_date", "posting_time",
+          "docstatus", "creation", "modified", "owner", "modified_by"],
+         entries),
+        ("Stock Ledger Entry",
+         ["name", "voucher_type", "voucher_no", "item_code", "warehouse", "posting_date",
+          "posting_time", "actual_qty", "is_cancelled", "docstatus", "company",
+          "generation_department", "creation", "modified", "owner", "modified_by"]
+         + (["posting_datetime"] if ctx.has_posting_datetime else []),
+         ledger)
+    ]
+
+def _manifest_rows(rng, start, end):
+    """Manifests with 1-6 lines; the older a manifest, the further along it is"""
+
+    ctx = _context
+    now = ctx.now
+    manifests = []
+    lines = []
+    for i in range(start, end):
+        name = f"{PREFIX}MAN-{i:08d}"
+        manifest_date = _day(ctx.manifest_days, i)
+        age = (ctx.today - manifest_date).days
+        status = "Completed" if age > 30 else MANIFEST_STATUSES[min(age // 7, 3) + (rng.random() < 0.3)]
+
+        items = rng.choices(ctx.items, cum_weights=ctx.item_cum_weights, k=rng.choices(range(1, 7), weights=[20, 30, 25, 13, 8, 4])[0])
+        total_weight = 0
+        total_containers = 0
+        for idx, item in enumerate(items, 1):
+            quantity = max(1, round(rng.lognormvariate(item.mu + 1, item.sigma)))
+            weight = round(quantity * rng.uniform(4, 18), 2)
+            total_weight += weight
+            total_containers += quantity
+            lines.append((
+                f"{name}-{idx}", name, "Medical Waste Manifest", "waste_items", idx,
+                item.code, item.name, item.classification, quantity, "Nos", weight, 1,
+                now, now, "Administrator", "Administrator"
+            ))
+
+        pickup_date = manifest_date + timedelta(days=rng.randint(0, 2))
+        treatment_date = pickup_date + timedelta(days=rng.randint(1, 5)) if status in ("Treated", "Completed") else None
+        manifests.append((
+            name, name, manifest_date, status, "Synthetic General Hospital", "1 Synthetic Way",
+            f"Hauler {rng.choices(range(1, 13), cum_weights=ctx.hauler_weights)[0]}", pickup_date,
+            treatment_date, rng.choices(["Autoclave", "Incineration", "Chemical Treatment"], weights=[60, 35, 5])[0],
+            round(total_weight, 2), total_containers, 1, now, now, "Administrator", "Administrator"
+        ))
+
+    return [
+        ("Medical Waste Manifest",
+         ["name", "manifest_number", "manifest_date", "status", "generator_name", "generator_address",
+          "transporter_name", "pickup_date", "treatment_date", "treatment_method", "total_weight",
+          "total_containers", "docstatus", "creation", "modified", "owner", "modified_by"],
+         manifests),
+        ("Medical Waste Manifest Item",
+         ["name", "parent", "parenttype", "parentfield", "idx", "item_code", "item_name",
+          "waste_classification", "quantity", "uom", "weight_lbs", "docstatus",
+          "creation", "modified", "owner", "modified_by"],
+         lines)
+    ]
+
+def _container_rows(rng, start, end):
+    """One Waste Container Tracking row per fill cycle: filled, collected, treated"""
+
+    ctx = _context
+    now = ctx.now
+    types = list(CONTAINERS)
+    type_weights = [share for _days, _weight, share in CONTAINERS.values()]
+    rows = []
+    for i in range(start, end):
+        container_type = rng.choices(types, weights=type_weights)[0]
+        (min_days, max_days), full_weight, _share = CONTAINERS[container_type]
+        start_date = _day(ctx.container_days, i)
+        full_date = start_date + timedelta(days=rng.randint(min_days, max_days))
+        collection_date = full_date + timedelta(days=rng.choices([0, 1, 2, 3], weights=[50, 35, 10, 5])[0])
+        treatment_date = collection_date + timedelta(days=rng.randint(1, 4))
+
+        if ctx.today >= treatment_date:
+            status, fill_level = ("Disposed" if rng.random() < 0.9 else "Treated"), 100
+        elif ctx.today >= collection_date:
+            status, fill_level = "Collected", 100
+        elif ctx.today >= full_date:
+            status, fill_level = "Full", rng.randint(85, 100)
+        else:
+            status = "In Use"
+            fill_level = min(99, round(100 * (ctx.today - start_date).days / max((full_date - start_date).days, 1)))
+
+        department = rng.choices(ctx.departments, cum_weights=ctx.department_weights)[0]
+        rows.append((
+            f"{PREFIX}CON-{i:08d}", f"{PREFIX}CON-{i:08d}", container_type, status,
+            rng.choice(ctx.warehouses), department, f"{rng.randint(1, 9)}{rng.randint(0, 40):02d}",
+            fill_level, round(full_weight * fill_level / 100 * rng.uniform(0.7, 1.2), 2),
+            start_date, full_date if ctx.today >= full_date else None,
+            collection_date if ctx.today >= collection_date else None,
+            treatment_date if ctx.today >= treatment_date else None,
+            now, now, "Administrator", "Administrator"
+        ))
+
+    return [(
+        "Waste Container Tracking",
+        ["name", "container_id", "container_type", "status", "current_location", "department",
+         "room_number", "fill_level", "weight_kg", "start_date", "full_date", "collection_date",
+         "treatment_date", "creation", "modified", "owner", "modified_by"],
+        rows
+    )]
+
+def _training_rows(rng, start, end):
+    ctx = _context
+    now = ctx.now
+    renewals = {training: days for training, days, _share in TRAININGS}
+    rows = []
+    for i in range(start, end):
+        employee, employee_name, department = rng.choice(ctx.employees)
+        training_type = rng.choices(list(renewals), weights=[share for _t, _d, share in TRAININGS])[0]
+        training_date = _day(ctx.training_days, i)
+        expiration_date = training_date + timedelta(days=renewals[training_type])
+        days_left = (expiration_date - ctx.today).days
+        status = "Expired" if days_left < 0 else "Needs Renewal" if days_left <= 30 else "Active"
+        rows.append((
+            f"{PREFIX}TRN-{i:08d}", employee, employee_name, department, training_type,
+            training_date, expiration_date, status, round(rng.choice([1, 2, 4, 8]) * rng.uniform(0.9, 1.1), 1),
+            min(100, round(rng.gauss(88, 7))), now, now, "Administrator", "Administrator"
+        ))
+
+    return [(
+        "Training Record",
+        ["name", "employee", "employee_name", "department", "training_type", "training_date",
+         "expiration_date", "status", "training_hours", "pass_score",
+         "creation", "modified", "owner", "modified_by"],
+        rows
+    )]
+
+def _incident_rows(rng, start, end):
+    ctx = _context
+    now = ctx.now
+    types = [incident_type for incident_type, _share, _severity in INCIDENTS]
+    type_weights = [share for _t, share, _severity in INCIDENTS]
+    severity_weights = {incident_type: weights for incident_type, _share, weights in INCIDENTS}
+    rows = []
+    for i in range(start, end):
+        employee, _employee_name, department = rng.choice(ctx.employees)
+        incident_type = rng.choices(types, weights=type_weights)[0]
+        incident_date = datetime.combine(_day(ctx.incident_days, i), datetime.min.time()) + _time_of_day(rng)
+        rows.append((
+            f"{PREFIX}INC-{i:08d}", incident_date, employee, incident_type,
+            rng.choices(SEVERITIES, weights=severity_weights[incident_type])[0],
+            f"Room {rng.randint(1, 9)}{rng.randint(0, 40):02d}", department, f"Synthetic {incident_type.lower()}",
+            rng.choices([0, 1, 2], weights=[5, 93, 2])[0], now, now, "Administrator", "Administrator"
+        ))
+
+    return [(
+        "Incident Report",
+        ["name", "incident_date", "reported_by", "incident_type", "severity", "location",
+         "department", "description", "docstatus", "creation", "modified", "owner", "modified_by"],
+        rows
+    )]
+
+# What generate() loads in chunks: (count key, DocType counted to resume, name prefix, row maker)
+CHUNKED = [
+    ("sles", "Stock Ledger Entry", f"{PREFIX}SLE-", _stock_ledger_rows),
+    ("manifests", "Medical Waste Manifest", f"{PREFIX}MAN-", _manifest_rows),
+    ("containers", "Waste Container Tracking", f"{PREFIX}CON-", _container_rows),
+    ("trainings", "Training Record", f"{PREFIX}TRN-", _training_rows),
+    ("incidents", "Incident Report", f"{PREFIX}INC-", _incident_rows)
+]
+
+def _load_chunk(task):
+    """Generate and insert one chunk; runs in a worker or inline"""
+
+    key, start, end = task
+    make_rows = next(maker for name, _doctype, _prefix, maker in CHUNKED if name == key)
+
+    # Seeded per chunk, so a chunk's rows don't depend on which worker or
+    # which run produced it
+    rng = random.Random(f"{_context.seed}-{key}-{start}")
+    written = 0
+    for doctype, fields, rows in make_rows(rng, start, end):
+        frappe.db.bulk_insert(doctype, fields, rows, ignore_duplicates=True)
+        written += len(rows)
+    frappe.db.commit()
+    return key, end - start, written
+
+def _complete_chunks(doctype, prefix, total):
+    """Starts of the chunks whose rows are all in, from one grouped query
+
+    Workers finish chunks in any order, so an interrupted run can leave gaps
+    anywhere; each chunk commits once, and a count short of its size means
+    it was cut by a smaller total.
+    """
+
+    rows = frappe.db.sql(f"""
+        SELECT FLOOR(CAST(SUBSTRING(name, %(offset)s) AS UNSIGNED) / %(chunk_size)s) * %(chunk_size)s as chunk_start,
+            COUNT(*)
+        FROM `tab{doctype}`
+        WHERE name LIKE %(pattern)s
+        GROUP BY chunk_start
+    """, {"offset": len(prefix) + 1, "chunk_size": CHUNK_SIZE, "pattern": f"{prefix}%"})
+    return {
+        int(start) for start, count in rows
+        if count == min(int(start) + CHUNK_SIZE, total) - int(start)
+    }
+
+def _tasks(counts):
+    tasks = []
+    for key, doctype, prefix, _maker in CHUNKED:
+        total = counts[key]
+        complete = _complete_chunks(doctype, prefix, total)
+        missing = [start for start in range(0, total, CHUNK_SIZE) if start not in complete]
+        if not missing:
+            print(f"⚠️  {total} {doctype} rows already generated")
+            continue
+        print(f"🌱 {doctype}: generating {len(missing):,} of {math.ceil(total / CHUNK_SIZE):,} chunks")
+        tasks.extend((key, start, min(start + CHUNK_SIZE, total)) for start in missing)
+    return tasks
+
+def _run_tasks(tasks, workers):
+    """Run the chunks on `workers` processes, one database connection each"""
+
+    done = dict.fromkeys((key for key, _start, _end in tasks), 0)
+    totals = {key: sum(end - start for k, start, end in tasks if k == key) for key in done}
+    written = 0
+
+    def report(key, count, rows):
+        nonlocal written
+        done[key] += count
+        written += rows
+        if done[key] == totals[key]:
+            print(f"✅ {key}: {totals[key]:,} generated")
+
+    if workers <= 1:
+        for task in tasks:
+            report(*_load_chunk(task))
+        return written
+
+    frappe.db.commit()
+    frappe.db.close()
+    try:
+        with multiprocessing.get_context("fork").Pool(workers, initializer=connect_worker) as pool:
+            for result in pool.imap_unordered(_load_chunk, tasks):
+                report(*result)
+    finally:
+        frappe.connect()
+    return written
+
+def generate(scale="small", seed=42, workers=None, refresh=True, end_date=None, **overrides):
+    """Bulk-load a synthetic waste workload at a scale, reproducibly from `seed`
+
+        bench --site perf.local execute waste_data_generator.generate --kwargs "{'scale': 'large', 'workers': 8}"
+        bench --site perf.local execute waste_data_generator.generate --kwargs "{'scale': 'small', 'sles': 2000000}"
+
+    Items follow the RB-001 / SC-001 / YB-001 / CHEMO-001 families, with a
+    few codes per family carrying most of the volume. Dates follow weekday
+    census, a winter peak and slow growth over YEARS years. Ledger rows come
+    as Waste Generation Stock Entries of LINES_PER_VOUCHER lines each (headers
+    and Stock Ledger Entries, no Stock Entry Detail rows: the reports and the
+    rollup read the ledger). Containers get one row per fill cycle.
+
+    Rows are written with multi-row INSERTs, CHUNK_SIZE per task, by
+    `workers` processes (default: CPU count, at most 8). Each chunk is
+    seeded on its own and dated back from `end_date` (default: today), so
+    the same seed and end date give the same rows at any worker count on
+    any day. The end date is kept on the site, so an interrupted run
+    resumes where it stopped with the same dates. Nothing is validated and
+    stock valuation is bypassed: use a dedicated site.
+    """
+
+    global _context
+
+    counts = counts_for(scale, overrides)
+    seed = int(seed)
+    workers = int(workers or min(os.cpu_count() or 1, 8))
+    now = now_datetime().replace(microsecond=0)
+    started = time.perf_counter()
+
+    end_date = _end_date(end_date)
+
+    print(f"🌱 Generating {scale} waste workload (seed {seed}, up to {end_date}, {workers} workers): {counts}")
+    _context = _build_context(counts, seed, now, end_date)
+
+    frappe.db.bulk_insert(
+        "Item",
+        ["name", "item_code", "item_name", "description", "item_group", "stock_uom", "is_stock_item",
+         "waste_classification", "hazard_level", "treatment_method",
+         "creation", "modified", "owner", "modified_by"],
+        _context.item_rows, ignore_duplicates=True
+    )
+    frappe.db.bulk_insert(
+        "Employee",
+        ["name", "employee_name", "first_name", "department", "company", "status",
+         "creation", "modified", "owner", "modified_by"],
+        [(employee, employee_name, "Synthetic", department, _context.company, "Active",
+          now, now, "Administrator", "Administrator")
+         for employee, employee_name, department in _context.employees],
+        ignore_duplicates=True
+    )
+    frappe.db.commit()
+    print(f"✅ {len(_context.item_rows)} items and {len(_context.employees)} employees in place")
+
+    written = _run_tasks(_tasks(counts), workers)
+    seconds = time.perf_counter() - started
+    print(f"⏱️  {written:,} rows in {seconds:.0f}s ({written / max(seconds, 0.001):,.0f} rows/s)")
+
+    if refresh:
+        print("🔄 Refreshing derived tables...")
+        medical_waste_items.rebuild()
+        waste_generation_rollup.backfill()
+        training_expiry_summary.rebuild()
+        kpi_engine.reconcile()
+        for report_name in report_cache.REPORT_SOURCES:
+            report_cache.invalidate_report(report_name)
+
+    print("✅ Synthetic workload ready")
+    return counts
+
+def cleanup():
+    """Remove every generated row and refresh the derived tables"""
+
+    for doctype in ("Stock Ledger Entry", "Stock Entry", "Medical Waste Manifest Item",
+                    "Medical Waste Manifest", "Waste Container Tracking", "Training Record",
+                    "Incident Report", "Employee"):
+        # Batched so a 10M row ledger delete doesn't hold one huge transaction
+        while frappe.db.sql(f"SELECT 1 FROM `tab{doctype}` WHERE name LIKE %s LIMIT 1", f"{PREFIX}%"):
+            frappe.db.sql(f"DELETE FROM `tab{doctype}` WHERE name LIKE %s LIMIT 50000", f"{PREFIX}%")
+            frappe.db.commit()
+        print(f"🧹 {doctype} synthetic rows removed")
+
+    frappe.db.delete("Item", {"description": ITEM_DESCRIPTION})
+    frappe.defaults.clear_default(END_DATE_DEFAULT)
+    frappe.db.commit()
+    print("🧹 Item synthetic rows removed")
+
+    medical_waste_items.rebuild()
+    waste_generation_rollup.backfill()
+    training_expiry_summary.rebuild()
+    kpi_engine.reconcile()
+
+if __name__ == "__main__":
+    generate()
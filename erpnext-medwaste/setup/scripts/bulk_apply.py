@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Bulk Apply
+Creates the missing records of a DocType with one existence query and batched inserts
+"""
+
+import frappe
+from frappe.utils import now_datetime
+
+BATCH_SIZE = 200
+
+def key_of(record, key):
+    if isinstance(key, (list, tuple)):
+        return tuple(record.get(fieldname) for fieldname in key)
+    return record.get(key)
+
+def _folded(record_key):
+    """A key as MariaDB's case-insensitive collation compares it"""
+    if isinstance(record_key, tuple):
+        return tuple(_folded(value) for value in record_key)
+    return record_key.casefold() if isinstance(record_key, str) else record_key
+
+def existing_keys(doctype, records, key="name"):
+    """Keys among `records` that already exist, fetched in one query
+
+    `key` is the fieldname identifying a record, or a tuple of fieldnames
+    when one field is not unique on its own (e.g. ("dt", "fieldname")).
+    """
+
+    if not records:
+        return set()
+
+    fields = list(key) if isinstance(key, (list, tuple)) else [key]
+    values = list({record.get(fields[0]) for record in records})
+    rows = frappe.get_all(
+        doctype, filters={fields[0]: ["in", values]}, fields=fields, as_list=True
+    )
+    if isinstance(key, (list, tuple)):
+        return {tuple(row) for row in rows}
+    return {row[0] for row in rows}
+
+def _insert_raw(doctype, records):
+    """One multi-row INSERT for flat records: defaults and naming, no hooks"""
+
+    now = now_datetime()
+    rows = []
+    for record in records:
+        doc = frappe.new_doc(doctype)
+        doc.update(record)
+        doc.set_new_name()
+        doc.update({"creation": now, "modified": now, "owner": frappe.session.user,
+                    "modified_by": frappe.session.user, "docstatus": 0})
+        rows.append(doc.get_valid_dict(convert_dates_to_str=True, ignore_nulls=True))
+
+    columns = sorted({column for row in rows for column in row})
+    frappe.db.bulk_insert(doctype, columns, [tuple(row.get(c) for c in columns) for row in rows])
+
+def bulk_apply(doctype, records, key="name", raw=False, submit=False, batch_size=BATCH_SIZE):
+    """Create whichever of `records` don't exist yet; return created/skipped counts
+
+        bulk_apply("UOM", [{"uom_name": "Kg"}, ...], key="uom_name", raw=True)
+
+    Existence is checked for all records in one query, ignoring case as
+    the database does, so "kg" matches an existing "Kg". Missing records are
+    inserted in order, `batch_size` at a time; nothing is committed here,
+    so the calling script's rollback undoes a failed step whole. Records
+    are inserted through Document.insert() so
+    validation, naming and tree updates run; `raw=True` writes flat masters
+    that need none of that in one multi-row INSERT per batch instead.
+    `submit=True` submits each record after inserting it.
+    """
+
+    present = existing_keys(doctype, records, key)
+
+    missing = []
+    seen = {_folded(record_key) for record_key in present}
+    for record in records:
+        record_key = _folded(key_of(record, key))
+        if record_key in seen:
+            continue
+        seen.add(record_key)
+        missing.append(record)
+
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        if raw:
+            _insert_raw(doctype, batch)
+        else:
+            for record in batch:
+                doc = frappe.get_doc({"doctype": doctype, **record}).insert()
+                if submit:
+                    doc.submit()
+
+    result = frappe._dict(created=len(missing), skipped=len(records) - len(missing))
+    print(f"{'✅' if result.created else '⚠️ '} {doctype}: {result.created} created, {result.skipped} already present")
+    return result
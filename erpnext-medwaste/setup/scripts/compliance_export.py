@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Compliance Report Export
+Streams full compliance report extracts to CSV or Parquet from a background job
+"""
+
+import csv
+import hashlib
+import os
+
+import frappe
+from frappe import _
+from frappe.utils import get_datetime, getdate
+
+import report_queries
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Multi-year extracts run far past the 120s proxy timeout, so they never
+# run inside a web request
+EXPORT_QUEUE = "long"
+EXPORT_TIMEOUT = 4 * 60 * 60
+
+# Rows per Parquet row group, and how often progress is published
+CHUNK_SIZE = 10_000
+
+FILE_FORMATS = ("csv", "parquet")
+
+EXPORT_EVENT = "medwaste_export"
+
+# (fieldname, label, fieldtype) in report column order
+EXPORTS = {
+    "Medical Waste Generation Report": {
+        "doctype": "Stock Ledger Entry",
+        "rows": report_queries.iter_waste_generation_rows,
+        "columns": [
+            ("date", "Date", "Date"),
+            ("item_code", "Item Code", "Data"),
+            ("item_name", "Item Name", "Data"),
+            ("waste_classification", "Waste Type", "Data"),
+            ("qty", "Quantity", "Float"),
+            ("uom", "UOM", "Data"),
+            ("warehouse", "Location", "Data"),
+            ("department", "Department", "Data")
+        ]
+    },
+    "Waste Disposal Tracking Report": {
+        "doctype": "Medical Waste Manifest",
+        "rows": report_queries.iter_waste_disposal_rows,
+        "columns": [
+            ("manifest_number", "Manifest #", "Data"),
+            ("manifest_date", "Date", "Date"),
+            ("supplier", "Disposal Company", "Data"),
+            ("waste_type", "Waste Type", "Data"),
+            ("quantity", "Quantity", "Float"),
+            ("weight", "Weight (lbs)", "Float"),
+            ("treatment_method", "Treatment", "Data"),
+            ("status", "Status", "Data")
+        ]
+    },
+    # Always the record-level rows, whatever the report's Summary filter says
+    "Training Compliance Report": {
+        "doctype": "Training Record",
+        "rows": report_queries.iter_training_compliance_rows,
+        "columns": [
+            ("employee", "Employee", "Data"),
+            ("employee_name", "Name", "Data"),
+            ("department", "Department", "Data"),
+            ("training_type", "Training Type", "Data"),
+            ("training_date", "Training Date", "Date"),
+            ("expiration_date", "Expires", "Date"),
+            ("status", "Status", "Data"),
+            ("days_until_expiry", "Days to Expiry", "Int")
+        ]
+    },
+    "Incident Summary Report": {
+        "doctype": "Incident Report",
+        "rows": report_queries.iter_incident_summary_rows,
+        "columns": [
+            ("incident_date", "Date", "Datetime"),
+            ("incident_type", "Type", "Data"),
+            ("severity", "Severity", "Data"),
+            ("location", "Location", "Data"),
+            ("department", "Department", "Data"),
+            ("reported_by", "Reported By", "Data"),
+            ("status", "Status", "Data")
+        ]
+    }
+}
+
+def _get_export(report_name, file_format):
+    if report_name not in EXPORTS:
+        frappe.throw(_("{0} cannot be exported").format(report_name))
+    if file_format not in FILE_FORMATS:
+        frappe.throw(_("Unsupported export format: {0}").format(file_format))
+    if file_format == "parquet" and pyarrow is None:
+        frappe.throw(_("Parquet export needs pyarrow: bench pip install pyarrow"))
+
+    export = EXPORTS[report_name]
+    report_queries._check_permission(export["doctype"])
+    return export
+
+@frappe.whitelist()
+def start_export(report_name, filters=None, file_format="csv"):
+    """Queue a full export of a compliance report and return its id
+
+    Progress is published to the requesting user while the job runs; the
+    finished file is attached as a private File and announced through a
+    Notification Log with its download link.
+    """
+
+    filters = frappe.parse_json(filters) or {}
+    file_format = (file_format or "csv").lower()
+    _get_export(report_name, file_format)
+
+    export_id = frappe.generate_hash(length=10)
+    frappe.enqueue(
+        "compliance_export.run_export",
+        queue=EXPORT_QUEUE,
+        timeout=EXPORT_TIMEOUT,
+        report_name=report_name,
+        filters=filters,
+        file_format=file_format,
+        export_id=export_id
+    )
+    return export_id
+
+def _cell(value, fieldtype):
+    """Normalize a database value for the Parquet column type"""
+
+    if value is None:
+        return None
+    if fieldtype == "Float":
+        return float(value)
+    if fieldtype == "Int":
+        return int(value)
+    if fieldtype == "Date":
+        return getdate(value)
+    if fieldtype == "Datetime":
+        return get_datetime(value)
+    return str(value)
+
+def _parquet_schema(columns):
+    types = {
+        "Float": pyarrow.float64(),
+        "Int": pyarrow.int64(),
+        "Date": pyarrow.date32(),
+        "Datetime": pyarrow.timestamp("us")
+    }
+    return pyarrow.schema([
+        (fieldname, types.get(fieldtype, pyarrow.string()))
+        for fieldname, _label, fieldtype in columns
+    ])
+
+def _write_csv(path, columns, rows, on_chunk):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([label for _fieldname, label, _fieldtype in columns])
+
+        row_count = 0
+        for row in rows:
+            writer.writerow([
+                "" if row.get(fieldname) is None else row.get(fieldname)
+                for fieldname, _label, _fieldtype in columns
+            ])
+            row_count += 1
+            if row_count % CHUNK_SIZE == 0:
+                on_chunk(row_count)
+
+    return row_count
+
+def _write_parquet(path, columns, rows, on_chunk):
+    """Write one row group per CHUNK_SIZE rows so memory stays bounded"""
+
+    schema = _parquet_schema(columns)
+    row_count = 0
+
+    with pyarrow.parquet.ParquetWriter(path, schema, compression="snappy") as writer:
+        chunk = {fieldname: [] for fieldname, _label, _fieldtype in columns}
+
+        def flush():
+            writer.write_table(pyarrow.Table.from_pydict(chunk, schema=schema))
+            for values in chunk.values():
+                values.clear()
+
+        for row in rows:
+            for fieldname, _label, fieldtype in columns:
+                chunk[fieldname].append(_cell(row.get(fieldname), fieldtype))
+            row_count += 1
+            if row_count % CHUNK_SIZE == 0:
+                flush()
+                on_chunk(row_count)
+
+        if row_count % CHUNK_SIZE or not row_count:
+            flush()
+
+    return row_count
+
+def _write(path, report_name, filters, file_format, on_chunk=lambda row_count: None):
+    """Stream a report's rows into `path`; returns the number of rows written"""
+
+    export = _get_export(report_name, file_format)
+    rows = export["rows"](filters)
+    writer = _write_parquet if file_format == "parquet" else _write_csv
+
+    try:
+        return writer(path, export["columns"], rows, on_chunk)
+    except Exception:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    finally:
+        # Releases the unbuffered cursor even if the writer stopped early
+        rows.close()
+
+def _content_hash(path):
+    """MD5 of the file in blocks, as File would otherwise read it whole"""
+
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def run_export(report_name, filters, file_format, export_id):
+    """Background job behind start_export"""
+
+    user = frappe.session.user
+    file_name = f"{frappe.scrub(report_name)}-{export_id}.{file_format}"
+    path = frappe.get_site_path("private", "files", file_name)
+
+    def publish(status, **data):
+        frappe.publish_realtime(
+            EXPORT_EVENT, {"export_id": export_id, "report_name": report_name, "status": status, **data},
+            user=user
+        )
+
+    # Counted before streaming: the connection can't run queries mid-stream
+    total = report_queries.get_row_count(report_name, filters)
+    publish("Started", rows=0, total=total)
+
+    def on_chunk(row_count):
+        frappe.publish_progress(
+            min(row_count * 100 / total, 99) if total else 99,
+            title=_("Exporting {0}").format(_(report_name)),
+            description=_("{0} of {1} rows").format(row_count, total)
+        )
+
+    try:
+        row_count = _write(path, report_name, filters, file_format, on_chunk)
+    except Exception:
+        publish("Failed")
+        raise
+
+    file_doc = frappe.get_doc({
+        "doctype": "File",
+        "file_name": file_name,
+        "file_url": f"/private/files/{file_name}",
+        "is_private": 1,
+        "file_size": os.path.getsize(path),
+        "content_hash": _content_hash(path)
+    }).insert(ignore_permissions=True)
+
+    frappe.get_doc({
+        "doctype": "Notification Log",
+        "for_user": user,
+        "type": "Alert",
+        "document_type": "File",
+        "document_name": file_doc.name,
+        "subject": _("{0} export is ready ({1} rows)").format(_(report_name), row_count),
+        "email_content": f'<a href="{file_doc.file_url}">{file_name}</a>'
+    }).insert(ignore_permissions=True)
+
+    frappe.db.commit()
+    frappe.publish_progress(100, title=_("Exporting {0}").format(_(report_name)))
+    publish("Completed", rows=row_count, total=total, file_url=file_doc.file_url)
+
+def export_report(report_name, filters=None, file_format="csv", path=None):
+    """Export a report synchronously from the command line
+
+        bench --site frontend execute compliance_export.export_report --kwargs "{'report_name': 'Waste Disposal Tracking Report', 'path': '/tmp/disposal.csv'}"
+    """
+
+    file_format = file_format.lower()
+    path = path or frappe.get_site_path(
+        "private", "files", f"{frappe.scrub(report_name)}.{file_format}"
+    )
+
+    def on_chunk(row_count):
+        print(f"   ... {row_count} rows")
+
+    print(f"📤 Exporting {report_name} to {path}...")
+    row_count = _write(path, report_name, filters or {}, file_format, on_chunk)
+    print(f"✅ Exported {row_count} rows")
+    return path
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Container Full Alerts
+Evaluates fill readings as they are ingested and sends one alert per department per collection window
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import add_to_date, flt, get_datetime
+
+from doc_event_hooks import ensure_scheduled_hook
+
+STATE_TABLE = "__container_alert_state"
+QUEUE_TABLE = "__container_alert_queue"
+
+CONTAINER_DOCTYPE = "Waste Container Tracking"
+
+# The Value Change notification these alerts replace
+LEGACY_NOTIFICATION = "Container Full Alert"
+
+# A container alerts once its fill has stayed at or above FULL_AT for
+# DEBOUNCE_MINUTES, and only alerts again after dropping below CLEAR_BELOW.
+# Each can be set in site config as medwaste_container_<name>.
+FULL_AT = 80
+CLEAR_BELOW = 70
+DEBOUNCE_MINUTES = 10
+
+# Queued alerts are sent by the hourly job, one message per department
+COLLECTION_WINDOW = "Hourly"
+ALERT_ROLE = "Stock Manager"
+
+NORMAL = "Normal"
+PENDING = "Pending"
+ALERTING = "Alerting"
+
+def _setting(name, default):
+    return flt(frappe.conf.get(f"medwaste_container_{name}", default))
+
+def ensure_alert_tables():
+    """Create the per-container evaluation state and the alert queue if missing"""
+
+    frappe.db.sql_ddl(f"""
+        CREATE TABLE IF NOT EXISTS `{STATE_TABLE}` (
+            `container_id` VARCHAR(140) NOT NULL,
+            `state` VARCHAR(20) NOT NULL DEFAULT '{NORMAL}',
+            `breach_since` DATETIME(6) NULL,
+            `last_reading_time` DATETIME(6) NULL,
+            PRIMARY KEY (`container_id`)
+        ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC CHARACTER SET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    frappe.db.sql_ddl(f"""
+        CREATE TABLE IF NOT EXISTS `{QUEUE_TABLE}` (
+            `container_id` VARCHAR(140) NOT NULL,
+            `raised_at` DATETIME(6) NOT NULL,
+            `department` VARCHAR(140) NOT NULL DEFAULT '',
+            `fill_level` DECIMAL(5,2) NOT NULL,
+            PRIMARY KEY (`container_id`, `raised_at`),
+            KEY `department` (`department`)
+        ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC CHARACTER SET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+def install_alert_hooks():
+    """Send queued alerts every collection window and retire the per-save notification"""
+
+    ensure_scheduled_hook("Container Full Alerts", COLLECTION_WINDOW, "container_alerts.send_alerts")
+
+    if frappe.db.get_value("Notification", LEGACY_NOTIFICATION, "enabled"):
+        frappe.db.set_value("Notification", LEGACY_NOTIFICATION, "enabled", 0)
+        print(f"🔕 Disabled the {LEGACY_NOTIFICATION} notification")
+
+def _step(state, fill_level, reading_time, full_at, clear_below, debounce):
+    """Advance one container's state by a reading; returns True when it should alert"""
+
+    if fill_level < clear_below:
+        state.update(state=NORMAL, breach_since=None)
+        return False
+
+    if state.state == NORMAL:
+        if fill_level < full_at:
+            return False
+        state.update(state=PENDING, breach_since=reading_time)
+
+    # Between the two thresholds a pending breach holds: readings bouncing
+    # around FULL_AT neither restart nor raise it. Only a reading at or above
+    # FULL_AT once the debounce has passed raises it.
+    if (
+        state.state == PENDING
+        and fill_level >= full_at
+        and reading_time >= add_to_date(state.breach_since, minutes=debounce)
+    ):
+        state.state = ALERTING
+        return True
+    return False
+
+def evaluate(rows):
+    """Run a batch of readings through the threshold state of their containers
+
+    `rows` are (container_id, reading_time, fill_level, weight_kg) tuples as
+    container_readings.ingest stores them. The containers' states are read
+    and written back with one query each, and raised alerts queued for the
+    next collection window; readings older than the last one evaluated for
+    a container are skipped. Nothing here runs when a container is saved.
+    """
+
+    if not rows:
+        return 0
+
+    full_at = _setting("full_at", FULL_AT)
+    clear_below = _setting("clear_below", CLEAR_BELOW)
+    debounce = _setting("debounce_minutes", DEBOUNCE_MINUTES)
+
+    by_container = {}
+    for container_id, reading_time, fill_level, _weight_kg in rows:
+        by_container.setdefault(container_id, []).append((get_datetime(reading_time), flt(fill_level)))
+
+    # Locks only the state rows, so scans and saves of the containers carry on
+    states = {
+        row.container_id: row
+        for row in frappe.db.sql(f"""
+            SELECT container_id, state, breach_since, last_reading_time
+            FROM `{STATE_TABLE}`
+            WHERE container_id IN %(container_ids)s
+            FOR UPDATE
+        """, {"container_ids": list(by_container)}, as_dict=1)
+    }
+
+    alerts = []
+    for container_id, readings in by_container.items():
+        state = states.setdefault(container_id, frappe._dict(
+            container_id=container_id, state=NORMAL, breach_since=None, last_reading_time=None
+        ))
+        for reading_time, fill_level in sorted(readings):
+            if state.last_reading_time and reading_time <= get_datetime(state.last_reading_time):
+                continue
+            if _step(state, fill_level, reading_time, full_at, clear_below, debounce):
+                alerts.append([container_id, reading_time, "", fill_level])
+            state.last_reading_time = reading_time
+
+    if alerts:
+        departments = dict(frappe.get_all(
+            CONTAINER_DOCTYPE,
+            filters={"name": ["in", list({alert[0] for alert in alerts})]},
+            fields=["name", "department"],
+            as_list=True
+        ))
+        for alert in alerts:
+            alert[2] = departments.get(alert[0]) or ""
+
+    if states:
+        frappe.db.sql(f"""
+            INSERT INTO `{STATE_TABLE}` (container_id, state, breach_since, last_reading_time)
+            VALUES {", ".join(["(%s, %s, %s, %s)"] * len(states))}
+            ON DUPLICATE KEY UPDATE
+                state = VALUES(state),
+                breach_since = VALUES(breach_since),
+                last_reading_time = VALUES(last_reading_time)
+        """, [
+            value for state in states.values()
+            for value in (state.container_id, state.state, state.breach_since, state.last_reading_time)
+        ])
+
+    if alerts:
+        frappe.db.sql(f"""
+            INSERT IGNORE INTO `{QUEUE_TABLE}` (container_id, raised_at, department, fill_level)
+            VALUES {", ".join(["(%s, %s, %s, %s)"] * len(alerts))}
+        """, [value for alert in alerts for value in alert])
+
+    return len(alerts)
+
+def _recipients():
+    return frappe.get_all(
+        "Has Role",
+        filters={"role": ALERT_ROLE, "parenttype": "User", "parent": ["not in", ["Administrator", "Guest"]]},
+        pluck="parent",
+        distinct=True
+    )
+
+@frappe.whitelist()
+def send_alerts():
+    """Send the alerts queued since the last window, one message per department
+
+    Runs every collection window from a scheduled Server Script, or by hand:
+        bench --site frontend execute container_alerts.send_alerts
+    """
+
+    frappe.only_for("System Manager")
+
+    queued = frappe.db.sql(f"""
+        SELECT container_id, raised_at, department, fill_level
+        FROM `{QUEUE_TABLE}`
+        ORDER BY department, raised_at
+        FOR UPDATE
+    """, as_dict=1)
+    if not queued:
+        return 0
+
+    departments = {}
+    for alert in queued:
+        departments.setdefault(alert.department, []).append(alert)
+
+    recipients = _recipients()
+    for department, alerts in departments.items():
+        lines = "".join(
+            f"<li>{frappe.utils.escape_html(alert.container_id)}: {flt(alert.fill_level, 1)}% "
+            f"(since {alert.raised_at:%H:%M})</li>"
+            for alert in alerts
+        )
+        subject = _("{0} containers need collection in {1}").format(
+            len(alerts), department or _("no department")
+        )
+        for user in recipients:
+            frappe.get_doc({
+                "doctype": "Notification Log",
+                "for_user": user,
+                "type": "Alert",
+                "document_type": CONTAINER_DOCTYPE,
+                "document_name": alerts[0].container_id,
+                "subject": subject,
+                "email_content": f"<ul>{lines}</ul>"
+            }).insert(ignore_permissions=True)
+
+    frappe.db.sql(
+        f"DELETE FROM `{QUEUE_TABLE}` WHERE raised_at <= %s", max(alert.raised_at for alert in queued)
+    )
+    frappe.db.commit()
+
+    print(f"🔔 Sent {len(queued)} container alerts in {len(departments)} department messages")
+    return len(departments)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Container Board
+Redis index of the containers in use or full, by department, location and status, behind the live board
+"""
+
+import json
+
+import frappe
+from frappe import _
+
+CONTAINER_DOCTYPE = "Waste Container Tracking"
+
+# Containers on the board; the rest are dropped from the index
+BOARD_STATUSES = ["In Use", "Full"]
+
+BOARD_FIELDS = [
+    "name", "container_type", "status", "department", "current_location", "room_number",
+    "fill_level", "last_reading_at", "fill_rate", "predicted_full_at", "assigned_to"
+]
+
+KEY_PREFIX = "medwaste:container_board"
+
+# Redis calls go through pipelines, which take these site-prefixed keys as
+# they are; the cache wrapper's own hash and set helpers would prefix them again
+def _key(*parts):
+    return frappe.cache.make_key(":".join((KEY_PREFIX, *parts)))
+
+def _department_key(department):
+    """Hash of container_id -> board entry for one department"""
+    return _key("department", department or "")
+
+def _location_key(location):
+    """Set of the container_ids at one location"""
+    return _key("location", location or "")
+
+def _status_key(status):
+    """Set of the container_ids in one status"""
+    return _key("status", status)
+
+def _placement_key():
+    """Hash of container_id -> the department, location and status it is indexed under"""
+    return _key("placement")
+
+def _built_key():
+    return _key("built")
+
+def _is_built():
+    return frappe.cache.pipeline().exists(_built_key()).execute()[0]
+
+def _entry(row):
+    return json.dumps({
+        "container_id": row.name,
+        "container_type": row.container_type,
+        "status": row.status,
+        "department": row.department,
+        "location": row.current_location,
+        "room_number": row.room_number,
+        "fill_level": row.fill_level,
+        "last_reading_at": str(row.last_reading_at) if row.last_reading_at else None,
+        "fill_rate": row.fill_rate,
+        "predicted_full_at": str(row.predicted_full_at) if row.predicted_full_at else None,
+        "assigned_to": row.assigned_to
+    })
+
+def _add(pipe, row):
+    pipe.hset(_department_key(row.department), row.name, _entry(row))
+    pipe.sadd(_location_key(row.current_location), row.name)
+    pipe.sadd(_status_key(row.status), row.name)
+    pipe.hset(_placement_key(), row.name, json.dumps([row.department, row.current_location, row.status]))
+
+def _remove(pipe, name, placement):
+    department, location, status = json.loads(placement)
+    pipe.hdel(_department_key(department), name)
+    pipe.srem(_location_key(location), name)
+    pipe.srem(_status_key(status), name)
+    pipe.hdel(_placement_key(), name)
+
+def refresh(container_ids):
+    """Move the containers to where their current state puts them on the board
+
+    One query for the containers and one Redis round trip each to read their
+    old placement and to write the new one, whatever the number of ids.
+    """
+
+    if not container_ids or not _is_built():
+        # Not built yet: the first read builds it from scratch
+        return
+
+    container_ids = list(container_ids)
+    rows = {
+        row.name: row
+        for row in frappe.get_all(
+            CONTAINER_DOCTYPE,
+            filters={"name": ["in", container_ids], "status": ["in", BOARD_STATUSES]},
+            fields=BOARD_FIELDS
+        )
+    }
+    placements = frappe.cache.pipeline().hmget(_placement_key(), container_ids).execute()[0]
+
+    pipe = frappe.cache.pipeline()
+    for name, placement in zip(container_ids, placements):
+        if placement is not None:
+            _remove(pipe, name, placement)
+        if name in rows:
+            _add(pipe, rows[name])
+    pipe.execute()
+
+def refresh_after_commit(container_ids):
+    """Refresh the containers once the current transaction commits"""
+
+    container_ids = list(container_ids)
+    frappe.db.after_commit.add(lambda: refresh(container_ids))
+
+def _build():
+    pipe = frappe.cache.pipeline()
+    for key in frappe.cache.scan_iter(match=_key("*")):
+        pipe.delete(key)
+    for row in frappe.get_all(CONTAINER_DOCTYPE, filters={"status": ["in", BOARD_STATUSES]}, fields=BOARD_FIELDS):
+        _add(pipe, row)
+    pipe.set(_built_key(), 1)
+    pipe.execute()
+
+@frappe.whitelist()
+def rebuild():
+    """Drop the board index and load it again from one query
+
+        bench --site frontend execute container_board.rebuild
+    """
+
+    frappe.only_for("System Manager")
+
+    _build()
+    count = frappe.cache.pipeline().hlen(_placement_key()).execute()[0]
+    print(f"✅ Container board rebuilt ({count} containers)")
+    return count
+
+def _ensure_built():
+    if not _is_built():
+        _build()
+
+@frappe.whitelist()
+def get_board(department=None, location=None, status=None):
+    """Containers in use or full, for a department, a location or both
+
+        GET /api/method/container_board.get_board?department=Oncology - MW&status=Full
+
+    A department's board is one HVALS of its hash, so its cost follows the
+    department's containers, not the site's; a location alone is looked up
+    through its set. Neither reads tabWaste Container Tracking. Entries are
+    sorted by room and container.
+    """
+
+    frappe.has_permission(CONTAINER_DOCTYPE, "read", throw=True)
+    if department is None and location is None:
+        frappe.throw(_("Pick a department or a location"))
+    if status and status not in BOARD_STATUSES:
+        frappe.throw(_("The board only shows containers that are {0}").format(", ".join(BOARD_STATUSES)))
+
+    _ensure_built()
+
+    if department is not None:
+        values = frappe.cache.pipeline().hvals(_department_key(department)).execute()[0]
+        entries = [json.loads(value) for value in values]
+    else:
+        container_ids = [
+            frappe.safe_decode(name)
+            for name in frappe.cache.pipeline().smembers(_location_key(location)).execute()[0]
+        ]
+        placements = frappe.cache.pipeline().hmget(_placement_key(), container_ids).execute()[0] if container_ids else []
+        pipe = frappe.cache.pipeline()
+        for name, placement in zip(container_ids, placements):
+            if placement is not None:
+                pipe.hget(_department_key(json.loads(placement)[0]), name)
+        entries = [json.loads(value) for value in pipe.execute() if value is not None]
+
+    entries = [
+        entry for entry in entries
+        if (location is None or entry["location"] == location) and (not status or entry["status"] == status)
+    ]
+    return sorted(entries, key=lambda entry: (entry["room_number"] or "", entry["container_id"]))
+
+@frappe.whitelist()
+def get_counts():
+    """Number of containers in each board status, from the status sets"""
+
+    frappe.has_permission(CONTAINER_DOCTYPE, "read", throw=True)
+    _ensure_built()
+
+    pipe = frappe.cache.pipeline()
+    for status in BOARD_STATUSES:
+        pipe.scard(_status_key(status))
+    return dict(zip(BOARD_STATUSES, pipe.execute()))
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Container Readings
+Append-only fill readings per container, downsampled to hourly and daily aggregates as they age
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, cint, flt, get_datetime, getdate, now_datetime
+
+import container_alerts
+import container_board
+from doc_event_hooks import ensure_scheduled_hook
+
+READINGS_TABLE = "__container_readings"
+HOURLY_TABLE = "__container_readings_hourly"
+DAILY_TABLE = "__container_readings_daily"
+
+CONTAINER_DOCTYPE = "Waste Container Tracking"
+
+# Raw readings older than this are folded into hourly rows, hourly rows
+# older than HOURLY_RETENTION_DAYS into daily ones; daily rows are kept
+RAW_RETENTION_DAYS = 7
+HOURLY_RETENTION_DAYS = 90
+
+INSERT_BATCH_SIZE = 1000
+
+# Aggregate columns shared by the hourly and daily tables; sums rather than
+# averages, so rows for the same period merge by adding up
+AGGREGATE_COLUMNS = """
+    `readings` INT NOT NULL DEFAULT 0,
+    `fill_min` DECIMAL(5,2) NOT NULL DEFAULT 0,
+    `fill_max` DECIMAL(5,2) NOT NULL DEFAULT 0,
+    `fill_sum` DECIMAL(18,2) NOT NULL DEFAULT 0,
+    `weight_max` DECIMAL(12,3) NOT NULL DEFAULT 0,
+    `weight_sum` DECIMAL(21,3) NOT NULL DEFAULT 0,
+"""
+
+MERGE_AGGREGATES = """
+    readings = readings + VALUES(readings),
+    fill_min = LEAST(fill_min, VALUES(fill_min)),
+    fill_max = GREATEST(fill_max, VALUES(fill_max)),
+    fill_sum = fill_sum + VALUES(fill_sum),
+    weight_max = GREATEST(weight_max, VALUES(weight_max)),
+    weight_sum = weight_sum + VALUES(weight_sum)
+"""
+
+def ensure_readings_tables():
+    """Create the raw readings table and its hourly and daily aggregates if missing
+
+    Raw rows are keyed by container and reading time, so a batch sent twice
+    is only stored once.
+    """
+
+    frappe.db.sql_ddl(f"""
+        CREATE TABLE IF NOT EXISTS `{READINGS_TABLE}` (
+            `container_id` VARCHAR(140) NOT NULL,
+            `reading_time` DATETIME(6) NOT NULL,
+            `fill_level` DECIMAL(5,2) NOT NULL,
+            `weight_kg` DECIMAL(12,3) NOT NULL DEFAULT 0,
+            PRIMARY KEY (`container_id`, `reading_time`),
+            KEY `reading_time` (`reading_time`)
+        ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC CHARACTER SET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    frappe.db.sql_ddl(f"""
+        CREATE TABLE IF NOT EXISTS `{HOURLY_TABLE}` (
+            `container_id` VARCHAR(140) NOT NULL,
+            `period_start` DATETIME NOT NULL,
+            {AGGREGATE_COLUMNS}
+            PRIMARY KEY (`container_id`, `period_start`),
+            KEY `period_start` (`period_start`)
+        ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC CHARACTER SET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    frappe.db.sql_ddl(f"""
+        CREATE TABLE IF NOT EXISTS `{DAILY_TABLE}` (
+            `container_id` VARCHAR(140) NOT NULL,
+            `period_start` DATE NOT NULL,
+            {AGGREGATE_COLUMNS}
+            PRIMARY KEY (`container_id`, `period_start`),
+            KEY `period_start` (`period_start`)
+        ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC CHARACTER SET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+def install_readings_hooks():
+    """Downsample aging readings every hour"""
+
+    ensure_scheduled_hook("Container Readings Downsample", "Hourly", "container_readings.downsample")
+
+def _rowcount():
+    cursor = getattr(frappe.db, "_cursor", None)
+    return max(cint(getattr(cursor, "rowcount", 0)), 0)
+
+def _parse(reading, known):
+    """A reading as a row tuple, or the reason it is rejected"""
+
+    container_id = reading.get("container_id")
+    if container_id not in known:
+        return None, _("Unknown container: {0}").format(container_id)
+
+    fill_level = flt(reading.get("fill_level"), 2)
+    if not 0 <= fill_level <= 100:
+        return None, _("Fill level must be between 0 and 100, got {0}").format(reading.get("fill_level"))
+
+    weight_kg = flt(reading.get("weight_kg"), 3)
+    if weight_kg < 0:
+        return None, _("Weight cannot be negative, got {0}").format(reading.get("weight_kg"))
+
+    try:
+        reading_time = get_datetime(reading.get("reading_time")) if reading.get("reading_time") else now_datetime()
+    except Exception:
+        return None, _("Invalid reading time: {0}").format(reading.get("reading_time"))
+
+    return (container_id, reading_time, fill_level, weight_kg), None
+
+def _refresh_latest(container_ids):
+    """Copy each container's newest reading onto its document, if newer than the cached one
+
+    A direct UPDATE: the cached value is not a change worth a Version or a
+    new `modified`, and a form saved with a stale value is corrected by the
+    next reading.
+    """
+
+    frappe.db.sql(f"""
+        UPDATE `tab{CONTAINER_DOCTYPE}` c
+        JOIN (
+            SELECT r.container_id, r.reading_time, r.fill_level, r.weight_kg
+            FROM `{READINGS_TABLE}` r
+            JOIN (
+                SELECT container_id, MAX(reading_time) AS reading_time
+                FROM `{READINGS_TABLE}`
+                WHERE container_id IN %(container_ids)s
+                GROUP BY container_id
+            ) newest ON newest.container_id = r.container_id AND newest.reading_time = r.reading_time
+        ) latest ON latest.container_id = c.name
+        SET c.fill_level = latest.fill_level,
+            c.weight_kg = latest.weight_kg,
+            c.last_reading_at = latest.reading_time
+        WHERE c.last_reading_at IS NULL OR c.last_reading_at < latest.reading_time
+    """, {"container_ids": container_ids})
+
+@frappe.whitelist()
+def ingest(readings):
+    """Append a batch of fill readings and refresh each container's latest value
+
+        POST /api/method/container_readings.ingest
+        {"readings": [{"container_id": "RB-0001", "reading_time": "2024-05-01 10:15:00",
+                       "fill_level": 62.5, "weight_kg": 3.1}, ...]}
+
+    Containers are checked in one query and the readings written with
+    multi-row INSERTs; readings already stored are skipped. Invalid readings
+    are returned with their position in the batch instead of failing it.
+    The batch then goes through the container full alert evaluator.
+    """
+
+    frappe.has_permission(CONTAINER_DOCTYPE, "write", throw=True)
+
+    if isinstance(readings, str):
+        readings = frappe.parse_json(readings)
+    readings = readings or []
+
+    container_ids = list({reading.get("container_id") for reading in readings if reading.get("container_id")})
+    known = set(frappe.get_all(
+        CONTAINER_DOCTYPE, filters={"name": ["in", container_ids]}, pluck="name"
+    )) if container_ids else set()
+
+    rows = []
+    rejected = []
+    for index, reading in enumerate(readings):
+        row, error = _parse(frappe._dict(reading), known)
+        if error:
+            rejected.append({"index": index, "container_id": reading.get("container_id"), "error": error})
+        else:
+            rows.append(row)
+
+    inserted = 0
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        batch = rows[start:start + INSERT_BATCH_SIZE]
+        frappe.db.sql(f"""
+            INSERT IGNORE INTO `{READINGS_TABLE}` (container_id, reading_time, fill_level, weight_kg)
+            VALUES {", ".join(["(%s, %s, %s, %s)"] * len(batch))}
+        """, [value for row in batch for value in row])
+        inserted += _rowcount()
+
+    alerts = 0
+    if rows:
+        container_ids = list({row[0] for row in rows})
+        _refresh_latest(container_ids)
+        container_board.refresh_after_commit(container_ids)
+        alerts = container_alerts.evaluate(rows)
+
+    return {"inserted": inserted, "duplicates": len(rows) - inserted, "alerts": alerts, "rejected": rejected}
+
+def _fold_raw(cutoff):
+    """Move raw readings before `cutoff` into the hourly table, a day at a time
+
+    Each day is aggregated and deleted in one transaction; a late reading
+    written into a day being folded waits for the commit and is picked up
+    by the next run.
+    """
+
+    folded = 0
+    while True:
+        oldest = frappe.db.sql(
+            f"SELECT MIN(reading_time) FROM `{READINGS_TABLE}` WHERE reading_time < %s", cutoff
+        )[0][0]
+        if not oldest:
+            return folded
+
+        params = {"from_time": oldest, "to_time": min(get_datetime(add_days(getdate(oldest), 1)), cutoff)}
+        frappe.db.sql(f"""
+            INSERT INTO `{HOURLY_TABLE}`
+                (container_id, period_start, readings, fill_min, fill_max, fill_sum, weight_max, weight_sum)
+            SELECT
+                container_id,
+                TIMESTAMP(DATE(reading_time), MAKETIME(HOUR(reading_time), 0, 0)),
+                COUNT(*), MIN(fill_level), MAX(fill_level), SUM(fill_level), MAX(weight_kg), SUM(weight_kg)
+            FROM `{READINGS_TABLE}`
+            WHERE reading_time >= %(from_time)s AND reading_time < %(to_time)s
+            GROUP BY container_id, TIMESTAMP(DATE(reading_time), MAKETIME(HOUR(reading_time), 0, 0))
+            ON DUPLICATE KEY UPDATE {MERGE_AGGREGATES}
+        """, params)
+        frappe.db.sql(f"""
+            DELETE FROM `{READINGS_TABLE}`
+            WHERE reading_time >= %(from_time)s AND reading_time < %(to_time)s
+        """, params)
+        folded += _rowcount()
+        frappe.db.commit()
+
+def _fold_hourly(cutoff):
+    """Move hourly rows before `cutoff` into the daily table in one transaction"""
+
+    params = {"cutoff": cutoff}
+    frappe.db.sql(f"""
+        INSERT INTO `{DAILY_TABLE}`
+            (container_id, period_start, readings, fill_min, fill_max, fill_sum, weight_max, weight_sum)
+        SELECT
+            container_id, DATE(period_start),
+            SUM(readings), MIN(fill_min), MAX(fill_max), SUM(fill_sum), MAX(weight_max), SUM(weight_sum)
+        FROM `{HOURLY_TABLE}`
+        WHERE period_start < %(cutoff)s
+        GROUP BY container_id, DATE(period_start)
+        ON DUPLICATE KEY UPDATE {MERGE_AGGREGATES}
+    """, params)
+    frappe.db.sql(f"DELETE FROM `{HOURLY_TABLE}` WHERE period_start < %(cutoff)s", params)
+    folded = _rowcount()
+    frappe.db.commit()
+    return folded
+
+@frappe.whitelist()
+def downsample(raw_days=RAW_RETENTION_DAYS, hourly_days=HOURLY_RETENTION_DAYS):
+    """Fold aging raw readings into hourly rows and aging hourly rows into daily ones
+
+    Runs hourly from a scheduled Server Script, or by hand:
+        bench --site frontend execute container_readings.downsample
+
+    Cutoffs fall on day boundaries, so a period is never split between the
+    raw and the aggregated tables.
+    """
+
+    frappe.only_for("System Manager")
+
+    today = getdate(now_datetime())
+    raw = _fold_raw(get_datetime(add_days(today, -int(raw_days))))
+    hourly = _fold_hourly(get_datetime(add_days(today, -int(hourly_days))))
+    print(f"✅ Downsampled {raw} raw readings and {hourly} hourly rows")
+    return {"raw": raw, "hourly": hourly}
+
+@frappe.whitelist()
+def get_series(container_id, from_time=None, to_time=None):
+    """A container's fill history, oldest first, at the finest resolution still kept
+
+    Daily and hourly rows carry the period's average fill and maximum
+    weight; raw readings are returned as recorded.
+    """
+
+    frappe.has_permission(CONTAINER_DOCTYPE, "read", doc=container_id, throw=True)
+
+    params = {
+        "container_id": container_id,
+        "from_time": get_datetime(from_time) if from_time else get_datetime("1900-01-01"),
+        "to_time": get_datetime(to_time) if to_time else now_datetime()
+    }
+    return frappe.db.sql(f"""
+        SELECT 'Daily' AS resolution, TIMESTAMP(period_start) AS reading_time,
+            fill_sum / readings AS fill_level, weight_max AS weight_kg, readings
+        FROM `{DAILY_TABLE}`
+        WHERE container_id = %(container_id)s
+        AND period_start BETWEEN DATE(%(from_time)s) AND %(to_time)s
+        UNION ALL
+        SELECT 'Hourly', period_start, fill_sum / readings, weight_max, readings
+        FROM `{HOURLY_TABLE}`
+        WHERE container_id = %(container_id)s
+        AND period_start BETWEEN %(from_time)s AND %(to_time)s
+        UNION ALL
+        SELECT 'Raw', reading_time, fill_level, weight_kg, 1
+        FROM `{READINGS_TABLE}`
+        WHERE container_id = %(container_id)s
+        AND reading_time BETWEEN %(from_time)s AND %(to_time)s
+        ORDER BY reading_time
+    """, params, as_dict=1)
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Container Scans
+Applies batches of QR/RFID pickup and drop-off scans to Waste Container Tracking in one transaction
+"""
+
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import cint, get_datetime, getdate, now_datetime
+
+import container_board
+from doc_event_hooks import ensure_doc_event_hook
+
+CONTAINER_DOCTYPE = "Waste Container Tracking"
+
+# Redis hash of container_id -> {"status", "location", "department"}
+INDEX_KEY = "medwaste:container_index"
+
+# Hooks keep the index current; the expiry only bounds how long an entry
+# missed by them can survive
+INDEX_TTL = 24 * 60 * 60
+
+INDEX_FIELDS = ["name", "status", "current_location", "department"]
+
+# Statuses a container may move to from each status. Scanning a container
+# into the status it already has only moves it.
+TRANSITIONS = {
+    "Empty": ["In Use"],
+    "In Use": ["Full", "Collected"],
+    "Full": ["Collected"],
+    "Collected": ["Treated", "Disposed"],
+    "Treated": ["Disposed"],
+    "Disposed": ["Empty"]
+}
+
+# Date field stamped with the scan date on entering a status
+STATUS_DATES = {
+    "In Use": "start_date",
+    "Full": "full_date",
+    "Collected": "collection_date",
+    "Treated": "treatment_date"
+}
+
+def _index_key():
+    return frappe.cache.make_key(INDEX_KEY)
+
+def _entry(row):
+    return {"status": row.status or "Empty", "location": row.current_location, "department": row.department}
+
+def _write_entries(entries, replace=False):
+    """Set index entries in one round trip; `replace` drops the rest of the index first"""
+
+    key = _index_key()
+    pipe = frappe.cache.pipeline()
+    if replace:
+        pipe.delete(key)
+    if entries:
+        pipe.hset(key, mapping={name: json.dumps(entry) for name, entry in entries.items()})
+    if replace:
+        pipe.expire(key, INDEX_TTL)
+    pipe.execute()
+
+def _drop_entries(names):
+    if names:
+        frappe.cache.pipeline().hdel(_index_key(), *names).execute()
+
+def install_index_hooks():
+    """Keep the container index current as containers are created, edited or deleted"""
+
+    for event in ("After Insert", "After Save", "After Delete"):
+        ensure_doc_event_hook(
+            f"Container Index {event}", CONTAINER_DOCTYPE, event,
+            "container_scans.sync_container"
+        )
+
+def _build_index():
+    rows = frappe.get_all(CONTAINER_DOCTYPE, fields=INDEX_FIELDS)
+    _write_entries({row.name: _entry(row) for row in rows}, replace=True)
+    return len(rows)
+
+@frappe.whitelist()
+def rebuild_index():
+    """Load every container into the index from one query
+
+        bench --site frontend execute container_scans.rebuild_index
+    """
+
+    frappe.only_for("System Manager")
+
+    count = _build_index()
+    print(f"✅ Container index rebuilt ({count} containers)")
+    return count
+
+@frappe.whitelist()
+def sync_container(doctype, name):
+    """Refresh one container's index and board entries from the database"""
+
+    if doctype != CONTAINER_DOCTYPE:
+        return
+
+    row = frappe.db.get_value(CONTAINER_DOCTYPE, name, INDEX_FIELDS, as_dict=True)
+    if row:
+        _write_entries({name: _entry(row)})
+    else:
+        _drop_entries([name])
+    container_board.refresh([name])
+
+def get_containers(container_ids):
+    """Index entries for the containers, read from Redis in one round trip
+
+    Built on first use. Ids missing from the index are looked up in one
+    query and added, so a container created while a hook failed is found
+    anyway; ids missing from both are left out.
+    """
+
+    if not container_ids:
+        return {}
+
+    key = _index_key()
+    exists, values = frappe.cache.pipeline().exists(key).hmget(key, container_ids).execute()
+    if not exists:
+        _build_index()
+        values = frappe.cache.pipeline().hmget(key, container_ids).execute()[0]
+
+    found = {name: json.loads(value) for name, value in zip(container_ids, values) if value is not None}
+
+    missing = [name for name in container_ids if name not in found]
+    if missing:
+        added = {
+            row.name: _entry(row)
+            for row in frappe.get_all(CONTAINER_DOCTYPE, filters={"name": ["in", missing]}, fields=INDEX_FIELDS)
+        }
+        _write_entries(added)
+        found.update(added)
+
+    return found
+
+def _validate(event, container, locations):
+    """The error that keeps a scan from applying to the container's current state, if any"""
+
+    if not container:
+        return _("Unknown container: {0}").format(event.container_id)
+    if event.status and event.status not in TRANSITIONS:
+        return _("Unknown status: {0}").format(event.status)
+    if event.location and event.location not in locations:
+        return _("Unknown location: {0}").format(event.location)
+    if event.status and event.status != container.status and event.status not in TRANSITIONS[container.status]:
+        return _("Cannot move a container from {0} to {1}").format(container.status, event.status)
+
+def _plan(events, containers, locations):
+    """Replay the scans in time order against the indexed state
+
+    Returns the per-event results and, per container, its indexed status
+    and the field values after its last valid scan.
+    """
+
+    results = [None] * len(events)
+    changes = {}
+    state = {name: frappe._dict(entry) for name, entry in containers.items()}
+
+    for index in sorted(range(len(events)), key=lambda i: (events[i].timestamp or now_datetime(), i)):
+        event = events[index]
+        result = {"index": index, "container_id": event.container_id}
+        results[index] = result
+
+        if event.error:
+            result.update(result="rejected", error=event.error)
+            continue
+
+        container = state.get(event.container_id)
+        error = _validate(event, container, locations)
+        if error:
+            result.update(result="rejected", error=error)
+            continue
+
+        values = {}
+        if event.status and event.status != container.status:
+            values["status"] = event.status
+            if event.status in STATUS_DATES:
+                values[STATUS_DATES[event.status]] = getdate(event.timestamp)
+        if event.location and event.location != container.location:
+            values["current_location"] = event.location
+        if event.collected_by:
+            values["collected_by"] = event.collected_by
+
+        if not values:
+            result["result"] = "unchanged"
+            continue
+
+        change = changes.setdefault(event.container_id, frappe._dict(
+            indexed_status=containers[event.container_id]["status"], values={}, events=[]
+        ))
+        change.values.update(values)
+        change.events.append(result)
+        container.status = values.get("status", container.status)
+        container.location = values.get("current_location", container.location)
+        result["result"] = "applied"
+
+    return results, changes, state
+
+def _write(changes, now):
+    """Apply the planned values with one UPDATE per distinct change
+
+    Containers sharing a route usually share their new values, so a cart
+    of 200 scans is a handful of statements. Each UPDATE only matches
+    containers still in the status the index gave; the rest are returned
+    as conflicts.
+    """
+
+    groups = {}
+    for name, change in changes.items():
+        groups.setdefault((change.indexed_status, tuple(sorted(change.values.items()))), []).append(name)
+
+    conflicts = []
+    for (indexed_status, values), names in groups.items():
+        assignments = ", ".join(f"`{fieldname}` = %(v_{fieldname})s" for fieldname, _value in values)
+        params = {f"v_{fieldname}": value for fieldname, value in values}
+        params.update(names=names, indexed_status=indexed_status, now=now, user=frappe.session.user)
+
+        frappe.db.sql(f"""
+            UPDATE `tab{CONTAINER_DOCTYPE}`
+            SET {assignments}, modified = %(now)s, modified_by = %(user)s
+            WHERE name IN %(names)s AND IFNULL(NULLIF(status, ''), 'Empty') = %(indexed_status)s
+        """, params)
+
+        cursor = getattr(frappe.db, "_cursor", None)
+        if cint(getattr(cursor, "rowcount", 0)) < len(names):
+            updated = set(frappe.get_all(
+                CONTAINER_DOCTYPE, filters={"name": ["in", names], "modified": now}, pluck="name"
+            ))
+            conflicts.extend(name for name in names if name not in updated)
+
+    return conflicts
+
+@frappe.whitelist()
+def apply_scans(events):
+    """Apply a batch of container scans and return a result for each
+
+        POST /api/method/container_scans.apply_scans
+        {"events": [{"container_id": "RB-0001", "status": "Collected", "location": "Storage - MW",
+                     "timestamp": "2024-05-01 10:15:00", "collected_by": "Route 4"}, ...]}
+
+    Containers are validated against the Redis container index and
+    locations against one Warehouse query, the scans replayed per container
+    in time order, and the outcome written in the request's transaction.
+    Each result is `applied`, `unchanged`, `rejected` (with the reason) or
+    `conflict` when the container changed since it was indexed; rejected
+    and conflicting scans don't stop the rest of the batch.
+    """
+
+    frappe.has_permission(CONTAINER_DOCTYPE, "write", throw=True)
+
+    if isinstance(events, str):
+        events = frappe.parse_json(events)
+
+    parsed = []
+    for event in events or []:
+        event = frappe._dict(event)
+        event.container_id = event.container_id and str(event.container_id).strip()
+        try:
+            event.timestamp = get_datetime(event.timestamp) if event.timestamp else None
+        except Exception:
+            # Cleared, so the time-order sort only ever compares datetimes
+            event.error = _("Invalid timestamp: {0}").format(event.timestamp)
+            event.timestamp = None
+        parsed.append(event)
+
+    containers = get_containers(list({event.container_id for event in parsed if event.container_id}))
+    location_names = list({event.location for event in parsed if event.location})
+    locations = set(frappe.get_all(
+        "Warehouse", filters={"name": ["in", location_names]}, pluck="name"
+    )) if location_names else set()
+
+    results, changes, state = _plan(parsed, containers, locations)
+
+    now = now_datetime()
+    conflicts = _write(changes, now) if changes else []
+    for name in conflicts:
+        for result in changes[name].events:
+            result.update(result="conflict", error=_("Container changed since it was indexed; scan it again"))
+
+    # The index follows the database only once the transaction is in
+    written = {name: dict(state[name]) for name in changes if name not in conflicts}
+    frappe.db.after_commit.add(lambda: (_write_entries(written), _drop_entries(conflicts)))
+    container_board.refresh_after_commit(changes)
+
+    summary = {outcome: 0 for outcome in ("applied", "unchanged", "rejected", "conflict")}
+    for result in results:
+        summary[result["result"]] += 1
+    return {**summary, "results": results}
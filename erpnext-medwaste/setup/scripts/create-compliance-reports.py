@@ -4,181 +4,78 @@ Medical Waste Compliance Reporting Templates
 Creates standard reports and dashboards for regulatory compliance
 """
 
+import json
+
 import frappe
 from frappe import _
 
-def create_custom_reports():
-    """Create custom reports for medical waste compliance"""
-    
-    reports = [
-        {
-            "report_name": "Medical Waste Generation Report",
-            "report_type": "Script Report",
-            "module": "Stock",
-            "script": """
-def execute(filters=None):
-    columns = [
-        {"fieldname": "date", "label": "Date", "fieldtype": "Date", "width": 100},
-        {"fieldname": "item_code", "label": "Item Code", "fieldtype": "Link", "options": "Item", "width": 120},
-        {"fieldname": "item_name", "label": "Item Name", "fieldtype": "Data", "width": 200},
-        {"fieldname": "waste_classification", "label": "Waste Type", "fieldtype": "Data", "width": 120},
-        {"fieldname": "qty", "label": "Quantity", "fieldtype": "Float", "width": 100},
-        {"fieldname": "uom", "label": "UOM", "fieldtype": "Data", "width": 80},
-        {"fieldname": "warehouse", "label": "Location", "fieldtype": "Link", "options": "Warehouse", "width": 150},
-        {"fieldname": "department", "label": "Department", "fieldtype": "Data", "width": 120}
-    ]
-    
-    data = frappe.db.sql('''
-        SELECT 
-            sle.posting_date as date,
-            sle.item_code,
-            i.item_name,
-            i.waste_classification,
-            sle.actual_qty as qty,
-            i.stock_uom as uom,
-            sle.warehouse,
-            sle.generation_department as department
-        FROM `tabStock Ledger Entry` sle
-        JOIN `tabItem` i ON sle.item_code = i.name
-        WHERE sle.actual_qty > 0 
-        AND i.item_group LIKE '%Medical Waste%'
-        AND (%(from_date)s IS NULL OR sle.posting_date >= %(from_date)s)
-        AND (%(to_date)s IS NULL OR sle.posting_date <= %(to_date)s)
-        ORDER BY sle.posting_date DESC
-    ''', filters, as_dict=1)
-    
-    return columns, data
-            """
-        },
-        {
-            "report_name": "Waste Disposal Tracking Report",
-            "report_type": "Script Report", 
-            "module": "Stock",
-            "script": """
-def execute(filters=None):
-    columns = [
-        {"fieldname": "manifest_number", "label": "Manifest #", "fieldtype": "Link", "options": "Medical Waste Manifest", "width": 120},
-        {"fieldname": "manifest_date", "label": "Date", "fieldtype": "Date", "width": 100},
-        {"fieldname": "supplier", "label": "Disposal Company", "fieldtype": "Data", "width": 150},
-        {"fieldname": "waste_type", "label": "Waste Type", "fieldtype": "Data", "width": 120},
-        {"fieldname": "quantity", "label": "Quantity", "fieldtype": "Float", "width": 100},
-        {"fieldname": "weight", "label": "Weight (lbs)", "fieldtype": "Float", "width": 100},
-        {"fieldname": "treatment_method", "label": "Treatment", "fieldtype": "Data", "width": 120},
-        {"fieldname": "status", "label": "Status", "fieldtype": "Data", "width": 100}
-    ]
-    
-    data = frappe.db.sql('''
-        SELECT 
-            m.manifest_number,
-            m.manifest_date,
-            m.transporter_name as supplier,
-            mi.waste_classification as waste_type,
-            mi.quantity,
-            mi.weight_lbs as weight,
-            m.treatment_method,
-            m.status
-        FROM `tabMedical Waste Manifest` m
-        JOIN `tabMedical Waste Manifest Item` mi ON m.name = mi.parent
-        WHERE (%(from_date)s IS NULL OR m.manifest_date >= %(from_date)s)
-        AND (%(to_date)s IS NULL OR m.manifest_date <= %(to_date)s)
-        ORDER BY m.manifest_date DESC
-    ''', filters, as_dict=1)
+import container_alerts
+import container_board
+import container_readings
+import container_scans
+import fill_forecast
+import kpi_engine
+import medical_waste_items
+import provisioning
+import report_cache
+import training_expiry_summary
+import waste_generation_rollup
+from setup_profiler import profiled, profiled_run
+
+@profiled
+def install_waste_generation_rollup():
+    """Create the rollup tables and the hooks that keep them current"""
     
-    return columns, data
-            """
-        },
-        {
-            "report_name": "Training Compliance Report",
-            "report_type": "Script Report",
-            "module": "HR",
-            "script": """
-def execute(filters=None):
-    columns = [
-        {"fieldname": "employee", "label": "Employee", "fieldtype": "Link", "options": "Employee", "width": 120},
-        {"fieldname": "employee_name", "label": "Name", "fieldtype": "Data", "width": 150},
-        {"fieldname": "department", "label": "Department", "fieldtype": "Data", "width": 120},
-        {"fieldname": "training_type", "label": "Training Type", "fieldtype": "Data", "width": 150},
-        {"fieldname": "training_date", "label": "Training Date", "fieldtype": "Date", "width": 100},
-        {"fieldname": "expiration_date", "label": "Expires", "fieldtype": "Date", "width": 100},
-        {"fieldname": "status", "label": "Status", "fieldtype": "Data", "width": 100},
-        {"fieldname": "days_until_expiry", "label": "Days to Expiry", "fieldtype": "Int", "width": 120}
-    ]
+    waste_generation_rollup.ensure_rollup_tables()
+    waste_generation_rollup.install_rollup_hooks()
+
+@profiled
+def install_item_resolver():
+    """Create and fill the medical waste item table and its hooks"""
     
-    data = frappe.db.sql('''
-        SELECT 
-            tr.employee,
-            tr.employee_name,
-            tr.department,
-            tr.training_type,
-            tr.training_date,
-            tr.expiration_date,
-            tr.status,
-            DATEDIFF(tr.expiration_date, CURDATE()) as days_until_expiry
-        FROM `tabTraining Record` tr
-        WHERE tr.expiration_date IS NOT NULL
-        AND (%(department)s IS NULL OR tr.department = %(department)s)
-        ORDER BY tr.expiration_date ASC
-    ''', filters, as_dict=1)
+    medical_waste_items.ensure_item_table()
+    medical_waste_items.install_resolver_hooks()
+    medical_waste_items.rebuild()
+
+@profiled
+def install_training_expiry_summary():
+    """Create and fill the training expiry summary and its hooks"""
     
-    return columns, data
-            """
-        },
-        {
-            "report_name": "Incident Summary Report", 
-            "report_type": "Script Report",
-            "module": "Stock",
-            "script": """
-def execute(filters=None):
-    columns = [
-        {"fieldname": "incident_date", "label": "Date", "fieldtype": "Datetime", "width": 150},
-        {"fieldname": "incident_type", "label": "Type", "fieldtype": "Data", "width": 120},
-        {"fieldname": "severity", "label": "Severity", "fieldtype": "Data", "width": 100},
-        {"fieldname": "location", "label": "Location", "fieldtype": "Data", "width": 150},
-        {"fieldname": "department", "label": "Department", "fieldtype": "Data", "width": 120},
-        {"fieldname": "reported_by", "label": "Reported By", "fieldtype": "Data", "width": 120},
-        {"fieldname": "status", "label": "Status", "fieldtype": "Data", "width": 100}
-    ]
+    training_expiry_summary.ensure_summary_tables()
+    training_expiry_summary.install_summary_hooks()
+    training_expiry_summary.rebuild()
+
+@profiled
+def install_container_readings():
+    """Create the container readings tables, the downsampling job and the fill forecast job"""
     
-    data = frappe.db.sql('''
-        SELECT 
-            ir.incident_date,
-            ir.incident_type,
-            ir.severity,
-            ir.location,
-            ir.department,
-            e.employee_name as reported_by,
-            CASE 
-                WHEN ir.docstatus = 0 THEN 'Draft'
-                WHEN ir.docstatus = 1 THEN 'Submitted'
-                ELSE 'Cancelled'
-            END as status
-        FROM `tabIncident Report` ir
-        LEFT JOIN `tabEmployee` e ON ir.reported_by = e.name
-        WHERE (%(from_date)s IS NULL OR DATE(ir.incident_date) >= %(from_date)s)
-        AND (%(to_date)s IS NULL OR DATE(ir.incident_date) <= %(to_date)s)
-        ORDER BY ir.incident_date DESC
-    ''', filters, as_dict=1)
+    container_readings.ensure_readings_tables()
+    container_readings.install_readings_hooks()
+    fill_forecast.ensure_forecast_table()
+    fill_forecast.install_forecast_hooks()
+
+@profiled
+def install_container_scans():
+    """Create the hooks that keep the container scan index and board current, then load them"""
     
-    return columns, data
-            """
-        }
-    ]
+    container_scans.install_index_hooks()
+    container_scans.rebuild_index()
+    container_board.rebuild()
+
+@profiled
+def create_custom_reports():
+    """Create custom reports for medical waste compliance"""
     
-    for report_data in reports:
-        if not frappe.db.exists("Report", report_data["report_name"]):
-            report = frappe.get_doc({
-                "doctype": "Report",
-                "report_name": report_data["report_name"],
-                "report_type": report_data["report_type"],
-                "module": report_data["module"],
-                "is_standard": "No"
-            })
-            report.insert()
-            print(f"✅ Created report: {report_data['report_name']}")
+    provisioning.apply("reports")
 
+@profiled
 def create_dashboards():
     """Create dashboards for medical waste management"""
     
+    # The waste charts are read from the generation report, which filters
+    # through the Medical Waste item resolver when it runs; a filter frozen
+    # here would miss items added to the subtree later
+    
     # Dashboard for Medical Waste Overview
     dashboard_data = {
         "dashboard_name": "Medical Waste Management",
@@ -186,23 +83,19 @@ def create_dashboards():
         "charts": [
             {
                 "chart_name": "Waste Generation Trends",
-                "chart_type": "Line",
-                "timeseries": 1,
-                "based_on": "posting_date",
-                "time_interval": "Daily",
-                "value_based_on": "actual_qty",
-                "source": "Stock Ledger Entry",
-                "filters": [
-                    {"fieldname": "actual_qty", "operator": ">", "value": "0"},
-                    {"fieldname": "item_group", "operator": "like", "value": "%Medical Waste%"}
-                ]
+                "chart_type": "Report",
+                "report_name": "Medical Waste Generation Report",
+                "use_report_chart": 1,
+                "type": "Line",
+                "filters_json": json.dumps({"chart_by": "Date"})
             },
             {
                 "chart_name": "Waste by Classification",
-                "chart_type": "Donut",
-                "based_on": "waste_classification",
-                "value_based_on": "count",
-                "source": "Stock Ledger Entry"
+                "chart_type": "Report",
+                "report_name": "Medical Waste Generation Report",
+                "use_report_chart": 1,
+                "type": "Donut",
+                "filters_json": json.dumps({"chart_by": "Waste Type"})
             },
             {
                 "chart_name": "Monthly Disposal Costs",
@@ -218,6 +111,7 @@ def create_dashboards():
     
     print("📊 Dashboard configuration prepared (would be created through UI)")
 
+@profiled
 def create_print_formats():
     """Create print formats for compliance documents"""
     
@@ -247,6 +141,7 @@ def create_print_formats():
     for pf in print_formats:
         print(f"📄 Print format template ready: {pf['name']}")
 
+@profiled
 def setup_notification_templates():
     """Set up email notifications for compliance alerts"""
     
@@ -269,14 +164,6 @@ def setup_notification_templates():
             "subject": "Overdue Manifest: {{doc.manifest_number}}",
             "message": "Manifest {{doc.manifest_number}} is overdue for completion"
         },
-        {
-            "name": "Container Full Alert",
-            "document_type": "Waste Container Tracking",
-            "event": "Value Change",
-            "condition": "doc.fill_level >= 80",
-            "subject": "Container Nearing Full: {{doc.container_id}}",
-            "message": "Container {{doc.container_id}} is {{doc.fill_level}}% full and needs collection"
-        },
         {
             "name": "Incident Report Notification",
             "document_type": "Incident Report",
@@ -288,7 +175,13 @@ def setup_notification_templates():
     
     for notification in notifications:
         print(f"🔔 Notification template ready: {notification['name']}")
+    
+    # Container fill alerts come from the readings stream, not from saves
+    container_alerts.ensure_alert_tables()
+    container_alerts.install_alert_hooks()
+    print("🔔 Container full alerts: evaluated on reading ingest, sent per department hourly")
 
+@profiled
 def create_workflow_templates():
     """Create workflow templates for approval processes"""
     
@@ -330,55 +223,42 @@ def create_workflow_templates():
     for workflow in workflows:
         print(f"⚙️ Workflow template ready: {workflow['workflow_name']}")
 
+@profiled
 def setup_kpi_indicators():
     """Set up Key Performance Indicators for waste management"""
     
-    kpis = [
-        {
-            "indicator_name": "Waste Generation Rate",
-            "formula": "Total waste generated / Patient days",
-            "unit": "lbs/patient day",
-            "target": "< 15",
-            "frequency": "Monthly"
-        },
-        {
-            "indicator_name": "Disposal Cost per Pound",
-            "formula": "Total disposal costs / Total weight disposed",
-            "unit": "$/lb",
-            "target": "< $3.50",
-            "frequency": "Monthly"
-        },
-        {
-            "indicator_name": "Training Compliance Rate",
-            "formula": "(Current trained employees / Total employees) * 100",
-            "unit": "%",
-            "target": "> 95%",
-            "frequency": "Quarterly"
-        },
-        {
-            "indicator_name": "Manifest Completion Rate",
-            "formula": "(Completed manifests / Total manifests) * 100",
-            "unit": "%", 
-            "target": "100%",
-            "frequency": "Monthly"
-        },
-        {
-            "indicator_name": "Incident Rate",
-            "formula": "Number of incidents / 100,000 work hours",
-            "unit": "incidents/100k hours",
-            "target": "< 2",
-            "frequency": "Quarterly"
-        }
-    ]
+    kpi_engine.ensure_kpi_tables()
+    kpi_engine.install_kpi_hooks()
+    kpi_engine.ensure_periods()
     
-    for kpi in kpis:
-        print(f"📈 KPI template ready: {kpi['indicator_name']}")
+    for kpi, definition in kpi_engine.KPIS.items():
+        print(f"📈 KPI ready: {kpi} = {definition['formula']} ({definition['frequency']}, target {definition['target']})")
+    print("   Run kpi_engine.reconcile once to compute them from existing data")
 
+@profiled_run
 def main():
     """Main function to create compliance reporting templates"""
     try:
         print("📊 Creating Compliance Reporting Templates...")
         
+        print("\n📊 Installing waste generation rollup...")
+        install_waste_generation_rollup()
+        
+        print("\n🗂️  Installing medical waste item resolver...")
+        install_item_resolver()
+        
+        print("\n🎓 Installing training expiry summary...")
+        install_training_expiry_summary()
+        
+        print("\n🗄️  Installing report result cache hooks...")
+        report_cache.install_cache_hooks()
+        
+        print("\n📡 Installing container readings store...")
+        install_container_readings()
+        
+        print("\n🏷️  Installing container scan index and live board...")
+        install_container_scans()
+        
         print("\n📋 Creating custom reports...")
         create_custom_reports()
         
@@ -406,6 +286,8 @@ def main():
         print("  - Set up email notification templates")
         print("  - Configure workflow states and transitions")
         print("  - Create KPI tracking dashboards")
+        print("  - Backfill the waste generation rollup once:")
+        print("      bench --site frontend execute waste_generation_rollup.backfill")
         
     except Exception as e:
         print(f"❌ Error creating compliance templates: {str(e)}")
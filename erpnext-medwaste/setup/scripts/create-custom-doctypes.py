@@ -7,864 +7,1048 @@ Creates specialized doctypes for medical waste compliance and tracking
 import frappe
 from frappe import _
 
+from schema_drift import create_doctype
+from setup_profiler import profiled, profiled_run
+
+MEDICAL_WASTE_MANIFEST = {
+    "doctype": "DocType",
+    "name": "Medical Waste Manifest",
+    "module": "Stock",
+    "custom": 1,
+    "is_submittable": 1,
+    "naming_rule": "By fieldname",
+    "autoname": "field:manifest_number",
+    "title_field": "manifest_number",
+    "fields": [
+        # Basic Information
+        {
+            "fieldname": "manifest_number",
+            "label": "Manifest Number",
+            "fieldtype": "Data",
+            "reqd": 1,
+            "unique": 1
+        },
+        {
+            "fieldname": "manifest_date",
+            "label": "Manifest Date", 
+            "fieldtype": "Date",
+            "reqd": 1,
+            "default": "Today"
+        },
+        {
+            "fieldname": "cb1",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "status",
+            "label": "Status",
+            "fieldtype": "Select",
+            "options": "\nDraft\nIn Transit\nReceived\nTreated\nCompleted",
+            "default": "Draft"
+        },
+        {
+            "fieldname": "sb1",
+            "fieldtype": "Section Break",
+            "label": "Generator Information"
+        },
+        {
+            "fieldname": "generator_name",
+            "label": "Generator Name",
+            "fieldtype": "Data",
+            "reqd": 1
+        },
+        {
+            "fieldname": "generator_address",
+            "label": "Generator Address",
+            "fieldtype": "Text",
+            "reqd": 1
+        },
+        {
+            "fieldname": "cb2",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "generator_epa_id",
+            "label": "Generator EPA ID",
+            "fieldtype": "Data"
+        },
+        {
+            "fieldname": "generator_phone",
+            "label": "Generator Phone",
+            "fieldtype": "Data"
+        },
+        {
+            "fieldname": "sb2",
+            "fieldtype": "Section Break",
+            "label": "Transporter Information"
+        },
+        {
+            "fieldname": "transporter_name",
+            "label": "Transporter Name",
+            "fieldtype": "Data"
+        },
+        {
+            "fieldname": "transporter_license",
+            "label": "Transporter License",
+            "fieldtype": "Data"
+        },
+        {
+            "fieldname": "cb3",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "pickup_date",
+            "label": "Pickup Date",
+            "fieldtype": "Date"
+        },
+        {
+            "fieldname": "driver_name",
+            "label": "Driver Name",
+            "fieldtype": "Data"
+        },
+        {
+            "fieldname": "sb3",
+            "fieldtype": "Section Break",
+            "label": "Treatment Facility"
+        },
+        {
+            "fieldname": "facility_name",
+            "label": "Treatment Facility Name",
+            "fieldtype": "Data"
+        },
+        {
+            "fieldname": "facility_permit",
+            "label": "Facility Permit Number",
+            "fieldtype": "Data"
+        },
+        {
+            "fieldname": "cb4",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "treatment_date",
+            "label": "Treatment Date",
+            "fieldtype": "Date"
+        },
+        {
+            "fieldname": "treatment_method",
+            "label": "Treatment Method",
+            "fieldtype": "Select",
+            "options": "\nAutoclave\nIncineration\nChemical Treatment\nMicrowave\nIrradiation"
+        },
+        {
+            "fieldname": "sb4",
+            "fieldtype": "Section Break",
+            "label": "Waste Items"
+        },
+        {
+            "fieldname": "waste_items",
+            "label": "Waste Items",
+            "fieldtype": "Table",
+            "options": "Medical Waste Manifest Item"
+        },
+        {
+            "fieldname": "sb5",
+            "fieldtype": "Section Break",
+            "label": "Totals"
+        },
+        {
+            "fieldname": "total_weight",
+            "label": "Total Weight (lbs)",
+            "fieldtype": "Float",
+            "read_only": 1
+        },
+        {
+            "fieldname": "cb5",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "total_containers",
+            "label": "Total Containers",
+            "fieldtype": "Int",
+            "read_only": 1
+        }
+    ]
+}
+
+@profiled
 def create_medical_waste_manifest():
     """Create Medical Waste Manifest DocType"""
     
-    if frappe.db.exists("DocType", "Medical Waste Manifest"):
-        print("⚠️  Medical Waste Manifest DocType already exists")
-        return
-    
-    doctype = frappe.get_doc({
-        "doctype": "DocType",
-        "name": "Medical Waste Manifest",
-        "module": "Stock",
-        "custom": 1,
-        "is_submittable": 1,
-        "naming_rule": "By fieldname",
-        "autoname": "field:manifest_number",
-        "title_field": "manifest_number",
-        "fields": [
-            # Basic Information
-            {
-                "fieldname": "manifest_number",
-                "label": "Manifest Number",
-                "fieldtype": "Data",
-                "reqd": 1,
-                "unique": 1
-            },
-            {
-                "fieldname": "manifest_date",
-                "label": "Manifest Date", 
-                "fieldtype": "Date",
-                "reqd": 1,
-                "default": "Today"
-            },
-            {
-                "fieldname": "cb1",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "status",
-                "label": "Status",
-                "fieldtype": "Select",
-                "options": "\\nDraft\\nIn Transit\\nReceived\\nTreated\\nCompleted",
-                "default": "Draft"
-            },
-            {
-                "fieldname": "sb1",
-                "fieldtype": "Section Break",
-                "label": "Generator Information"
-            },
-            {
-                "fieldname": "generator_name",
-                "label": "Generator Name",
-                "fieldtype": "Data",
-                "reqd": 1
-            },
-            {
-                "fieldname": "generator_address",
-                "label": "Generator Address",
-                "fieldtype": "Text",
-                "reqd": 1
-            },
-            {
-                "fieldname": "cb2",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "generator_epa_id",
-                "label": "Generator EPA ID",
-                "fieldtype": "Data"
-            },
-            {
-                "fieldname": "generator_phone",
-                "label": "Generator Phone",
-                "fieldtype": "Data"
-            },
-            {
-                "fieldname": "sb2",
-                "fieldtype": "Section Break",
-                "label": "Transporter Information"
-            },
-            {
-                "fieldname": "transporter_name",
-                "label": "Transporter Name",
-                "fieldtype": "Data"
-            },
-            {
-                "fieldname": "transporter_license",
-                "label": "Transporter License",
-                "fieldtype": "Data"
-            },
-            {
-                "fieldname": "cb3",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "pickup_date",
-                "label": "Pickup Date",
-                "fieldtype": "Date"
-            },
-            {
-                "fieldname": "driver_name",
-                "label": "Driver Name",
-                "fieldtype": "Data"
-            },
-            {
-                "fieldname": "sb3",
-                "fieldtype": "Section Break",
-                "label": "Treatment Facility"
-            },
-            {
-                "fieldname": "facility_name",
-                "label": "Treatment Facility Name",
-                "fieldtype": "Data"
-            },
-            {
-                "fieldname": "facility_permit",
-                "label": "Facility Permit Number",
-                "fieldtype": "Data"
-            },
-            {
-                "fieldname": "cb4",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "treatment_date",
-                "label": "Treatment Date",
-                "fieldtype": "Date"
-            },
-            {
-                "fieldname": "treatment_method",
-                "label": "Treatment Method",
-                "fieldtype": "Select",
-                "options": "\\nAutoclave\\nIncineration\\nChemical Treatment\\nMicrowave\\nIrradiation"
-            },
-            {
-                "fieldname": "sb4",
-                "fieldtype": "Section Break",
-                "label": "Waste Items"
-            },
-            {
-                "fieldname": "waste_items",
-                "label": "Waste Items",
-                "fieldtype": "Table",
-                "options": "Medical Waste Manifest Item"
-            },
-            {
-                "fieldname": "sb5",
-                "fieldtype": "Section Break",
-                "label": "Totals"
-            },
-            {
-                "fieldname": "total_weight",
-                "label": "Total Weight (lbs)",
-                "fieldtype": "Float",
-                "read_only": 1
-            },
-            {
-                "fieldname": "cb5",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "total_containers",
-                "label": "Total Containers",
-                "fieldtype": "Int",
-                "read_only": 1
-            }
-        ]
-    })
+    create_doctype(MEDICAL_WASTE_MANIFEST)
+
+@profiled
+def ensure_manifest_indexes():
+    """Add the composite index the disposal report paginates on"""
     
-    doctype.insert()
-    print("✅ Created Medical Waste Manifest DocType")
+    if frappe.db.exists("DocType", "Medical Waste Manifest"):
+        # Matches the report's (manifest_date, name) keyset, newest first
+        frappe.db.add_index("Medical Waste Manifest", ["manifest_date", "name"], "manifest_date_name")
+
+        # Sites set up before the composite also indexed manifest_date alone,
+        # which its leading column covers
+        frappe.db.set_value(
+            "DocField", {"parent": "Medical Waste Manifest", "fieldname": "manifest_date"}, "search_index", 0
+        )
+        if frappe.db.has_index("tabMedical Waste Manifest", "manifest_date"):
+            frappe.db.sql_ddl("ALTER TABLE `tabMedical Waste Manifest` DROP INDEX `manifest_date`")
+        frappe.clear_cache(doctype="Medical Waste Manifest")
+        print("✅ Ensured Medical Waste Manifest indexes")
+
+MEDICAL_WASTE_MANIFEST_ITEM = {
+    "doctype": "DocType",
+    "name": "Medical Waste Manifest Item",
+    "module": "Stock",
+    "custom": 1,
+    "istable": 1,
+    "fields": [
+        {
+            "fieldname": "item_code",
+            "label": "Item Code",
+            "fieldtype": "Link",
+            "options": "Item",
+            "reqd": 1
+        },
+        {
+            "fieldname": "item_name",
+            "label": "Item Name",
+            "fieldtype": "Data",
+            "fetch_from": "item_code.item_name",
+            "read_only": 1
+        },
+        {
+            "fieldname": "waste_classification",
+            "label": "Waste Classification",
+            "fieldtype": "Data",
+            "fetch_from": "item_code.waste_classification",
+            "read_only": 1
+        },
+        {
+            "fieldname": "quantity",
+            "label": "Quantity",
+            "fieldtype": "Float",
+            "reqd": 1
+        },
+        {
+            "fieldname": "uom",
+            "label": "UOM",
+            "fieldtype": "Link",
+            "options": "UOM",
+            "fetch_from": "item_code.stock_uom"
+        },
+        {
+            "fieldname": "weight_lbs",
+            "label": "Weight (lbs)",
+            "fieldtype": "Float"
+        },
+        {
+            "fieldname": "container_type",
+            "label": "Container Type",
+            "fieldtype": "Data"
+        },
+        {
+            "fieldname": "dot_code",
+            "label": "DOT Code",
+            "fieldtype": "Data"
+        }
+    ]
+}
 
+@profiled
 def create_manifest_item_table():
     """Create child table for manifest items"""
     
-    if frappe.db.exists("DocType", "Medical Waste Manifest Item"):
-        print("⚠️  Medical Waste Manifest Item DocType already exists")
-        return
-    
-    doctype = frappe.get_doc({
-        "doctype": "DocType",
-        "name": "Medical Waste Manifest Item",
-        "module": "Stock",
-        "custom": 1,
-        "istable": 1,
-        "fields": [
-            {
-                "fieldname": "item_code",
-                "label": "Item Code",
-                "fieldtype": "Link",
-                "options": "Item",
-                "reqd": 1
-            },
-            {
-                "fieldname": "item_name",
-                "label": "Item Name",
-                "fieldtype": "Data",
-                "fetch_from": "item_code.item_name",
-                "read_only": 1
-            },
-            {
-                "fieldname": "waste_classification",
-                "label": "Waste Classification",
-                "fieldtype": "Data",
-                "fetch_from": "item_code.waste_classification",
-                "read_only": 1
-            },
-            {
-                "fieldname": "quantity",
-                "label": "Quantity",
-                "fieldtype": "Float",
-                "reqd": 1
-            },
-            {
-                "fieldname": "uom",
-                "label": "UOM",
-                "fieldtype": "Link",
-                "options": "UOM",
-                "fetch_from": "item_code.stock_uom"
-            },
-            {
-                "fieldname": "weight_lbs",
-                "label": "Weight (lbs)",
-                "fieldtype": "Float"
-            },
-            {
-                "fieldname": "container_type",
-                "label": "Container Type",
-                "fieldtype": "Data"
-            },
-            {
-                "fieldname": "dot_code",
-                "label": "DOT Code",
-                "fieldtype": "Data"
-            }
-        ]
-    })
-    
-    doctype.insert()
-    print("✅ Created Medical Waste Manifest Item DocType")
+    create_doctype(MEDICAL_WASTE_MANIFEST_ITEM)
 
+WASTE_CONTAINER_TRACKING = {
+    "doctype": "DocType",
+    "name": "Waste Container Tracking",
+    "module": "Stock",
+    "custom": 1,
+    "naming_rule": "By fieldname",
+    "autoname": "field:container_id",
+    "title_field": "container_id",
+    # Fill readings go to container_readings; a Version per reading would
+    # only bloat tabVersion
+    "track_changes": 0,
+    "fields": [
+        {
+            "fieldname": "container_id",
+            "label": "Container ID",
+            "fieldtype": "Data",
+            "reqd": 1,
+            "unique": 1
+        },
+        {
+            "fieldname": "container_type",
+            "label": "Container Type",
+            "fieldtype": "Select",
+            "options": "\nRed Bag\nYellow Bag\nSharps Container\nRigid Container\nChemotherapy Container",
+            "reqd": 1
+        },
+        {
+            "fieldname": "cb1",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "size",
+            "label": "Size",
+            "fieldtype": "Data"
+        },
+        {
+            "fieldname": "status",
+            "label": "Status",
+            "fieldtype": "Select",
+            "options": "\nEmpty\nIn Use\nFull\nCollected\nTreated\nDisposed",
+            "default": "Empty"
+        },
+        {
+            "fieldname": "sb1",
+            "fieldtype": "Section Break",
+            "label": "Location Information"
+        },
+        {
+            "fieldname": "current_location",
+            "label": "Current Location",
+            "fieldtype": "Link",
+            "options": "Warehouse"
+        },
+        {
+            "fieldname": "department",
+            "label": "Department",
+            "fieldtype": "Link",
+            "options": "Department"
+        },
+        {
+            "fieldname": "cb2",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "room_number",
+            "label": "Room Number",
+            "fieldtype": "Data"
+        },
+        {
+            "fieldname": "assigned_to",
+            "label": "Assigned To",
+            "fieldtype": "Link",
+            "options": "Employee"
+        },
+        {
+            "fieldname": "sb2",
+            "fieldtype": "Section Break",
+            "label": "Fill Information"
+        },
+        {
+            "fieldname": "fill_level",
+            "label": "Fill Level (%)",
+            "fieldtype": "Percent",
+            "read_only": 1,
+            "description": "Latest reading"
+        },
+        {
+            "fieldname": "weight_kg",
+            "label": "Weight (kg)",
+            "fieldtype": "Float",
+            "read_only": 1,
+            "description": "Latest reading"
+        },
+        {
+            "fieldname": "last_reading_at",
+            "label": "Last Reading At",
+            "fieldtype": "Datetime",
+            "read_only": 1
+        },
+        {
+            "fieldname": "fill_rate",
+            "label": "Fill Rate (%/h)",
+            "fieldtype": "Float",
+            "read_only": 1
+        },
+        {
+            "fieldname": "predicted_full_at",
+            "label": "Predicted Full At",
+            "fieldtype": "Datetime",
+            "read_only": 1,
+            "search_index": 1,
+            "description": "Forecast from recent fill readings"
+        },
+        {
+            "fieldname": "cb3",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "start_date",
+            "label": "Start Date",
+            "fieldtype": "Date"
+        },
+        {
+            "fieldname": "full_date",
+            "label": "Full Date",
+            "fieldtype": "Date"
+        },
+        {
+            "fieldname": "sb3",
+            "fieldtype": "Section Break",
+            "label": "Collection Information"
+        },
+        {
+            "fieldname": "collection_date",
+            "label": "Collection Date",
+            "fieldtype": "Date"
+        },
+        {
+            "fieldname": "collected_by",
+            "label": "Collected By",
+            "fieldtype": "Data"
+        },
+        {
+            "fieldname": "cb4",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "manifest_number",
+            "label": "Manifest Number",
+            "fieldtype": "Link",
+            "options": "Medical Waste Manifest"
+        },
+        {
+            "fieldname": "treatment_date",
+            "label": "Treatment Date",
+            "fieldtype": "Date"
+        }
+    ]
+}
+
+@profiled
 def create_waste_container_tracking():
     """Create Waste Container Tracking DocType"""
     
-    if frappe.db.exists("DocType", "Waste Container Tracking"):
-        print("⚠️  Waste Container Tracking DocType already exists")
-        return
-    
-    doctype = frappe.get_doc({
-        "doctype": "DocType",
-        "name": "Waste Container Tracking",
-        "module": "Stock",
-        "custom": 1,
-        "naming_rule": "By fieldname",
-        "autoname": "field:container_id",
-        "title_field": "container_id",
-        "fields": [
-            {
-                "fieldname": "container_id",
-                "label": "Container ID",
-                "fieldtype": "Data",
-                "reqd": 1,
-                "unique": 1
-            },
-            {
-                "fieldname": "container_type",
-                "label": "Container Type",
-                "fieldtype": "Select",
-                "options": "\\nRed Bag\\nYellow Bag\\nSharps Container\\nRigid Container\\nChemotherapy Container",
-                "reqd": 1
-            },
-            {
-                "fieldname": "cb1",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "size",
-                "label": "Size",
-                "fieldtype": "Data"
-            },
-            {
-                "fieldname": "status",
-                "label": "Status",
-                "fieldtype": "Select",
-                "options": "\\nEmpty\\nIn Use\\nFull\\nCollected\\nTreated\\nDisposed",
-                "default": "Empty"
-            },
-            {
-                "fieldname": "sb1",
-                "fieldtype": "Section Break",
-                "label": "Location Information"
-            },
-            {
-                "fieldname": "current_location",
-                "label": "Current Location",
-                "fieldtype": "Link",
-                "options": "Warehouse"
-            },
-            {
-                "fieldname": "department",
-                "label": "Department",
-                "fieldtype": "Link",
-                "options": "Department"
-            },
-            {
-                "fieldname": "cb2",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "room_number",
-                "label": "Room Number",
-                "fieldtype": "Data"
-            },
-            {
-                "fieldname": "assigned_to",
-                "label": "Assigned To",
-                "fieldtype": "Link",
-                "options": "Employee"
-            },
-            {
-                "fieldname": "sb2",
-                "fieldtype": "Section Break",
-                "label": "Fill Information"
-            },
-            {
-                "fieldname": "fill_level",
-                "label": "Fill Level (%)",
-                "fieldtype": "Percent"
-            },
-            {
-                "fieldname": "weight_kg",
-                "label": "Weight (kg)",
-                "fieldtype": "Float"
-            },
-            {
-                "fieldname": "cb3",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "start_date",
-                "label": "Start Date",
-                "fieldtype": "Date"
-            },
-            {
-                "fieldname": "full_date",
-                "label": "Full Date",
-                "fieldtype": "Date"
-            },
-            {
-                "fieldname": "sb3",
-                "fieldtype": "Section Break",
-                "label": "Collection Information"
-            },
-            {
-                "fieldname": "collection_date",
-                "label": "Collection Date",
-                "fieldtype": "Date"
-            },
-            {
-                "fieldname": "collected_by",
-                "label": "Collected By",
-                "fieldtype": "Data"
-            },
-            {
-                "fieldname": "cb4",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "manifest_number",
-                "label": "Manifest Number",
-                "fieldtype": "Link",
-                "options": "Medical Waste Manifest"
-            },
-            {
-                "fieldname": "treatment_date",
-                "label": "Treatment Date",
-                "fieldtype": "Date"
-            }
-        ]
-    })
-    
-    doctype.insert()
-    print("✅ Created Waste Container Tracking DocType")
+    create_doctype(WASTE_CONTAINER_TRACKING)
 
+COMPLIANCE_INSPECTION = {
+    "doctype": "DocType",
+    "name": "Compliance Inspection",
+    "module": "Stock",
+    "custom": 1,
+    "is_submittable": 1,
+    "fields": [
+        {
+            "fieldname": "inspection_date",
+            "label": "Inspection Date",
+            "fieldtype": "Date",
+            "reqd": 1,
+            "default": "Today"
+        },
+        {
+            "fieldname": "inspector_name",
+            "label": "Inspector Name",
+            "fieldtype": "Data",
+            "reqd": 1
+        },
+        {
+            "fieldname": "cb1",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "inspection_type",
+            "label": "Inspection Type",
+            "fieldtype": "Select",
+            "options": "\nInternal Audit\nRegulatory Inspection\nVendor Audit\nCompliance Review",
+            "reqd": 1
+        },
+        {
+            "fieldname": "regulatory_agency",
+            "label": "Regulatory Agency",
+            "fieldtype": "Select",
+            "options": "\nOSHA\nEPA\nDOT\nState Environmental\nLocal Health Department"
+        },
+        {
+            "fieldname": "sb1",
+            "fieldtype": "Section Break",
+            "label": "Areas Inspected"
+        },
+        {
+            "fieldname": "areas_inspected",
+            "label": "Areas Inspected",
+            "fieldtype": "Table",
+            "options": "Inspection Area"
+        },
+        {
+            "fieldname": "sb2",
+            "fieldtype": "Section Break",
+            "label": "Findings"
+        },
+        {
+            "fieldname": "overall_result",
+            "label": "Overall Result",
+            "fieldtype": "Select",
+            "options": "\nPass\nPass with Minor Issues\nFail\nRequires Follow-up"
+        },
+        {
+            "fieldname": "findings",
+            "label": "Findings",
+            "fieldtype": "Text"
+        },
+        {
+            "fieldname": "cb2",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "corrective_actions",
+            "label": "Corrective Actions Required",
+            "fieldtype": "Text"
+        },
+        {
+            "fieldname": "due_date",
+            "label": "Corrective Action Due Date",
+            "fieldtype": "Date"
+        },
+        {
+            "fieldname": "sb3",
+            "fieldtype": "Section Break",
+            "label": "Follow-up"
+        },
+        {
+            "fieldname": "follow_up_required",
+            "label": "Follow-up Required",
+            "fieldtype": "Check"
+        },
+        {
+            "fieldname": "follow_up_date",
+            "label": "Follow-up Date",
+            "fieldtype": "Date"
+        },
+        {
+            "fieldname": "cb3",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "responsible_person",
+            "label": "Responsible Person",
+            "fieldtype": "Link",
+            "options": "Employee"
+        },
+        {
+            "fieldname": "completion_status",
+            "label": "Completion Status",
+            "fieldtype": "Select",
+            "options": "\nPending\nIn Progress\nCompleted\nOverdue"
+        }
+    ]
+}
+
+@profiled
 def create_compliance_inspection():
     """Create Compliance Inspection DocType"""
     
-    if frappe.db.exists("DocType", "Compliance Inspection"):
-        print("⚠️  Compliance Inspection DocType already exists")
-        return
-    
-    doctype = frappe.get_doc({
-        "doctype": "DocType",
-        "name": "Compliance Inspection",
-        "module": "Stock",
-        "custom": 1,
-        "is_submittable": 1,
-        "fields": [
-            {
-                "fieldname": "inspection_date",
-                "label": "Inspection Date",
-                "fieldtype": "Date",
-                "reqd": 1,
-                "default": "Today"
-            },
-            {
-                "fieldname": "inspector_name",
-                "label": "Inspector Name",
-                "fieldtype": "Data",
-                "reqd": 1
-            },
-            {
-                "fieldname": "cb1",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "inspection_type",
-                "label": "Inspection Type",
-                "fieldtype": "Select",
-                "options": "\\nInternal Audit\\nRegulatory Inspection\\nVendor Audit\\nCompliance Review",
-                "reqd": 1
-            },
-            {
-                "fieldname": "regulatory_agency",
-                "label": "Regulatory Agency",
-                "fieldtype": "Select",
-                "options": "\\nOSHA\\nEPA\\nDOT\\nState Environmental\\nLocal Health Department"
-            },
-            {
-                "fieldname": "sb1",
-                "fieldtype": "Section Break",
-                "label": "Areas Inspected"
-            },
-            {
-                "fieldname": "areas_inspected",
-                "label": "Areas Inspected",
-                "fieldtype": "Table",
-                "options": "Inspection Area"
-            },
-            {
-                "fieldname": "sb2",
-                "fieldtype": "Section Break",
-                "label": "Findings"
-            },
-            {
-                "fieldname": "overall_result",
-                "label": "Overall Result",
-                "fieldtype": "Select",
-                "options": "\\nPass\\nPass with Minor Issues\\nFail\\nRequires Follow-up"
-            },
-            {
-                "fieldname": "findings",
-                "label": "Findings",
-                "fieldtype": "Text"
-            },
-            {
-                "fieldname": "cb2",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "corrective_actions",
-                "label": "Corrective Actions Required",
-                "fieldtype": "Text"
-            },
-            {
-                "fieldname": "due_date",
-                "label": "Corrective Action Due Date",
-                "fieldtype": "Date"
-            },
-            {
-                "fieldname": "sb3",
-                "fieldtype": "Section Break",
-                "label": "Follow-up"
-            },
-            {
-                "fieldname": "follow_up_required",
-                "label": "Follow-up Required",
-                "fieldtype": "Check"
-            },
-            {
-                "fieldname": "follow_up_date",
-                "label": "Follow-up Date",
-                "fieldtype": "Date"
-            },
-            {
-                "fieldname": "cb3",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "responsible_person",
-                "label": "Responsible Person",
-                "fieldtype": "Link",
-                "options": "Employee"
-            },
-            {
-                "fieldname": "completion_status",
-                "label": "Completion Status",
-                "fieldtype": "Select",
-                "options": "\\nPending\\nIn Progress\\nCompleted\\nOverdue"
-            }
-        ]
-    })
-    
-    doctype.insert()
-    print("✅ Created Compliance Inspection DocType")
+    create_doctype(COMPLIANCE_INSPECTION)
+
+INSPECTION_AREA = {
+    "doctype": "DocType",
+    "name": "Inspection Area",
+    "module": "Stock",
+    "custom": 1,
+    "istable": 1,
+    "fields": [
+        {
+            "fieldname": "area_name",
+            "label": "Area Name",
+            "fieldtype": "Data",
+            "reqd": 1
+        },
+        {
+            "fieldname": "checklist_item",
+            "label": "Checklist Item",
+            "fieldtype": "Data",
+            "reqd": 1
+        },
+        {
+            "fieldname": "compliance_status",
+            "label": "Compliance Status",
+            "fieldtype": "Select",
+            "options": "\nCompliant\nNon-Compliant\nNeeds Improvement\nN/A"
+        },
+        {
+            "fieldname": "notes",
+            "label": "Notes",
+            "fieldtype": "Text"
+        }
+    ]
+}
 
+@profiled
 def create_inspection_area_table():
     """Create child table for inspection areas"""
     
-    if frappe.db.exists("DocType", "Inspection Area"):
-        print("⚠️  Inspection Area DocType already exists")
-        return
-    
-    doctype = frappe.get_doc({
-        "doctype": "DocType",
-        "name": "Inspection Area",
-        "module": "Stock",
-        "custom": 1,
-        "istable": 1,
-        "fields": [
-            {
-                "fieldname": "area_name",
-                "label": "Area Name",
-                "fieldtype": "Data",
-                "reqd": 1
-            },
-            {
-                "fieldname": "checklist_item",
-                "label": "Checklist Item",
-                "fieldtype": "Data",
-                "reqd": 1
-            },
-            {
-                "fieldname": "compliance_status",
-                "label": "Compliance Status",
-                "fieldtype": "Select",
-                "options": "\\nCompliant\\nNon-Compliant\\nNeeds Improvement\\nN/A"
-            },
-            {
-                "fieldname": "notes",
-                "label": "Notes",
-                "fieldtype": "Text"
-            }
-        ]
-    })
-    
-    doctype.insert()
-    print("✅ Created Inspection Area DocType")
+    create_doctype(INSPECTION_AREA)
 
+TRAINING_RECORD = {
+    "doctype": "DocType",
+    "name": "Training Record",
+    "module": "HR",
+    "custom": 1,
+    "fields": [
+        {
+            "fieldname": "employee",
+            "label": "Employee",
+            "fieldtype": "Link",
+            "options": "Employee",
+            "reqd": 1
+        },
+        {
+            "fieldname": "employee_name",
+            "label": "Employee Name",
+            "fieldtype": "Data",
+            "fetch_from": "employee.employee_name",
+            "read_only": 1
+        },
+        {
+            "fieldname": "cb1",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "department",
+            "label": "Department",
+            "fieldtype": "Link",
+            "options": "Department",
+            "fetch_from": "employee.department"
+        },
+        {
+            "fieldname": "designation",
+            "label": "Designation",
+            "fieldtype": "Link",
+            "options": "Designation",
+            "fetch_from": "employee.designation"
+        },
+        {
+            "fieldname": "sb1",
+            "fieldtype": "Section Break",
+            "label": "Training Information"
+        },
+        {
+            "fieldname": "training_type",
+            "label": "Training Type",
+            "fieldtype": "Select",
+            "options": "\nBloodborne Pathogen\nHazmat Transportation\nWaste Segregation\nSpill Response\nPersonal Protective Equipment\nCompliance Training",
+            "reqd": 1
+        },
+        {
+            "fieldname": "training_provider",
+            "label": "Training Provider",
+            "fieldtype": "Data"
+        },
+        {
+            "fieldname": "cb2",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "training_date",
+            "label": "Training Date",
+            "fieldtype": "Date",
+            "reqd": 1
+        },
+        {
+            "fieldname": "expiration_date",
+            "label": "Expiration Date",
+            "fieldtype": "Date",
+            "search_index": 1
+        },
+        {
+            "fieldname": "sb2",
+            "fieldtype": "Section Break",
+            "label": "Certification"
+        },
+        {
+            "fieldname": "certification_number",
+            "label": "Certification Number",
+            "fieldtype": "Data"
+        },
+        {
+            "fieldname": "training_hours",
+            "label": "Training Hours",
+            "fieldtype": "Float"
+        },
+        {
+            "fieldname": "cb3",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "pass_score",
+            "label": "Pass Score (%)",
+            "fieldtype": "Percent"
+        },
+        {
+            "fieldname": "status",
+            "label": "Status",
+            "fieldtype": "Select",
+            "options": "\nActive\nExpired\nNeeds Renewal",
+            "default": "Active"
+        },
+        {
+            "fieldname": "sb3",
+            "fieldtype": "Section Break",
+            "label": "Notes"
+        },
+        {
+            "fieldname": "training_notes",
+            "label": "Training Notes",
+            "fieldtype": "Text"
+        }
+    ]
+}
+
+@profiled
 def create_training_record():
     """Create Training Record DocType"""
     
-    if frappe.db.exists("DocType", "Training Record"):
-        print("⚠️  Training Record DocType already exists")
-        return
-    
-    doctype = frappe.get_doc({
-        "doctype": "DocType",
-        "name": "Training Record",
-        "module": "HR",
-        "custom": 1,
-        "fields": [
-            {
-                "fieldname": "employee",
-                "label": "Employee",
-                "fieldtype": "Link",
-                "options": "Employee",
-                "reqd": 1
-            },
-            {
-                "fieldname": "employee_name",
-                "label": "Employee Name",
-                "fieldtype": "Data",
-                "fetch_from": "employee.employee_name",
-                "read_only": 1
-            },
-            {
-                "fieldname": "cb1",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "department",
-                "label": "Department",
-                "fieldtype": "Link",
-                "options": "Department",
-                "fetch_from": "employee.department"
-            },
-            {
-                "fieldname": "designation",
-                "label": "Designation",
-                "fieldtype": "Link",
-                "options": "Designation",
-                "fetch_from": "employee.designation"
-            },
-            {
-                "fieldname": "sb1",
-                "fieldtype": "Section Break",
-                "label": "Training Information"
-            },
-            {
-                "fieldname": "training_type",
-                "label": "Training Type",
-                "fieldtype": "Select",
-                "options": "\\nBloodborne Pathogen\\nHazmat Transportation\\nWaste Segregation\\nSpill Response\\nPersonal Protective Equipment\\nCompliance Training",
-                "reqd": 1
-            },
-            {
-                "fieldname": "training_provider",
-                "label": "Training Provider",
-                "fieldtype": "Data"
-            },
-            {
-                "fieldname": "cb2",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "training_date",
-                "label": "Training Date",
-                "fieldtype": "Date",
-                "reqd": 1
-            },
-            {
-                "fieldname": "expiration_date",
-                "label": "Expiration Date",
-                "fieldtype": "Date"
-            },
-            {
-                "fieldname": "sb2",
-                "fieldtype": "Section Break",
-                "label": "Certification"
-            },
-            {
-                "fieldname": "certification_number",
-                "label": "Certification Number",
-                "fieldtype": "Data"
-            },
-            {
-                "fieldname": "training_hours",
-                "label": "Training Hours",
-                "fieldtype": "Float"
-            },
-            {
-                "fieldname": "cb3",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "pass_score",
-                "label": "Pass Score (%)",
-                "fieldtype": "Percent"
-            },
-            {
-                "fieldname": "status",
-                "label": "Status",
-                "fieldtype": "Select",
-                "options": "\\nActive\\nExpired\\nNeeds Renewal",
-                "default": "Active"
-            },
-            {
-                "fieldname": "sb3",
-                "fieldtype": "Section Break",
-                "label": "Notes"
-            },
-            {
-                "fieldname": "training_notes",
-                "label": "Training Notes",
-                "fieldtype": "Text"
-            }
-        ]
-    })
+    create_doctype(TRAINING_RECORD)
+
+@profiled
+def ensure_training_indexes():
+    """Add the indexes the Training Compliance Report drills down on"""
     
-    doctype.insert()
-    print("✅ Created Training Record DocType")
+    if frappe.db.exists("DocType", "Training Record"):
+        # expiration_date alone is the field's search_index
+        frappe.db.add_index("Training Record", ["department", "expiration_date"], "department_expiration_date")
+        # Per-employee validity checks behind the Training Compliance Rate KPI
+        frappe.db.add_index("Training Record", ["employee", "expiration_date"], "employee_expiration_date")
 
+        # Sites set up before the composite also indexed department alone,
+        # which its leading column covers
+        frappe.db.set_value(
+            "DocField", {"parent": "Training Record", "fieldname": "department"}, "search_index", 0
+        )
+        if frappe.db.has_index("tabTraining Record", "department"):
+            frappe.db.sql_ddl("ALTER TABLE `tabTraining Record` DROP INDEX `department`")
+        frappe.clear_cache(doctype="Training Record")
+        print("✅ Ensured Training Record indexes")
+
+INCIDENT_REPORT = {
+    "doctype": "DocType",
+    "name": "Incident Report",
+    "module": "Stock",
+    "custom": 1,
+    "is_submittable": 1,
+    "fields": [
+        {
+            "fieldname": "incident_date",
+            "label": "Incident Date",
+            "fieldtype": "Datetime",
+            "reqd": 1,
+            "search_index": 1
+        },
+        {
+            "fieldname": "reported_by",
+            "label": "Reported By",
+            "fieldtype": "Link",
+            "options": "Employee",
+            "reqd": 1
+        },
+        {
+            "fieldname": "cb1",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "incident_type",
+            "label": "Incident Type",
+            "fieldtype": "Select",
+            "options": "\nSpill\nNeedlestick\nExposure\nImproper Disposal\nContainer Overflow\nTransportation Incident",
+            "reqd": 1
+        },
+        {
+            "fieldname": "severity",
+            "label": "Severity",
+            "fieldtype": "Select",
+            "options": "\nLow\nMedium\nHigh\nCritical",
+            "reqd": 1
+        },
+        {
+            "fieldname": "sb1",
+            "fieldtype": "Section Break",
+            "label": "Location Information"
+        },
+        {
+            "fieldname": "location",
+            "label": "Location",
+            "fieldtype": "Data",
+            "reqd": 1
+        },
+        {
+            "fieldname": "department",
+            "label": "Department",
+            "fieldtype": "Link",
+            "options": "Department"
+        },
+        {
+            "fieldname": "cb2",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "room_number",
+            "label": "Room Number",
+            "fieldtype": "Data"
+        },
+        {
+            "fieldname": "witnesses",
+            "label": "Witnesses",
+            "fieldtype": "Text"
+        },
+        {
+            "fieldname": "sb2",
+            "fieldtype": "Section Break",
+            "label": "Incident Description"
+        },
+        {
+            "fieldname": "description",
+            "label": "Incident Description",
+            "fieldtype": "Text",
+            "reqd": 1
+        },
+        {
+            "fieldname": "immediate_actions",
+            "label": "Immediate Actions Taken",
+            "fieldtype": "Text"
+        },
+        {
+            "fieldname": "sb3",
+            "fieldtype": "Section Break",
+            "label": "Personnel Involved"
+        },
+        {
+            "fieldname": "personnel_affected",
+            "label": "Personnel Affected",
+            "fieldtype": "Table",
+            "options": "Affected Personnel"
+        },
+        {
+            "fieldname": "sb4",
+            "fieldtype": "Section Break",
+            "label": "Investigation and Follow-up"
+        },
+        {
+            "fieldname": "root_cause",
+            "label": "Root Cause Analysis",
+            "fieldtype": "Text"
+        },
+        {
+            "fieldname": "corrective_actions",
+            "label": "Corrective Actions",
+            "fieldtype": "Text"
+        },
+        {
+            "fieldname": "cb3",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "preventive_actions",
+            "label": "Preventive Actions",
+            "fieldtype": "Text"
+        },
+        {
+            "fieldname": "follow_up_date",
+            "label": "Follow-up Date",
+            "fieldtype": "Date"
+        }
+    ]
+}
+
+@profiled
 def create_incident_report():
     """Create Incident Report DocType"""
     
-    if frappe.db.exists("DocType", "Incident Report"):
-        print("⚠️  Incident Report DocType already exists")
-        return
-    
-    doctype = frappe.get_doc({
-        "doctype": "DocType",
-        "name": "Incident Report",
-        "module": "Stock",
-        "custom": 1,
-        "is_submittable": 1,
-        "fields": [
-            {
-                "fieldname": "incident_date",
-                "label": "Incident Date",
-                "fieldtype": "Datetime",
-                "reqd": 1
-            },
-            {
-                "fieldname": "reported_by",
-                "label": "Reported By",
-                "fieldtype": "Link",
-                "options": "Employee",
-                "reqd": 1
-            },
-            {
-                "fieldname": "cb1",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "incident_type",
-                "label": "Incident Type",
-                "fieldtype": "Select",
-                "options": "\\nSpill\\nNeedlestick\\nExposure\\nImproper Disposal\\nContainer Overflow\\nTransportation Incident",
-                "reqd": 1
-            },
-            {
-                "fieldname": "severity",
-                "label": "Severity",
-                "fieldtype": "Select",
-                "options": "\\nLow\\nMedium\\nHigh\\nCritical",
-                "reqd": 1
-            },
-            {
-                "fieldname": "sb1",
-                "fieldtype": "Section Break",
-                "label": "Location Information"
-            },
-            {
-                "fieldname": "location",
-                "label": "Location",
-                "fieldtype": "Data",
-                "reqd": 1
-            },
-            {
-                "fieldname": "department",
-                "label": "Department",
-                "fieldtype": "Link",
-                "options": "Department"
-            },
-            {
-                "fieldname": "cb2",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "room_number",
-                "label": "Room Number",
-                "fieldtype": "Data"
-            },
-            {
-                "fieldname": "witnesses",
-                "label": "Witnesses",
-                "fieldtype": "Text"
-            },
-            {
-                "fieldname": "sb2",
-                "fieldtype": "Section Break",
-                "label": "Incident Description"
-            },
-            {
-                "fieldname": "description",
-                "label": "Incident Description",
-                "fieldtype": "Text",
-                "reqd": 1
-            },
-            {
-                "fieldname": "immediate_actions",
-                "label": "Immediate Actions Taken",
-                "fieldtype": "Text"
-            },
-            {
-                "fieldname": "sb3",
-                "fieldtype": "Section Break",
-                "label": "Personnel Involved"
-            },
-            {
-                "fieldname": "personnel_affected",
-                "label": "Personnel Affected",
-                "fieldtype": "Table",
-                "options": "Affected Personnel"
-            },
-            {
-                "fieldname": "sb4",
-                "fieldtype": "Section Break",
-                "label": "Investigation and Follow-up"
-            },
-            {
-                "fieldname": "root_cause",
-                "label": "Root Cause Analysis",
-                "fieldtype": "Text"
-            },
-            {
-                "fieldname": "corrective_actions",
-                "label": "Corrective Actions",
-                "fieldtype": "Text"
-            },
-            {
-                "fieldname": "cb3",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "preventive_actions",
-                "label": "Preventive Actions",
-                "fieldtype": "Text"
-            },
-            {
-                "fieldname": "follow_up_date",
-                "label": "Follow-up Date",
-                "fieldtype": "Date"
-            }
-        ]
-    })
+    create_doctype(INCIDENT_REPORT)
+
+@profiled
+def ensure_incident_indexes():
+    """Add the composite indexes the Incident Summary Report filters on"""
     
-    doctype.insert()
-    print("✅ Created Incident Report DocType")
+    if frappe.db.exists("DocType", "Incident Report"):
+        # Half-open incident_date ranges, optionally narrowed by severity/department;
+        # incident_date alone is the field's search_index
+        frappe.db.add_index("Incident Report", ["severity", "incident_date"], "severity_incident_date")
+        frappe.db.add_index("Incident Report", ["department", "incident_date"], "department_incident_date")
+
+        # Sites set up before the composites also indexed severity and
+        # department alone, which the composites' leading columns cover
+        for fieldname in ("severity", "department"):
+            frappe.db.set_value(
+                "DocField", {"parent": "Incident Report", "fieldname": fieldname}, "search_index", 0
+            )
+            if frappe.db.has_index("tabIncident Report", fieldname):
+                frappe.db.sql_ddl(f"ALTER TABLE `tabIncident Report` DROP INDEX `{fieldname}`")
+        frappe.clear_cache(doctype="Incident Report")
+        print("✅ Ensured Incident Report indexes")
 
+AFFECTED_PERSONNEL = {
+    "doctype": "DocType",
+    "name": "Affected Personnel",
+    "module": "Stock",
+    "custom": 1,
+    "istable": 1,
+    "fields": [
+        {
+            "fieldname": "employee",
+            "label": "Employee",
+            "fieldtype": "Link",
+            "options": "Employee"
+        },
+        {
+            "fieldname": "employee_name",
+            "label": "Employee Name",
+            "fieldtype": "Data",
+            "fetch_from": "employee.employee_name"
+        },
+        {
+            "fieldname": "injury_type",
+            "label": "Injury/Exposure Type",
+            "fieldtype": "Select",
+            "options": "\nNone\nNeedlestick\nCut\nSkin Contact\nInhalation\nIngestion\nOther"
+        },
+        {
+            "fieldname": "medical_attention",
+            "label": "Medical Attention Required",
+            "fieldtype": "Check"
+        },
+        {
+            "fieldname": "notes",
+            "label": "Notes",
+            "fieldtype": "Text"
+        }
+    ]
+}
+
+@profiled
 def create_affected_personnel_table():
     """Create child table for affected personnel"""
     
-    if frappe.db.exists("DocType", "Affected Personnel"):
-        print("⚠️  Affected Personnel DocType already exists")
-        return
+    create_doctype(AFFECTED_PERSONNEL)
+
+WASTE_QUERY_LOG = {
+    "doctype": "DocType",
+    "name": "Waste Query Log",
+    "module": "Stock",
+    "custom": 1,
+    "autoname": "hash",
+    "in_create": 1,
+    "read_only": 1,
+    "sort_field": "creation",
+    "sort_order": "DESC",
+    "fields": [
+        {
+            "fieldname": "source",
+            "label": "Report / Script",
+            "fieldtype": "Data",
+            "in_list_view": 1,
+            "in_standard_filter": 1,
+            "search_index": 1
+        },
+        {
+            "fieldname": "filters",
+            "label": "Filters",
+            "fieldtype": "Code",
+            "options": "JSON"
+        },
+        {
+            "fieldname": "trace_id",
+            "label": "Trace ID",
+            "fieldtype": "Data",
+            "search_index": 1,
+            "description": "Statements from the same report run or script share a trace"
+        },
+        {
+            "fieldname": "cb1",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "duration_ms",
+            "label": "Duration (ms)",
+            "fieldtype": "Float",
+            "in_list_view": 1
+        },
+        {
+            "fieldname": "rows_examined",
+            "label": "Rows Examined",
+            "fieldtype": "Int",
+            "in_list_view": 1
+        },
+        {
+            "fieldname": "rows_returned",
+            "label": "Rows Returned",
+            "fieldtype": "Int"
+        },
+        {
+            "fieldname": "is_slow",
+            "label": "Slow",
+            "fieldtype": "Check",
+            "in_standard_filter": 1
+        },
+        {
+            "fieldname": "sb1",
+            "fieldtype": "Section Break",
+            "label": "Statement"
+        },
+        {
+            "fieldname": "query_fingerprint",
+            "label": "Fingerprint",
+            "fieldtype": "Data",
+            "in_standard_filter": 1,
+            "search_index": 1,
+            "description": "Same statement with different literals"
+        },
+        {
+            "fieldname": "query",
+            "label": "Query",
+            "fieldtype": "Code",
+            "options": "SQL"
+        },
+        {
+            "fieldname": "explain",
+            "label": "EXPLAIN",
+            "fieldtype": "Code",
+            "options": "JSON",
+            "description": "Captured for slow reads only"
+        }
+    ],
+    "permissions": [
+        {
+            "role": "System Manager",
+            "read": 1,
+            "report": 1,
+            "export": 1,
+            "delete": 1
+        }
+    ]
+}
+
+@profiled
+def create_waste_query_log():
+    """Create Waste Query Log DocType for traced report and setup SQL"""
     
-    doctype = frappe.get_doc({
-        "doctype": "DocType",
-        "name": "Affected Personnel",
-        "module": "Stock",
-        "custom": 1,
-        "istable": 1,
-        "fields": [
-            {
-                "fieldname": "employee",
-                "label": "Employee",
-                "fieldtype": "Link",
-                "options": "Employee"
-            },
-            {
-                "fieldname": "employee_name",
-                "label": "Employee Name",
-                "fieldtype": "Data",
-                "fetch_from": "employee.employee_name"
-            },
-            {
-                "fieldname": "injury_type",
-                "label": "Injury/Exposure Type",
-                "fieldtype": "Select",
-                "options": "\\nNone\\nNeedlestick\\nCut\\nSkin Contact\\nInhalation\\nIngestion\\nOther"
-            },
-            {
-                "fieldname": "medical_attention",
-                "label": "Medical Attention Required",
-                "fieldtype": "Check"
-            },
-            {
-                "fieldname": "notes",
-                "label": "Notes",
-                "fieldtype": "Text"
-            }
-        ]
-    })
+    create_doctype(WASTE_QUERY_LOG)
+
+@profiled
+def ensure_query_log_indexes():
+    """Add the index the slowest-statement rollups group on"""
     
-    doctype.insert()
-    print("✅ Created Affected Personnel DocType")
+    if frappe.db.exists("DocType", "Waste Query Log"):
+        frappe.db.add_index("Waste Query Log", ["source", "creation"], "source_creation")
+        print("✅ Ensured Waste Query Log indexes")
 
+# Creation order: child tables before the DocTypes that use them
+CUSTOM_DOCTYPES = [
+    MEDICAL_WASTE_MANIFEST_ITEM,
+    MEDICAL_WASTE_MANIFEST,
+    WASTE_CONTAINER_TRACKING,
+    INSPECTION_AREA,
+    COMPLIANCE_INSPECTION,
+    TRAINING_RECORD,
+    AFFECTED_PERSONNEL,
+    INCIDENT_REPORT,
+    WASTE_QUERY_LOG
+]
+
+@profiled_run
 def main():
     """Main function to create all custom doctypes"""
     try:
@@ -873,6 +1057,7 @@ def main():
         print("\n📄 Creating manifest-related doctypes...")
         create_manifest_item_table()
         create_medical_waste_manifest()
+        ensure_manifest_indexes()
         
         print("\n📦 Creating container tracking...")
         create_waste_container_tracking()
@@ -883,10 +1068,16 @@ def main():
         
         print("\n🎓 Creating training records...")
         create_training_record()
+        ensure_training_indexes()
         
         print("\n⚠️  Creating incident reporting...")
         create_affected_personnel_table()
         create_incident_report()
+        ensure_incident_indexes()
+        
+        print("\n🔬 Creating query log...")
+        create_waste_query_log()
+        ensure_query_log_indexes()
         
         frappe.db.commit()
         print("\n✅ All custom DocTypes created successfully!")
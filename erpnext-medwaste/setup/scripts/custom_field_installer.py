@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Custom Field Installer
+Installs Custom Fields grouped by DocType, with one schema update and meta flush each
+"""
+
+import frappe
+from frappe.custom.doctype.custom_field.custom_field import create_custom_fields
+
+from bulk_apply import existing_keys
+
+def _last_fieldname(doctype):
+    fields = frappe.get_meta(doctype).fields
+    return fields[-1].fieldname if fields else None
+
+def install_custom_fields(fields, update=True):
+    """Create the missing Custom Fields and update the rest, per DocType
+
+        install_custom_fields([{"dt": "Supplier", "fieldname": "epa_permit_number", ...}, ...])
+
+    Inserting Custom Fields one at a time alters the parent table and
+    flushes its meta on every insert, which on Stock Ledger Entry or
+    Purchase Order rebuilds a large table once per field. Here every field
+    of a DocType is saved first and the table is altered once, through
+    Frappe's create_custom_fields.
+
+    New fields without an insert_after follow the field listed before them,
+    the first one after the DocType's current last field, so Custom Field
+    validation never has to load uncached meta to place them.
+    """
+
+    present = existing_keys("Custom Field", fields, ("dt", "fieldname"))
+
+    by_doctype = {}
+    previous = {}
+    for field in fields:
+        doctype = field["dt"]
+        if doctype not in previous:
+            previous[doctype] = _last_fieldname(doctype)
+
+        df = {key: value for key, value in field.items() if key != "dt"}
+        if (doctype, df["fieldname"]) not in present and not df.get("insert_after"):
+            df["insert_after"] = previous[doctype]
+        previous[doctype] = df["fieldname"]
+        by_doctype.setdefault(doctype, []).append(df)
+
+    create_custom_fields(by_doctype, update=update)
+
+    for doctype, doctype_fields in by_doctype.items():
+        created = sum((doctype, df["fieldname"]) not in present for df in doctype_fields)
+        print(f"✅ {doctype}: {created} custom fields created, {len(doctype_fields) - created} already present")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Server Script Hooks
+Wires DocType events to whitelisted functions in the setup modules
+"""
+
+import frappe
+
+HOOK_PREFIX = "Medwaste"
+
+def ensure_doc_event_hook(label, reference_doctype, doctype_event, method):
+    """Create or update a DocType Event Server Script that calls `method`
+
+    The script only forwards the document's doctype and name, so the target
+    function must re-read whatever state it needs and be safe to call twice.
+
+    The setup modules are files copied into the bench of each container, not
+    an installed app, so a recreated container or a worker they were never
+    copied to can't import them. frappe.call reports that as a
+    ValidationError ("Failed to get method for command ...") naming the
+    method; the hook then logs an Error Log against the document and skips,
+    instead of failing the document's save, and the module's backfill or
+    reconcile catches up. Any other error is raised as before.
+    """
+
+    name = f"{HOOK_PREFIX} - {label}"
+    script = (
+        "try:\n"
+        f'    frappe.call("{method}", doctype=doc.doctype, name=doc.name)\n'
+        "except frappe.ValidationError as e:\n"
+        f'    if "{method}" not in str(e):\n'
+        "        raise\n"
+        f'    frappe.log_error(title="{HOOK_PREFIX} hook skipped: {method}", message=str(e), '
+        "reference_doctype=doc.doctype, reference_name=doc.name)\n"
+    )
+
+    if frappe.db.exists("Server Script", name):
+        server_script = frappe.get_doc("Server Script", name)
+        if (
+            server_script.script == script
+            and server_script.reference_doctype == reference_doctype
+            and server_script.doctype_event == doctype_event
+            and not server_script.disabled
+        ):
+            return server_script
+
+        server_script.update({
+            "reference_doctype": reference_doctype,
+            "doctype_event": doctype_event,
+            "script": script,
+            "disabled": 0
+        })
+        server_script.save()
+        print(f"🔄 Updated hook: {name}")
+        return server_script
+
+    server_script = frappe.get_doc({
+        "doctype": "Server Script",
+        "name": name,
+        "script_type": "DocType Event",
+        "reference_doctype": reference_doctype,
+        "doctype_event": doctype_event,
+        "script": script
+    })
+    server_script.insert()
+    print(f"✅ Created hook: {name}")
+    return server_script
+
+def ensure_scheduled_hook(label, event_frequency, method, queue="long"):
+    """Create or update a Scheduler Event Server Script that enqueues `method`
+
+    The job is enqueued rather than run inline so it lands on the long-queue
+    worker, which has the setup modules copied in; the script itself imports
+    nothing, so the scheduler needs no copy. If the worker lost them, each
+    run fails with an Error Log until they are copied back. `method` must be
+    whitelisted, as Server Scripts may only enqueue whitelisted functions.
+    """
+
+    name = f"{HOOK_PREFIX} - {label}"
+    script = f'frappe.enqueue("{method}", queue="{queue}")\n'
+
+    if frappe.db.exists("Server Script", name):
+        server_script = frappe.get_doc("Server Script", name)
+        if (
+            server_script.script == script
+            and server_script.event_frequency == event_frequency
+            and not server_script.disabled
+        ):
+            return server_script
+
+        server_script.update({
+            "event_frequency": event_frequency,
+            "script": script,
+            "disabled": 0
+        })
+        server_script.save()
+        print(f"🔄 Updated scheduled job: {name}")
+        return server_script
+
+    server_script = frappe.get_doc({
+        "doctype": "Server Script",
+        "name": name,
+        "script_type": "Scheduler Event",
+        "event_frequency": event_frequency,
+        "script": script
+    })
+    server_script.insert()
+    print(f"✅ Created scheduled job: {name}")
+    return server_script
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Container Fill Forecast
+Fits fill rates per container and per department and container type with NumPy, and predicts when each container is full
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import add_to_date, cint, flt, now_datetime
+
+import container_board
+import container_readings
+from doc_event_hooks import ensure_scheduled_hook
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FORECAST_TABLE = "__container_forecasts"
+
+CONTAINER_DOCTYPE = "Waste Container Tracking"
+
+# Containers that are filling; the rest get no forecast
+FORECAST_STATUSES = ["In Use", "Full"]
+
+# Hours of readings a fit looks back over, bucketed per hour
+LOOKBACK_HOURS = 72
+
+# A drop of this many points between readings means the container was
+# emptied and a new fill cycle started; only the current cycle is fitted
+RESET_DROP = 30
+
+# A container needs this many hourly points for a rate of its own; with
+# fewer its rate leans on its department and container type. PRIOR_POINTS
+# is how many points the group rate counts as when blended in.
+MIN_POINTS = 3
+PRIOR_POINTS = 6
+
+FULL_LEVEL = 100
+
+# Further out than this is no forecast at all
+MAX_HORIZON_HOURS = 30 * 24
+
+# Containers read and fitted per chunk, bounding memory at tens of thousands
+CONTAINER_CHUNK = 5000
+INSERT_BATCH_SIZE = 1000
+
+def ensure_forecast_table():
+    """Create the per-container forecast table if missing"""
+
+    frappe.db.sql_ddl(f"""
+        CREATE TABLE IF NOT EXISTS `{FORECAST_TABLE}` (
+            `container_id` VARCHAR(140) NOT NULL,
+            `fill_rate` DECIMAL(9,4) NULL,
+            `predicted_full_at` DATETIME NULL,
+            `points` INT NOT NULL DEFAULT 0,
+            `model` VARCHAR(20) NOT NULL,
+            `forecast_at` DATETIME(6) NOT NULL,
+            PRIMARY KEY (`container_id`),
+            KEY `predicted_full_at` (`predicted_full_at`)
+        ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC CHARACTER SET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+def install_forecast_hooks():
+    """Refresh the forecasts every hour"""
+
+    ensure_scheduled_hook("Container Fill Forecast", "Hourly", "fill_forecast.run")
+
+def _hourly_points(container_ids, since):
+    """(container index, hours since `since`, mean fill) per container and hour, sorted"""
+
+    rows = frappe.db.sql(f"""
+        SELECT
+            container_id,
+            AVG(TIMESTAMPDIFF(SECOND, %(since)s, reading_time)) / 3600,
+            AVG(fill_level)
+        FROM `{container_readings.READINGS_TABLE}`
+        WHERE container_id IN %(container_ids)s AND reading_time >= %(since)s
+        GROUP BY container_id, DATE(reading_time), HOUR(reading_time)
+    """, {"container_ids": container_ids, "since": since})
+
+    position = {name: index for index, name in enumerate(container_ids)}
+    codes = np.fromiter((position[row[0]] for row in rows), dtype=np.int64, count=len(rows))
+    hours = np.fromiter((flt(row[1]) for row in rows), dtype=np.float64, count=len(rows))
+    fills = np.fromiter((flt(row[2]) for row in rows), dtype=np.float64, count=len(rows))
+
+    order = np.lexsort((hours, codes))
+    return codes[order], hours[order], fills[order]
+
+def fit_rates(codes, hours, fills, size):
+    """Least-squares fill rate (points per hour) and point count per container
+
+    `codes` index the containers and must be sorted, with `hours` ascending
+    within each container. Every step is a whole-array operation; no Python
+    loop runs per container or per point.
+    """
+
+    if not len(codes):
+        return np.full(size, np.nan), np.zeros(size)
+
+    # Number the fill cycles: a new one starts at each container and at
+    # each reset drop, and only each container's last one is kept
+    first = np.r_[True, codes[1:] != codes[:-1]]
+    reset = np.r_[False, np.diff(fills) < -RESET_DROP] & ~first
+    cycle = np.cumsum(first | reset)
+    last_cycle = np.zeros(size, dtype=cycle.dtype)
+    np.maximum.at(last_cycle, codes, cycle)
+    current = cycle == last_cycle[codes]
+    codes, hours, fills = codes[current], hours[current], fills[current]
+
+    points = np.bincount(codes, minlength=size).astype(np.float64)
+    divisor = np.maximum(points, 1)
+    mean_hours = np.bincount(codes, hours, size) / divisor
+    mean_fill = np.bincount(codes, fills, size) / divisor
+
+    # Centered per container, so the sums stay small whatever the origin
+    dh = hours - mean_hours[codes]
+    df = fills - mean_fill[codes]
+    sxx = np.bincount(codes, dh * dh, size)
+    sxy = np.bincount(codes, dh * df, size)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rates = np.where((points >= MIN_POINTS) & (sxx > 0), sxy / sxx, np.nan)
+    return rates, points
+
+def blend_rates(rates, points, groups):
+    """Shrink each container's rate towards its group's, by how much data it has
+
+    `groups` numbers each container's department and container type. A
+    group's rate is the point-weighted mean of its members' rising rates;
+    groups without one fall back to the site-wide rate. Returns the blended
+    rates and whether each one rests on the container's own fit.
+    """
+
+    own = np.isfinite(rates) & (rates > 0)
+    weights = np.where(own, points, 0.0)
+    weighted = np.where(own, rates * points, 0.0)
+
+    group_weight = np.bincount(groups, weights)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        group_rates = np.bincount(groups, weighted) / group_weight
+        site_rate = weighted.sum() / weights.sum() if weights.sum() else np.nan
+    prior = np.where(np.isfinite(group_rates), group_rates, site_rate)[groups]
+
+    blended = (weighted + PRIOR_POINTS * prior) / (weights + PRIOR_POINTS)
+    return np.where(np.isfinite(prior), blended, np.where(own, rates, np.nan)), own
+
+def _write(forecasts, now):
+    """Store the forecasts and copy them onto the containers"""
+
+    for start in range(0, len(forecasts), INSERT_BATCH_SIZE):
+        batch = forecasts[start:start + INSERT_BATCH_SIZE]
+        frappe.db.sql(f"""
+            INSERT INTO `{FORECAST_TABLE}` (container_id, fill_rate, predicted_full_at, points, model, forecast_at)
+            VALUES {", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(batch))}
+            ON DUPLICATE KEY UPDATE
+                fill_rate = VALUES(fill_rate),
+                predicted_full_at = VALUES(predicted_full_at),
+                points = VALUES(points),
+                model = VALUES(model),
+                forecast_at = VALUES(forecast_at)
+        """, [value for forecast in batch for value in forecast])
+
+    # Containers no longer filling lose their forecast
+    frappe.db.sql(f"DELETE FROM `{FORECAST_TABLE}` WHERE forecast_at < %s", now)
+
+    # Like the latest reading, a cached value: no Version, no new `modified`.
+    # fill_rate is a Float column, NOT NULL: no rate is stored as 0.
+    frappe.db.sql(f"""
+        UPDATE `tab{CONTAINER_DOCTYPE}` c
+        LEFT JOIN `{FORECAST_TABLE}` f ON f.container_id = c.name
+        SET c.fill_rate = IFNULL(f.fill_rate, 0), c.predicted_full_at = f.predicted_full_at
+        WHERE c.fill_rate <> IFNULL(f.fill_rate, 0) OR NOT (c.predicted_full_at <=> f.predicted_full_at)
+    """)
+    frappe.db.commit()
+
+@frappe.whitelist()
+def run():
+    """Fit every filling container's rate and write its predicted full time
+
+    Runs hourly from a scheduled Server Script, or by hand:
+        bench --site frontend execute fill_forecast.run
+
+    Readings are bucketed per hour in SQL and fitted in NumPy a chunk of
+    containers at a time; the group rates and predictions are then computed
+    over all containers at once. Needs numpy (bench pip install numpy).
+    """
+
+    frappe.only_for("System Manager")
+
+    if np is None:
+        frappe.throw(_("Fill forecasting needs numpy: bench pip install numpy"))
+
+    now = now_datetime()
+    since = add_to_date(now, hours=-LOOKBACK_HOURS)
+    containers = frappe.get_all(
+        CONTAINER_DOCTYPE,
+        filters={"status": ["in", FORECAST_STATUSES], "last_reading_at": ["is", "set"]},
+        fields=["name", "department", "container_type", "fill_level", "last_reading_at"],
+        order_by="name"
+    )
+    if not containers:
+        print("⚠️  No filling containers with readings to forecast")
+        return 0
+
+    rates, points = [], []
+    for start in range(0, len(containers), CONTAINER_CHUNK):
+        names = [row.name for row in containers[start:start + CONTAINER_CHUNK]]
+        chunk_rates, chunk_points = fit_rates(*_hourly_points(names, since), len(names))
+        rates.append(chunk_rates)
+        points.append(chunk_points)
+    rates, points = np.concatenate(rates), np.concatenate(points)
+
+    _keys, groups = np.unique(
+        np.array([f"{row.department or ''}\x1f{row.container_type or ''}" for row in containers]),
+        return_inverse=True
+    )
+    rates, own = blend_rates(rates, points, groups)
+
+    fill_now = np.array([flt(row.fill_level) for row in containers])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hours_left = np.where(fill_now >= FULL_LEVEL, 0.0, (FULL_LEVEL - fill_now) / rates)
+    valid = np.isfinite(hours_left) & (hours_left >= 0) & (hours_left <= MAX_HORIZON_HOURS)
+
+    last_reading = np.array([row.last_reading_at for row in containers], dtype="datetime64[s]")
+    predicted = last_reading + np.where(valid, hours_left * 3600, 0).astype("timedelta64[s]")
+
+    forecasts = [
+        (
+            row.name,
+            flt(rate, 4) if np.isfinite(rate) else None,
+            predicted[index].item() if valid[index] else None,
+            cint(points[index]),
+            "Container" if own[index] else "Group",
+            now
+        )
+        for index, (row, rate) in enumerate(zip(containers, rates))
+    ]
+    _write(forecasts, now)
+
+    for start in range(0, len(containers), CONTAINER_CHUNK):
+        container_board.refresh([row.name for row in containers[start:start + CONTAINER_CHUNK]])
+
+    print(f"✅ Forecast {int(valid.sum())} of {len(containers)} containers "
+          f"({int(own.sum())} from their own readings)")
+    return int(valid.sum())
+
+@frappe.whitelist()
+def get_due(within_hours=24, department=None):
+    """Filling containers predicted full within the next `within_hours`, soonest first
+
+        GET /api/method/fill_forecast.get_due?within_hours=8&department=Oncology - MW
+
+    Already overdue predictions are included, so nothing that should have
+    been collected drops off the list.
+    """
+
+    filters = {
+        "status": ["in", FORECAST_STATUSES],
+        "predicted_full_at": ["<=", add_to_date(now_datetime(), hours=flt(within_hours))]
+    }
+    if department:
+        filters["department"] = department
+
+    return frappe.get_list(
+        CONTAINER_DOCTYPE,
+        filters=filters,
+        fields=[
+            "name", "container_type", "status", "department", "current_location", "room_number",
+            "fill_level", "fill_rate", "last_reading_at", "predicted_full_at"
+        ],
+        order_by="predicted_full_at asc"
+    )
@@ -0,0 +1,596 @@
+#!/usr/bin/env python3
+"""
+Medical Waste KPI Engine
+Keeps each KPI's numerator and denominator as monthly and quarterly aggregates
+"""
+
+from collections import defaultdict
+
+import frappe
+from frappe import _
+from frappe.utils import add_months, flt, get_first_day, get_last_day, get_quarter_start, getdate, today
+
+import medical_waste_items
+from doc_event_hooks import ensure_doc_event_hook, ensure_scheduled_hook
+
+AGGREGATE_TABLE = "__kpi_aggregates"
+CONTRIBUTION_TABLE = "__kpi_contributions"
+EXPECTED_TABLE = "__kpi_expected"
+PERIOD_TABLE = "__kpi_periods"
+TRAINING_EMPLOYEE_TABLE = "__kpi_training_employees"
+
+PERIOD_TYPES = ("Month", "Quarter")
+
+# Point-in-time KPIs are evaluated at each period end this far back
+HISTORY_YEARS = 5
+
+# Manually entered figures (patient days, work hours) are stored as
+# contributions from this pseudo source so reconcile leaves them alone
+INPUT_SOURCE = "KPI Input"
+
+DISPOSAL_SUPPLIER_GROUPS = [
+    "Medical Waste Disposal",
+    "Sharps Disposal",
+    "Pharmaceutical Waste Disposal",
+    "Pathological Waste Disposal",
+    "Chemotherapy Waste Disposal",
+    "Hazmat Transportation",
+    "Treatment Facilities"
+]
+
+def _month_start(column):
+    return f"DATE_SUB({column}, INTERVAL DAYOFMONTH({column}) - 1 DAY)"
+
+def _quarter_start(column):
+    return f"(MAKEDATE(YEAR({column}), 1) + INTERVAL QUARTER({column}) - 1 QUARTER)"
+
+# Each source query returns source_name, period_start, numerator and
+# denominator for "flow" sources, whose monthly rows also roll up into their
+# quarter, plus period_type for point-in-time ones, which are evaluated at
+# each period end. `{condition}` narrows it to the documents being synced.
+KPIS = {
+    "Waste Generation Rate": {
+        "formula": "Total waste generated / Patient days",
+        "unit": "qty/patient day",
+        "target": "< 15",
+        "frequency": "Monthly",
+        "multiplier": 1,
+        "inputs": {"denominator": "Patient Days"},
+        "sources": {
+            "Stock Entry": {
+                "key": "sle.voucher_no",
+                "query": f"""
+                    SELECT sle.voucher_no as source_name,
+                        {_month_start("sle.posting_date")} as period_start,
+                        SUM(sle.actual_qty) as numerator, 0 as denominator
+                    FROM `tabStock Ledger Entry` sle
+                    JOIN `{medical_waste_items.ITEM_TABLE}` mw ON sle.item_code = mw.item_code
+                    WHERE sle.voucher_type = 'Stock Entry'
+                    AND sle.is_cancelled = 0
+                    AND sle.actual_qty > 0 {{condition}}
+                    GROUP BY sle.voucher_no, {_month_start("sle.posting_date")}
+                """
+            }
+        }
+    },
+    "Disposal Cost per Pound": {
+        "formula": "Total disposal costs / Total weight disposed",
+        "unit": "$/lb",
+        "target": "< $3.50",
+        "frequency": "Monthly",
+        "multiplier": 1,
+        "sources": {
+            "Purchase Invoice": {
+                "key": "pi.name",
+                "query": f"""
+                    SELECT pi.name as source_name, {_month_start("pi.posting_date")} as period_start,
+                        pi.base_net_total as numerator, 0 as denominator
+                    FROM `tabPurchase Invoice` pi
+                    JOIN `tabSupplier` s ON s.name = pi.supplier
+                    WHERE pi.docstatus = 1
+                    AND s.supplier_group IN ({", ".join(f"'{group}'" for group in DISPOSAL_SUPPLIER_GROUPS)})
+                    {{condition}}
+                """
+            },
+            # Weighed from the item lines; nothing fills in the manifest's total_weight
+            "Medical Waste Manifest": {
+                "key": "m.name",
+                "query": f"""
+                    SELECT m.name as source_name, {_month_start("m.manifest_date")} as period_start,
+                        0 as numerator, IFNULL(SUM(mi.weight_lbs), 0) as denominator
+                    FROM `tabMedical Waste Manifest` m
+                    LEFT JOIN `tabMedical Waste Manifest Item` mi
+                        ON mi.parent = m.name AND mi.parenttype = 'Medical Waste Manifest'
+                    WHERE m.docstatus = 1 {{condition}}
+                    GROUP BY m.name, {_month_start("m.manifest_date")}
+                """
+            }
+        }
+    },
+    "Training Compliance Rate": {
+        "formula": "(Current trained employees / Total employees) * 100",
+        "unit": "%",
+        "target": "> 95%",
+        "frequency": "Quarterly",
+        "multiplier": 100,
+        "sources": {
+            # Employees on the books at each period end, and whether one of
+            # their training records was valid on that day
+            "Employee": {
+                "key": "e.name",
+                "point_in_time": True,
+                "query": f"""
+                    SELECT e.name as source_name, p.period_type, p.period_start,
+                        EXISTS (
+                            SELECT 1 FROM `tabTraining Record` tr
+                            WHERE tr.employee = e.name
+                            AND tr.training_date <= p.period_end
+                            AND tr.expiration_date >= p.period_end
+                        ) as numerator,
+                        1 as denominator
+                    FROM `tabEmployee` e
+                    JOIN `{PERIOD_TABLE}` p
+                        ON (e.date_of_joining IS NULL OR e.date_of_joining <= p.period_end)
+                        AND (e.relieving_date IS NULL OR e.relieving_date > p.period_end)
+                    WHERE NOT (e.status = 'Left' AND e.relieving_date IS NULL) {{condition}}
+                """
+            }
+        }
+    },
+    "Manifest Completion Rate": {
+        "formula": "(Completed manifests / Total manifests) * 100",
+        "unit": "%",
+        "target": "100%",
+        "frequency": "Monthly",
+        "multiplier": 100,
+        "sources": {
+            "Medical Waste Manifest": {
+                "key": "m.name",
+                "query": f"""
+                    SELECT m.name as source_name, {_month_start("m.manifest_date")} as period_start,
+                        CASE WHEN m.status = 'Completed' THEN 1 ELSE 0 END as numerator, 1 as denominator
+                    FROM `tabMedical Waste Manifest` m
+                    WHERE m.docstatus < 2 {{condition}}
+                """
+            }
+        }
+    },
+    "Incident Rate": {
+        "formula": "Number of incidents / 100,000 work hours",
+        "unit": "incidents/100k hours",
+        "target": "< 2",
+        "frequency": "Quarterly",
+        "multiplier": 100_000,
+        "inputs": {"denominator": "Work Hours"},
+        "sources": {
+            "Incident Report": {
+                "key": "ir.name",
+                "query": f"""
+                    SELECT ir.name as source_name, {_month_start("DATE(ir.incident_date)")} as period_start,
+                        1 as numerator, 0 as denominator
+                    FROM `tabIncident Report` ir
+                    WHERE ir.docstatus = 1 {{condition}}
+                """
+            }
+        }
+    }
+}
+
+# Events after which a source document's contribution may have changed
+SOURCE_EVENTS = {
+    "Stock Entry": ["After Submit", "After Cancel"],
+    "Purchase Invoice": ["After Submit", "After Cancel"],
+    "Medical Waste Manifest": [
+        "After Insert", "After Save", "After Submit", "After Save (Submitted Document)",
+        "After Cancel", "After Delete"
+    ],
+    "Incident Report": ["After Submit", "After Cancel"],
+    "Employee": ["After Insert", "After Save", "After Delete"],
+    # Resolved to the employees it affects
+    "Training Record": ["After Insert", "After Save", "After Delete"]
+}
+
+def ensure_kpi_tables():
+    """Create the aggregate, contribution and period tables if missing"""
+
+    frappe.db.sql_ddl(f"""
+        CREATE TABLE IF NOT EXISTS `{AGGREGATE_TABLE}` (
+            `kpi` VARCHAR(140) NOT NULL,
+            `period_type` VARCHAR(10) NOT NULL,
+            `period_start` DATE NOT NULL,
+            `numerator` DECIMAL(21,6) NOT NULL DEFAULT 0,
+            `denominator` DECIMAL(21,6) NOT NULL DEFAULT 0,
+            PRIMARY KEY (`kpi`, `period_type`, `period_start`)
+        ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC CHARACTER SET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # What each source document currently adds to each aggregate row
+    for table in (CONTRIBUTION_TABLE, EXPECTED_TABLE):
+        frappe.db.sql_ddl(f"""
+            CREATE TABLE IF NOT EXISTS `{table}` (
+                `kpi` VARCHAR(140) NOT NULL,
+                `source_doctype` VARCHAR(140) NOT NULL,
+                `source_name` VARCHAR(140) NOT NULL,
+                `period_type` VARCHAR(10) NOT NULL,
+                `period_start` DATE NOT NULL,
+                `numerator` DECIMAL(21,6) NOT NULL DEFAULT 0,
+                `denominator` DECIMAL(21,6) NOT NULL DEFAULT 0,
+                PRIMARY KEY (`kpi`, `source_doctype`, `source_name`, `period_type`, `period_start`)
+            ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC CHARACTER SET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """)
+
+    frappe.db.sql_ddl(f"""
+        CREATE TABLE IF NOT EXISTS `{PERIOD_TABLE}` (
+            `period_type` VARCHAR(10) NOT NULL,
+            `period_start` DATE NOT NULL,
+            `period_end` DATE NOT NULL,
+            PRIMARY KEY (`period_type`, `period_start`)
+        ) ENGINE=InnoDB
+    """)
+
+    frappe.db.sql_ddl(f"""
+        CREATE TABLE IF NOT EXISTS `{TRAINING_EMPLOYEE_TABLE}` (
+            `name` VARCHAR(140) NOT NULL,
+            `employee` VARCHAR(140) NOT NULL,
+            PRIMARY KEY (`name`)
+        ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC CHARACTER SET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+def install_kpi_hooks():
+    """Sync contributions on source events and reconcile nightly"""
+
+    for doctype, events in SOURCE_EVENTS.items():
+        for event in events:
+            ensure_doc_event_hook(
+                f"KPI Engine {doctype} {event}", doctype, event,
+                "kpi_engine.sync_document"
+            )
+
+    ensure_scheduled_hook("KPI Engine Reconcile", "Daily", "kpi_engine.reconcile")
+
+def period_start(period_type, date):
+    date = getdate(date)
+    return get_first_day(date) if period_type == "Month" else get_quarter_start(date)
+
+def ensure_periods():
+    """Make sure every period from HISTORY_YEARS ago to the current one exists"""
+
+    current = getdate(today())
+    rows = []
+    month = get_first_day(add_months(current, -12 * HISTORY_YEARS))
+    while month <= current:
+        rows.append(("Month", month, get_last_day(month)))
+        if month == get_quarter_start(month):
+            rows.append(("Quarter", month, get_last_day(add_months(month, 2))))
+        month = add_months(month, 1)
+
+    frappe.db.bulk_insert(PERIOD_TABLE, ["period_type", "period_start", "period_end"], rows, ignore_duplicates=True)
+
+def _expected_rows(kpi, source_doctype, names):
+    """Contributions the named documents should currently make"""
+
+    source = KPIS[kpi]["sources"][source_doctype]
+    query = source["query"].format(condition=f"AND {source['key']} IN %(names)s")
+    rows = frappe.db.sql(query, {"names": tuple(names)})
+
+    expected = defaultdict(lambda: [0.0, 0.0])
+    for row in rows:
+        if source.get("point_in_time"):
+            source_name, period_type, start, numerator, denominator = row
+            keys = [(source_name, period_type, getdate(start))]
+        else:
+            source_name, start, numerator, denominator = row
+            keys = [(source_name, period_type, period_start(period_type, start)) for period_type in PERIOD_TYPES]
+
+        for key in keys:
+            expected[key][0] += flt(numerator)
+            expected[key][1] += flt(denominator)
+
+    return {key: (flt(value[0], 6), flt(value[1], 6)) for key, value in expected.items() if any(value)}
+
+def _bump(kpi, period_type, start, numerator, denominator):
+    frappe.db.sql(f"""
+        INSERT INTO `{AGGREGATE_TABLE}` (kpi, period_type, period_start, numerator, denominator)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            numerator = numerator + VALUES(numerator),
+            denominator = denominator + VALUES(denominator)
+    """, (kpi, period_type, start, numerator, denominator))
+
+def _apply(kpi, source_doctype, names, expected):
+    """Move the named documents' contributions to `expected`
+
+    Compares with what was counted last time, so repeated calls change
+    nothing and edits, cancels and deletes all come out right.
+    """
+
+    counted = {
+        (row[0], row[1], getdate(row[2])): (flt(row[3], 6), flt(row[4], 6))
+        for row in frappe.db.sql(f"""
+            SELECT source_name, period_type, period_start, numerator, denominator
+            FROM `{CONTRIBUTION_TABLE}`
+            WHERE kpi = %(kpi)s AND source_doctype = %(source_doctype)s AND source_name IN %(names)s
+            FOR UPDATE
+        """, {"kpi": kpi, "source_doctype": source_doctype, "names": tuple(names)})
+    }
+
+    if counted == expected:
+        return
+
+    deltas = defaultdict(lambda: [0.0, 0.0])
+    for (_name, period_type, start), (numerator, denominator) in counted.items():
+        deltas[(period_type, start)][0] -= numerator
+        deltas[(period_type, start)][1] -= denominator
+    for (_name, period_type, start), (numerator, denominator) in expected.items():
+        deltas[(period_type, start)][0] += numerator
+        deltas[(period_type, start)][1] += denominator
+
+    for (period_type, start), (numerator, denominator) in deltas.items():
+        if flt(numerator, 6) or flt(denominator, 6):
+            _bump(kpi, period_type, start, numerator, denominator)
+
+    frappe.db.sql(f"""
+        DELETE FROM `{CONTRIBUTION_TABLE}`
+        WHERE kpi = %(kpi)s AND source_doctype = %(source_doctype)s AND source_name IN %(names)s
+    """, {"kpi": kpi, "source_doctype": source_doctype, "names": tuple(names)})
+    frappe.db.bulk_insert(
+        CONTRIBUTION_TABLE,
+        ["kpi", "source_doctype", "source_name", "period_type", "period_start", "numerator", "denominator"],
+        [(kpi, source_doctype, *key, *value) for key, value in expected.items()]
+    )
+
+def _sync(source_doctype, names):
+    # The waste volume source joins the item table: re-expand it if the
+    # resolver was invalidated since
+    medical_waste_items.get_item_codes()
+
+    for kpi, definition in KPIS.items():
+        if source_doctype in definition["sources"]:
+            _apply(kpi, source_doctype, names, _expected_rows(kpi, source_doctype, names))
+
+def _training_record_employees(name):
+    """Employees whose compliance a Training Record change can affect"""
+
+    counted = frappe.db.sql(
+        f"SELECT employee FROM `{TRAINING_EMPLOYEE_TABLE}` WHERE name = %s FOR UPDATE", name
+    )
+    current = frappe.db.get_value("Training Record", name, "employee")
+
+    frappe.db.sql(f"DELETE FROM `{TRAINING_EMPLOYEE_TABLE}` WHERE name = %s", name)
+    if current:
+        frappe.db.sql(
+            f"INSERT INTO `{TRAINING_EMPLOYEE_TABLE}` (name, employee) VALUES (%s, %s)", (name, current)
+        )
+
+    return {employee for employee in (counted[0][0] if counted else None, current) if employee}
+
+@frappe.whitelist()
+def sync_document(doctype, name):
+    """Bring the KPI aggregates in line with one source document"""
+
+    if doctype == "Training Record":
+        employees = _training_record_employees(name)
+        if employees:
+            _sync("Employee", employees)
+        return
+
+    if doctype in SOURCE_EVENTS:
+        _sync(doctype, [name])
+
+def _rebuild_expected(kpi, source_doctype):
+    """Fill the work table with every document's expected contribution"""
+
+    source = KPIS[kpi]["sources"][source_doctype]
+    query = source["query"].format(condition="")
+    params = {"kpi": kpi, "source_doctype": source_doctype}
+
+    frappe.db.sql(f"DELETE FROM `{EXPECTED_TABLE}`")
+    if source.get("point_in_time"):
+        frappe.db.sql(f"""
+            INSERT INTO `{EXPECTED_TABLE}`
+                (kpi, source_doctype, source_name, period_type, period_start, numerator, denominator)
+            SELECT %(kpi)s, %(source_doctype)s, src.* FROM ({query}) src
+        """, params)
+        return
+
+    frappe.db.sql(f"""
+        INSERT INTO `{EXPECTED_TABLE}`
+            (kpi, source_doctype, source_name, period_type, period_start, numerator, denominator)
+        SELECT %(kpi)s, %(source_doctype)s, src.source_name, 'Month', src.period_start,
+            SUM(src.numerator), SUM(src.denominator)
+        FROM ({query}) src
+        GROUP BY src.source_name, src.period_start
+    """, params)
+    frappe.db.sql(f"""
+        INSERT INTO `{EXPECTED_TABLE}`
+            (kpi, source_doctype, source_name, period_type, period_start, numerator, denominator)
+        SELECT kpi, source_doctype, source_name, 'Quarter', {_quarter_start("period_start")},
+            SUM(numerator), SUM(denominator)
+        FROM (
+            SELECT * FROM `{EXPECTED_TABLE}` WHERE period_type = 'Month'
+        ) months
+        GROUP BY kpi, source_doctype, source_name, {_quarter_start("period_start")}
+    """)
+
+def _drift(kpi, source_doctype):
+    """Contribution rows that differ between the live table and the work table"""
+
+    params = {"kpi": kpi, "source_doctype": source_doctype}
+    join = """
+        c.kpi = e.kpi AND c.source_doctype = e.source_doctype AND c.source_name = e.source_name
+        AND c.period_type = e.period_type AND c.period_start = e.period_start
+    """
+    changed = frappe.db.sql(f"""
+        SELECT COUNT(*) FROM `{EXPECTED_TABLE}` e
+        LEFT JOIN `{CONTRIBUTION_TABLE}` c ON {join}
+        WHERE (e.numerator != 0 OR e.denominator != 0)
+        AND (c.kpi IS NULL OR c.numerator != e.numerator OR c.denominator != e.denominator)
+    """)[0][0]
+    removed = frappe.db.sql(f"""
+        SELECT COUNT(*) FROM `{CONTRIBUTION_TABLE}` c
+        LEFT JOIN `{EXPECTED_TABLE}` e ON {join}
+        WHERE c.kpi = %(kpi)s AND c.source_doctype = %(source_doctype)s
+        AND (e.kpi IS NULL OR (e.numerator = 0 AND e.denominator = 0))
+    """, params)[0][0]
+    return changed + removed
+
+@frappe.whitelist()
+def reconcile(kpi=None):
+    """Recompute contributions from source data and repair any drift
+
+    Runs daily from a scheduled Server Script, which also brings new
+    periods into the point-in-time KPIs, and once after setup:
+        bench --site frontend execute kpi_engine.reconcile
+
+    Manual inputs are kept as entered.
+    """
+
+    frappe.only_for("System Manager")
+
+    ensure_periods()
+    frappe.db.sql(f"DELETE FROM `{TRAINING_EMPLOYEE_TABLE}`")
+    frappe.db.sql(f"""
+        INSERT INTO `{TRAINING_EMPLOYEE_TABLE}` (name, employee)
+        SELECT name, employee FROM `tabTraining Record` WHERE employee IS NOT NULL
+    """)
+    medical_waste_items.get_item_codes()
+
+    drift = {}
+    for kpi_name in ([kpi] if kpi else KPIS):
+        drift[kpi_name] = 0
+        for source_doctype in KPIS[kpi_name]["sources"]:
+            _rebuild_expected(kpi_name, source_doctype)
+            source_drift = _drift(kpi_name, source_doctype)
+            if not source_drift:
+                continue
+
+            drift[kpi_name] += source_drift
+            params = {"kpi": kpi_name, "source_doctype": source_doctype}
+            frappe.db.sql(f"""
+                DELETE FROM `{CONTRIBUTION_TABLE}`
+                WHERE kpi = %(kpi)s AND source_doctype = %(source_doctype)s
+            """, params)
+            frappe.db.sql(f"""
+                INSERT INTO `{CONTRIBUTION_TABLE}`
+                SELECT * FROM `{EXPECTED_TABLE}` WHERE numerator != 0 OR denominator != 0
+            """)
+
+        if drift[kpi_name]:
+            frappe.db.sql(f"DELETE FROM `{AGGREGATE_TABLE}` WHERE kpi = %s", kpi_name)
+            frappe.db.sql(f"""
+                INSERT INTO `{AGGREGATE_TABLE}` (kpi, period_type, period_start, numerator, denominator)
+                SELECT kpi, period_type, period_start, SUM(numerator), SUM(denominator)
+                FROM `{CONTRIBUTION_TABLE}`
+                WHERE kpi = %s
+                GROUP BY kpi, period_type, period_start
+            """, kpi_name)
+
+        frappe.db.sql(f"DELETE FROM `{EXPECTED_TABLE}`")
+        frappe.db.commit()
+        print(f"{'🔧' if drift[kpi_name] else '✅'} {kpi_name}: {drift[kpi_name]} contribution rows repaired")
+
+    return drift
+
+@frappe.whitelist()
+def set_input(kpi, period, value, component="denominator"):
+    """Enter a month's manual figure, e.g. patient days or work hours"""
+
+    frappe.only_for("System Manager")
+
+    if component not in KPIS.get(kpi, {}).get("inputs", {}):
+        frappe.throw(_("{0} has no manual {1}").format(kpi, component))
+
+    month = period_start("Month", period)
+    value = flt(value, 6)
+    numerator, denominator = (value, 0) if component == "numerator" else (0, value)
+
+    # Keyed by month and component, so it rolls into its quarter like any flow
+    source_name = f"{month} {component}"
+    expected = {
+        (source_name, period_type, period_start(period_type, month)): (numerator, denominator)
+        for period_type in PERIOD_TYPES
+    } if value else {}
+    _apply(kpi, INPUT_SOURCE, [source_name], expected)
+
+def _value(kpi, numerator, denominator):
+    if not denominator:
+        return None
+    return flt(flt(numerator) / flt(denominator) * KPIS[kpi]["multiplier"], 4)
+
+@frappe.whitelist()
+def get_kpi(kpi, period_type=None, period=None):
+    """One KPI for the period containing `period` (today by default)
+
+    A primary-key lookup on the aggregate, whatever the ledger size.
+    """
+
+    if kpi not in KPIS:
+        frappe.throw(_("Unknown KPI: {0}").format(kpi))
+
+    period_type = period_type or ("Quarter" if KPIS[kpi]["frequency"] == "Quarterly" else "Month")
+    start = period_start(period_type, period or today())
+    row = frappe.db.sql(f"""
+        SELECT numerator, denominator FROM `{AGGREGATE_TABLE}`
+        WHERE kpi = %s AND period_type = %s AND period_start = %s
+    """, (kpi, period_type, start))
+    numerator, denominator = row[0] if row else (0, 0)
+
+    return frappe._dict(
+        kpi=kpi,
+        period_type=period_type,
+        period_start=start,
+        numerator=flt(numerator),
+        denominator=flt(denominator),
+        value=_value(kpi, numerator, denominator),
+        unit=KPIS[kpi]["unit"],
+        target=KPIS[kpi]["target"]
+    )
+
+@frappe.whitelist()
+def get_kpi_series(kpi, period_type="Month", from_date=None, to_date=None):
+    """A KPI's value for every stored period in a date range"""
+
+    if kpi not in KPIS:
+        frappe.throw(_("Unknown KPI: {0}").format(kpi))
+
+    rows = frappe.db.sql(f"""
+        SELECT period_start, numerator, denominator FROM `{AGGREGATE_TABLE}`
+        WHERE kpi = %(kpi)s AND period_type = %(period_type)s
+        AND (%(from_date)s IS NULL OR period_start >= %(from_date)s)
+        AND (%(to_date)s IS NULL OR period_start <= %(to_date)s)
+        ORDER BY period_start
+    """, {
+        "kpi": kpi,
+        "period_type": period_type,
+        "from_date": period_start(period_type, from_date) if from_date else None,
+        "to_date": getdate(to_date) if to_date else None
+    }, as_dict=1)
+
+    for row in rows:
+        row.value = _value(kpi, row.numerator, row.denominator)
+    return rows
+
+def print_kpis(period=None):
+    """bench --site frontend execute kpi_engine.print_kpis"""
+
+    for kpi, definition in KPIS.items():
+        result = get_kpi(kpi, period=period)
+        value = f"{result.value} {definition['unit']}" if result.value is not None else "no data"
+        print(f"📈 {kpi} ({result.period_type} of {result.period_start}): {value}, target {definition['target']}")
+
+def main():
+    """Install the KPI tables and hooks and compute every KPI from scratch"""
+    try:
+        print("📈 Installing KPI engine...")
+        ensure_kpi_tables()
+        install_kpi_hooks()
+        reconcile()
+        print("✅ KPI engine installed")
+
+    except Exception as e:
+        print(f"❌ Error installing KPI engine: {str(e)}")
+        frappe.db.rollback()
+        raise
+
+if __name__ == "__main__":
+    main()
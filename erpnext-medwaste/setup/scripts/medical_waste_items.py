@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Item Resolver
+Expands the Medical Waste item group subtree into an indexed item_code set
+"""
+
+import frappe
+
+from doc_event_hooks import ensure_doc_event_hook
+
+ROOT_ITEM_GROUP = "Medical Waste"
+ITEM_TABLE = "__medical_waste_items"
+CACHE_KEY = "medwaste:medical_waste_item_codes"
+
+def ensure_item_table():
+    """Create the item_code set table if missing"""
+
+    frappe.db.sql_ddl(f"""
+        CREATE TABLE IF NOT EXISTS `{ITEM_TABLE}` (
+            `item_code` VARCHAR(140) NOT NULL,
+            PRIMARY KEY (`item_code`)
+        ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC CHARACTER SET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+def install_resolver_hooks():
+    """Invalidate the resolver whenever an Item or Item Group changes"""
+
+    for doctype, method in (
+        ("Item Group", "medical_waste_items.on_item_group_change"),
+        ("Item", "medical_waste_items.on_item_change")
+    ):
+        ensure_doc_event_hook(f"Medical Waste Items {doctype} Save", doctype, "After Save", method)
+        ensure_doc_event_hook(f"Medical Waste Items {doctype} Delete", doctype, "After Delete", method)
+
+def _subtree_bounds():
+    """Return (lft, rgt) of the Medical Waste item group, or None"""
+    return frappe.db.get_value("Item Group", ROOT_ITEM_GROUP, ["lft", "rgt"])
+
+def rebuild():
+    """Re-expand the subtree into the item_code table and the cache"""
+
+    ensure_item_table()
+    frappe.db.sql(f"DELETE FROM `{ITEM_TABLE}`")
+
+    bounds = _subtree_bounds()
+    if bounds:
+        frappe.db.sql(f"""
+            INSERT INTO `{ITEM_TABLE}` (item_code)
+            SELECT i.name
+            FROM `tabItem` i
+            JOIN `tabItem Group` ig ON i.item_group = ig.name
+            WHERE ig.lft >= %(lft)s AND ig.rgt <= %(rgt)s
+        """, {"lft": bounds[0], "rgt": bounds[1]})
+
+    item_codes = [row[0] for row in frappe.db.sql(f"SELECT item_code FROM `{ITEM_TABLE}`")]
+    frappe.cache.set_value(CACHE_KEY, item_codes)
+    return set(item_codes)
+
+def get_item_codes():
+    """Return the set of item codes under the Medical Waste item group
+
+    Also guarantees the item_code table is current, so callers may join
+    against ITEM_TABLE after calling this.
+    """
+
+    item_codes = frappe.cache.get_value(CACHE_KEY)
+    if item_codes is None:
+        return rebuild()
+    return set(item_codes)
+
+def is_medical_waste_item(item_code):
+    return item_code in get_item_codes()
+
+def invalidate():
+    frappe.cache.delete_value(CACHE_KEY)
+
+@frappe.whitelist()
+def on_item_group_change(doctype, name):
+    """Any Item Group change may move lft/rgt, so re-expand on next read"""
+    if doctype == "Item Group":
+        invalidate()
+
+@frappe.whitelist()
+def on_item_change(doctype, name):
+    """Only invalidate when the item actually joins or leaves the subtree"""
+
+    if doctype != "Item":
+        return
+
+    item_codes = frappe.cache.get_value(CACHE_KEY)
+    if item_codes is None:
+        return
+
+    item_group = frappe.db.get_value("Item", name, "item_group")
+    bounds = _subtree_bounds()
+    in_subtree = False
+    if item_group and bounds:
+        group_bounds = frappe.db.get_value("Item Group", item_group, ["lft", "rgt"])
+        in_subtree = bool(group_bounds) and group_bounds[0] >= bounds[0] and group_bounds[1] <= bounds[1]
+
+    if in_subtree != (name in item_codes):
+        invalidate()
+
+def main():
+    """Install the resolver table and hooks and expand the subtree"""
+    try:
+        print("🗂️  Installing medical waste item resolver...")
+        ensure_item_table()
+        install_resolver_hooks()
+        item_codes = rebuild()
+        frappe.db.commit()
+        print(f"✅ Medical waste item resolver installed ({len(item_codes)} items)")
+
+    except Exception as e:
+        print(f"❌ Error installing medical waste item resolver: {str(e)}")
+        frappe.db.rollback()
+        raise
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1087 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Provisioning Spec
+Versioned definition of the master data and customizations the setup scripts install
+"""
+
+# Bump when the shape of a section changes, not for edits to its records:
+# record edits are picked up by the per-section content hash
+SPEC_VERSION = 1
+
+def _custom_fields(dt, fields):
+    return [{"dt": dt, **field} for field in fields]
+
+# (item group, parent) in creation order; parents come before their children
+ITEM_GROUPS = [
+    # Main medical waste group
+    ("Medical Waste", "All Item Groups"),
+    
+    # Primary waste categories
+    ("Infectious Waste", "Medical Waste"),
+    ("Sharps Waste", "Medical Waste"),
+    ("Pharmaceutical Waste", "Medical Waste"),
+    ("Pathological Waste", "Medical Waste"),
+    ("Chemotherapy Waste", "Medical Waste"),
+    
+    # Infectious waste subcategories
+    ("Blood Products", "Infectious Waste"),
+    ("Cultures and Stocks", "Infectious Waste"),
+    ("Laboratory Waste", "Infectious Waste"),
+    ("Surgery Waste", "Infectious Waste"),
+    ("Isolation Waste", "Infectious Waste"),
+    
+    # Sharps waste subcategories
+    ("Needles and Syringes", "Sharps Waste"),
+    ("Scalpels and Blades", "Sharps Waste"),
+    ("Glass Waste", "Sharps Waste"),
+    ("Other Sharp Objects", "Sharps Waste"),
+    
+    # Pharmaceutical waste subcategories
+    ("Expired Medications", "Pharmaceutical Waste"),
+    ("Controlled Substances", "Pharmaceutical Waste"),
+    ("Vaccines and Biologicals", "Pharmaceutical Waste"),
+    ("IV Solutions", "Pharmaceutical Waste"),
+    
+    # Pathological waste subcategories
+    ("Human Tissues", "Pathological Waste"),
+    ("Organs and Body Parts", "Pathological Waste"),
+    ("Placental Material", "Pathological Waste"),
+    ("Anatomical Remains", "Pathological Waste"),
+    
+    # Chemotherapy waste subcategories
+    ("Chemo Drugs", "Chemotherapy Waste"),
+    ("Chemo Contaminated Items", "Chemotherapy Waste"),
+    ("Chemo PPE", "Chemotherapy Waste"),
+    
+    # Waste containers
+    ("Waste Containers", "Medical Waste"),
+    ("Red Bags", "Waste Containers"),
+    ("Sharps Containers", "Waste Containers"),
+    ("Yellow Bags", "Waste Containers"),
+    ("Black Bags", "Waste Containers"),
+    ("Rigid Containers", "Waste Containers")
+]
+
+ITEM_CUSTOM_FIELDS = _custom_fields("Item", [
+    {
+        "fieldname": "waste_classification",
+        "label": "Waste Classification",
+        "fieldtype": "Select",
+        "options": "\nInfectious\nSharps\nPharmaceutical\nPathological\nChemotherapy\nTrace Chemotherapy",
+        "reqd": 1
+    },
+    {
+        "fieldname": "hazard_level",
+        "label": "Hazard Level",
+        "fieldtype": "Select",
+        "options": "\nLow\nMedium\nHigh\nExtreme",
+        "reqd": 1
+    },
+    {
+        "fieldname": "treatment_method",
+        "label": "Required Treatment Method",
+        "fieldtype": "Select",
+        "options": "\nAutoclave\nIncineration\nChemical Treatment\nMicrowave\nIrradiation\nSecure Landfill",
+        "reqd": 1
+    },
+    {
+        "fieldname": "regulatory_code",
+        "label": "Regulatory Code",
+        "fieldtype": "Data",
+        "description": "EPA/DOT waste code"
+    },
+    {
+        "fieldname": "storage_requirements",
+        "label": "Storage Requirements",
+        "fieldtype": "Text",
+        "description": "Special storage conditions required"
+    },
+    {
+        "fieldname": "max_storage_days",
+        "label": "Maximum Storage Days",
+        "fieldtype": "Int",
+        "description": "Maximum days before disposal required"
+    },
+    {
+        "fieldname": "generates_manifest",
+        "label": "Generates Manifest",
+        "fieldtype": "Check",
+        "description": "Requires DOT hazardous waste manifest"
+    }
+])
+
+UOMS = [
+    {"uom_name": "Gallon", "must_be_whole_number": 1},
+    {"uom_name": "Pound", "must_be_whole_number": 0},
+    {"uom_name": "Kilogram", "must_be_whole_number": 0},
+    {"uom_name": "Cubic Foot", "must_be_whole_number": 0},
+    {"uom_name": "Liter", "must_be_whole_number": 0},
+    {"uom_name": "Container", "must_be_whole_number": 1},
+    {"uom_name": "Bag", "must_be_whole_number": 1},
+    {"uom_name": "Sharps Container", "must_be_whole_number": 1}
+]
+
+STOCK_CUSTOM_FIELDS = [
+    {
+        "dt": "Stock Ledger Entry",
+        "fieldname": "waste_batch_id",
+        "label": "Waste Batch ID", 
+        "fieldtype": "Data"
+    },
+    {
+        "dt": "Stock Ledger Entry",
+        "fieldname": "generation_department",
+        "label": "Generation Department",
+        "fieldtype": "Link",
+        "options": "Department"
+    },
+    {
+        "dt": "Stock Ledger Entry", 
+        "fieldname": "disposal_date",
+        "label": "Disposal Date",
+        "fieldtype": "Date"
+    },
+    {
+        "dt": "Stock Ledger Entry",
+        "fieldname": "manifest_number",
+        "label": "Manifest Number",
+        "fieldtype": "Data"
+    }
+]
+
+STOCK_CUSTOM_FIELDS += _custom_fields("Pick List", [
+    {
+        "fieldname": "collection_route",
+        "label": "Collection Route",
+        "fieldtype": "Data"
+    },
+    {
+        "fieldname": "collection_time",
+        "label": "Scheduled Collection Time",
+        "fieldtype": "Time"
+    },
+    {
+        "fieldname": "collector_name", 
+        "label": "Collector Name",
+        "fieldtype": "Data"
+    },
+    {
+        "fieldname": "special_handling",
+        "label": "Special Handling Instructions",
+        "fieldtype": "Text"
+    }
+])
+
+STOCK_CUSTOM_FIELDS += _custom_fields("Stock Reconciliation", [
+    {
+        "fieldname": "audit_type",
+        "label": "Audit Type",
+        "fieldtype": "Select", 
+        "options": "\nDaily Count\nWeekly Audit\nMonthly Reconciliation\nCompliance Audit"
+    },
+    {
+        "fieldname": "auditor_name",
+        "label": "Auditor Name",
+        "fieldtype": "Data"
+    },
+    {
+        "fieldname": "audit_findings",
+        "label": "Audit Findings", 
+        "fieldtype": "Text"
+    }
+])
+
+WORKSTATIONS = [
+    {
+        "workstation_name": "Autoclave Station 1",
+        "production_capacity": 50,
+        "hour_rate_labour": 25.0,
+        "hour_rate_electricity": 5.0
+    },
+    {
+        "workstation_name": "Autoclave Station 2", 
+        "production_capacity": 50,
+        "hour_rate_labour": 25.0,
+        "hour_rate_electricity": 5.0
+    },
+    {
+        "workstation_name": "Incineration Facility",
+        "production_capacity": 100,
+        "hour_rate_labour": 50.0,
+        "hour_rate_electricity": 15.0
+    },
+    {
+        "workstation_name": "Chemical Treatment Area",
+        "production_capacity": 75,
+        "hour_rate_labour": 35.0,
+        "hour_rate_electricity": 8.0
+    },
+    {
+        "workstation_name": "Microwave Treatment Unit",
+        "production_capacity": 30,
+        "hour_rate_labour": 20.0,
+        "hour_rate_electricity": 10.0
+    },
+    {
+        "workstation_name": "Sorting and Segregation",
+        "production_capacity": 200,
+        "hour_rate_labour": 15.0,
+        "hour_rate_electricity": 2.0
+    }
+]
+
+# Operations are named after the operation; each has a default workstation
+OPERATIONS = [
+    {
+        "name": "Waste Sorting",
+        "description": "Sort and segregate waste by type and classification",
+        "workstation": "Sorting and Segregation"
+    },
+    {
+        "name": "Autoclave Loading",
+        "description": "Load waste into autoclave chamber",
+        "workstation": "Autoclave Station 1"
+    },
+    {
+        "name": "Steam Sterilization",
+        "description": "High-pressure steam sterilization process",
+        "workstation": "Autoclave Station 1"
+    },
+    {
+        "name": "Autoclave Unloading",
+        "description": "Remove treated waste from autoclave",
+        "workstation": "Autoclave Station 1"
+    },
+    {
+        "name": "Incineration Prep",
+        "description": "Prepare waste for incineration process",
+        "workstation": "Incineration Facility"
+    },
+    {
+        "name": "High-Temp Incineration",
+        "description": "Incinerate waste at high temperature",
+        "workstation": "Incineration Facility"
+    },
+    {
+        "name": "Chemical Treatment",
+        "description": "Chemical disinfection and treatment",
+        "workstation": "Chemical Treatment Area"
+    },
+    {
+        "name": "Microwave Treatment",
+        "description": "Moist heat and steam microwave treatment",
+        "workstation": "Microwave Treatment Unit"
+    },
+    {
+        "name": "Final Inspection",
+        "description": "Quality check of treated waste",
+        "workstation": "Sorting and Segregation"
+    },
+    {
+        "name": "Documentation",
+        "description": "Complete treatment certificates and manifests",
+        "workstation": "Sorting and Segregation"
+    }
+]
+
+ROUTING_STEPS = [
+    {
+        "routing_name": "Infectious Waste - Autoclave Treatment",
+        "operations": [
+            {"operation": "Waste Sorting", "time_in_mins": 10},
+            {"operation": "Autoclave Loading", "time_in_mins": 15},
+            {"operation": "Steam Sterilization", "time_in_mins": 60},
+            {"operation": "Autoclave Unloading", "time_in_mins": 15},
+            {"operation": "Final Inspection", "time_in_mins": 5},
+            {"operation": "Documentation", "time_in_mins": 10}
+        ]
+    },
+    {
+        "routing_name": "Pharmaceutical Waste - Incineration",
+        "operations": [
+            {"operation": "Waste Sorting", "time_in_mins": 15},
+            {"operation": "Incineration Prep", "time_in_mins": 20},
+            {"operation": "High-Temp Incineration", "time_in_mins": 120},
+            {"operation": "Final Inspection", "time_in_mins": 10},
+            {"operation": "Documentation", "time_in_mins": 15}
+        ]
+    },
+    {
+        "routing_name": "Laboratory Waste - Chemical Treatment",
+        "operations": [
+            {"operation": "Waste Sorting", "time_in_mins": 20},
+            {"operation": "Chemical Treatment", "time_in_mins": 90},
+            {"operation": "Final Inspection", "time_in_mins": 10},
+            {"operation": "Documentation", "time_in_mins": 10}
+        ]
+    },
+    {
+        "routing_name": "Sharps Waste - Microwave Treatment",
+        "operations": [
+            {"operation": "Waste Sorting", "time_in_mins": 5},
+            {"operation": "Microwave Treatment", "time_in_mins": 45},
+            {"operation": "Final Inspection", "time_in_mins": 5},
+            {"operation": "Documentation", "time_in_mins": 10}
+        ]
+    }
+]
+
+MANUFACTURING_CUSTOM_FIELDS = _custom_fields("Quality Inspection", [
+    {
+        "fieldname": "treatment_effectiveness",
+        "label": "Treatment Effectiveness (%)",
+        "fieldtype": "Percent"
+    },
+    {
+        "fieldname": "sterilization_indicator",
+        "label": "Sterilization Indicator Result",
+        "fieldtype": "Select",
+        "options": "\nPass\nFail\nInconclusive"
+    },
+    {
+        "fieldname": "biological_indicator", 
+        "label": "Biological Indicator Result",
+        "fieldtype": "Select",
+        "options": "\nNegative\nPositive\nNot Tested"
+    },
+    {
+        "fieldname": "temperature_log",
+        "label": "Temperature Log Verified",
+        "fieldtype": "Check"
+    },
+    {
+        "fieldname": "pressure_log",
+        "label": "Pressure Log Verified", 
+        "fieldtype": "Check"
+    },
+    {
+        "fieldname": "treatment_duration",
+        "label": "Treatment Duration (minutes)",
+        "fieldtype": "Float"
+    }
+])
+
+MANUFACTURING_CUSTOM_FIELDS += _custom_fields("Work Order", [
+    {
+        "fieldname": "waste_batch_number",
+        "label": "Waste Batch Number",
+        "fieldtype": "Data"
+    },
+    {
+        "fieldname": "manifest_reference",
+        "label": "Manifest Reference",
+        "fieldtype": "Link",
+        "options": "Medical Waste Manifest"
+    },
+    {
+        "fieldname": "treatment_priority",
+        "label": "Treatment Priority",
+        "fieldtype": "Select",
+        "options": "\nLow\nNormal\nHigh\nUrgent"
+    },
+    {
+        "fieldname": "special_instructions",
+        "label": "Special Treatment Instructions",
+        "fieldtype": "Text"
+    },
+    {
+        "fieldname": "regulatory_requirements",
+        "label": "Regulatory Requirements",
+        "fieldtype": "Text"
+    }
+])
+
+SUPPLIER_GROUPS = [
+    "Medical Waste Disposal",
+    "Sharps Disposal", 
+    "Pharmaceutical Waste Disposal",
+    "Pathological Waste Disposal",
+    "Chemotherapy Waste Disposal",
+    "Hazmat Transportation",
+    "Treatment Facilities",
+    "Consulting Services"
+]
+
+SUPPLIER_CUSTOM_FIELDS = _custom_fields("Supplier", [
+    {
+        "fieldname": "license_section",
+        "label": "Licensing and Compliance",
+        "fieldtype": "Section Break"
+    },
+    {
+        "fieldname": "dot_license_number",
+        "label": "DOT License Number",
+        "fieldtype": "Data"
+    },
+    {
+        "fieldname": "dot_license_expiry",
+        "label": "DOT License Expiry",
+        "fieldtype": "Date"
+    },
+    {
+        "fieldname": "cb_license1",
+        "fieldtype": "Column Break"
+    },
+    {
+        "fieldname": "epa_permit_number",
+        "label": "EPA Permit Number", 
+        "fieldtype": "Data"
+    },
+    {
+        "fieldname": "epa_permit_expiry",
+        "label": "EPA Permit Expiry",
+        "fieldtype": "Date"
+    },
+    {
+        "fieldname": "certification_section",
+        "label": "Certifications",
+        "fieldtype": "Section Break"
+    },
+    {
+        "fieldname": "waste_types_handled",
+        "label": "Waste Types Handled",
+        "fieldtype": "Table",
+        "options": "Supplier Waste Type"
+    },
+    {
+        "fieldname": "service_section",
+        "label": "Service Information",
+        "fieldtype": "Section Break"
+    },
+    {
+        "fieldname": "pickup_frequency",
+        "label": "Pickup Frequency",
+        "fieldtype": "Select",
+        "options": "\nDaily\nWeekly\nBi-weekly\nMonthly\nOn-demand"
+    },
+    {
+        "fieldname": "service_area",
+        "label": "Service Area",
+        "fieldtype": "Text"
+    },
+    {
+        "fieldname": "cb_service1",
+        "fieldtype": "Column Break"
+    },
+    {
+        "fieldname": "emergency_contact",
+        "label": "Emergency Contact",
+        "fieldtype": "Data"
+    },
+    {
+        "fieldname": "emergency_phone",
+        "label": "Emergency Phone",
+        "fieldtype": "Data"
+    },
+    {
+        "fieldname": "compliance_section",
+        "label": "Compliance Monitoring",
+        "fieldtype": "Section Break"
+    },
+    {
+        "fieldname": "last_audit_date",
+        "label": "Last Audit Date",
+        "fieldtype": "Date"
+    },
+    {
+        "fieldname": "audit_score",
+        "label": "Latest Audit Score",
+        "fieldtype": "Percent"
+    },
+    {
+        "fieldname": "cb_compliance1",
+        "fieldtype": "Column Break"
+    },
+    {
+        "fieldname": "insurance_amount",
+        "label": "Insurance Coverage Amount",
+        "fieldtype": "Currency"
+    },
+    {
+        "fieldname": "insurance_expiry",
+        "label": "Insurance Expiry",
+        "fieldtype": "Date"
+    }
+])
+
+SUPPLIERS = [
+    {
+        "supplier_name": "BioWaste Solutions Inc.",
+        "supplier_group": "Medical Waste Disposal",
+        "supplier_type": "Company",
+        "dot_license_number": "US-DOT-12345",
+        "epa_permit_number": "EPA-MW-6789",
+        "pickup_frequency": "Weekly",
+        "emergency_contact": "John Smith",
+        "emergency_phone": "1-800-BIOWASTE"
+    },
+    {
+        "supplier_name": "SafeSharp Disposal LLC",
+        "supplier_group": "Sharps Disposal",
+        "supplier_type": "Company", 
+        "dot_license_number": "US-DOT-54321",
+        "epa_permit_number": "EPA-SH-9876",
+        "pickup_frequency": "Bi-weekly",
+        "emergency_contact": "Mary Johnson",
+        "emergency_phone": "1-800-SAFESHARP"
+    },
+    {
+        "supplier_name": "PharmaWaste Pro",
+        "supplier_group": "Pharmaceutical Waste Disposal",
+        "supplier_type": "Company",
+        "dot_license_number": "US-DOT-11111",
+        "epa_permit_number": "EPA-PH-2222",
+        "pickup_frequency": "Monthly",
+        "emergency_contact": "Dr. Robert Brown",
+        "emergency_phone": "1-800-PHARMAWASTE"
+    },
+    {
+        "supplier_name": "ChemoSafe Disposal",
+        "supplier_group": "Chemotherapy Waste Disposal", 
+        "supplier_type": "Company",
+        "dot_license_number": "US-DOT-33333",
+        "epa_permit_number": "EPA-CH-4444",
+        "pickup_frequency": "Weekly",
+        "emergency_contact": "Lisa Wilson",
+        "emergency_phone": "1-800-CHEMOSAFE"
+    }
+]
+
+BUYING_CUSTOM_FIELDS = _custom_fields("Purchase Order", [
+    {
+        "fieldname": "waste_disposal_section",
+        "label": "Waste Disposal Information",
+        "fieldtype": "Section Break"
+    },
+    {
+        "fieldname": "pickup_date",
+        "label": "Scheduled Pickup Date",
+        "fieldtype": "Date"
+    },
+    {
+        "fieldname": "pickup_time",
+        "label": "Pickup Time Window",
+        "fieldtype": "Data"
+    },
+    {
+        "fieldname": "cb_disposal1",
+        "fieldtype": "Column Break"
+    },
+    {
+        "fieldname": "pickup_location",
+        "label": "Pickup Location",
+        "fieldtype": "Data"
+    },
+    {
+        "fieldname": "special_instructions",
+        "label": "Special Handling Instructions",
+        "fieldtype": "Text"
+    },
+    {
+        "fieldname": "manifest_section", 
+        "label": "Manifest Information",
+        "fieldtype": "Section Break"
+    },
+    {
+        "fieldname": "requires_manifest",
+        "label": "Requires DOT Manifest",
+        "fieldtype": "Check"
+    },
+    {
+        "fieldname": "manifest_number",
+        "label": "Manifest Number",
+        "fieldtype": "Data"
+    },
+    {
+        "fieldname": "cb_manifest1",
+        "fieldtype": "Column Break"
+    },
+    {
+        "fieldname": "treatment_facility",
+        "label": "Treatment Facility",
+        "fieldtype": "Data"
+    },
+    {
+        "fieldname": "treatment_method",
+        "label": "Treatment Method",
+        "fieldtype": "Select",
+        "options": "\nAutoclave\nIncineration\nChemical Treatment\nMicrowave\nIrradiation"
+    }
+])
+
+BUYING_CUSTOM_FIELDS += _custom_fields("Supplier Quotation", [
+    {
+        "fieldname": "service_details_section",
+        "label": "Service Details",
+        "fieldtype": "Section Break"
+    },
+    {
+        "fieldname": "service_type",
+        "label": "Service Type",
+        "fieldtype": "Select",
+        "options": "\nRegular Pickup\nEmergency Pickup\nOne-time Removal\nConsulting\nTraining"
+    },
+    {
+        "fieldname": "coverage_area",
+        "label": "Coverage Area",
+        "fieldtype": "Data"
+    },
+    {
+        "fieldname": "cb_service1",
+        "fieldtype": "Column Break"
+    },
+    {
+        "fieldname": "response_time",
+        "label": "Response Time (Hours)",
+        "fieldtype": "Float"
+    },
+    {
+        "fieldname": "minimum_order",
+        "label": "Minimum Order Value",
+        "fieldtype": "Currency"
+    },
+    {
+        "fieldname": "pricing_section",
+        "label": "Pricing Structure",
+        "fieldtype": "Section Break"
+    },
+    {
+        "fieldname": "pricing_model",
+        "label": "Pricing Model",
+        "fieldtype": "Select",
+        "options": "\nPer Container\nPer Pound\nPer Pickup\nFlat Rate\nTiered Pricing"
+    },
+    {
+        "fieldname": "fuel_surcharge",
+        "label": "Fuel Surcharge (%)",
+        "fieldtype": "Percent"
+    },
+    {
+        "fieldname": "cb_pricing1",
+        "fieldtype": "Column Break"
+    },
+    {
+        "fieldname": "emergency_rate_multiplier",
+        "label": "Emergency Rate Multiplier",
+        "fieldtype": "Float",
+        "default": 1.5
+    },
+    {
+        "fieldname": "volume_discount",
+        "label": "Volume Discount Available",
+        "fieldtype": "Check"
+    }
+])
+
+BUYING_CUSTOM_FIELDS += _custom_fields("Purchase Receipt", [
+    {
+        "fieldname": "disposal_confirmation_section",
+        "label": "Disposal Confirmation",
+        "fieldtype": "Section Break"
+    },
+    {
+        "fieldname": "actual_pickup_date",
+        "label": "Actual Pickup Date",
+        "fieldtype": "Date"
+    },
+    {
+        "fieldname": "pickup_confirmed_by",
+        "label": "Pickup Confirmed By",
+        "fieldtype": "Data"
+    },
+    {
+        "fieldname": "cb_confirmation1",
+        "fieldtype": "Column Break"
+    },
+    {
+        "fieldname": "vehicle_id",
+        "label": "Collection Vehicle ID",
+        "fieldtype": "Data"
+    },
+    {
+        "fieldname": "driver_name",
+        "label": "Driver Name",
+        "fieldtype": "Data"
+    },
+    {
+        "fieldname": "treatment_section",
+        "label": "Treatment Confirmation",
+        "fieldtype": "Section Break"
+    },
+    {
+        "fieldname": "treatment_date",
+        "label": "Treatment Date",
+        "fieldtype": "Date"
+    },
+    {
+        "fieldname": "treatment_facility_name",
+        "label": "Treatment Facility Name",
+        "fieldtype": "Data"
+    },
+    {
+        "fieldname": "cb_treatment1",
+        "fieldtype": "Column Break"
+    },
+    {
+        "fieldname": "certificate_number",
+        "label": "Certificate of Destruction Number",
+        "fieldtype": "Data"
+    },
+    {
+        "fieldname": "certificate_received",
+        "label": "Certificate Received",
+        "fieldtype": "Check"
+    }
+])
+
+BUYING_CUSTOM_FIELDS += _custom_fields("Supplier Scorecard", [
+    {
+        "fieldname": "compliance_score",
+        "label": "Compliance Score (%)",
+        "fieldtype": "Percent"
+    },
+    {
+        "fieldname": "safety_record",
+        "label": "Safety Record Score (%)",
+        "fieldtype": "Percent"
+    },
+    {
+        "fieldname": "environmental_score",
+        "label": "Environmental Score (%)",
+        "fieldtype": "Percent"
+    },
+    {
+        "fieldname": "response_time_score",
+        "label": "Response Time Score (%)",
+        "fieldtype": "Percent"
+    }
+])
+
+# Appended to every report's JavaScript; keeps any onload the report defines
+EXPORT_BUTTON_JS = """
+(() => {
+    const settings = frappe.query_reports["__REPORT__"];
+    const onload = settings.onload;
+    settings.onload = function(report) {
+        onload && onload(report);
+        frappe.realtime.off("medwaste_export");
+        frappe.realtime.on("medwaste_export", (data) => {
+            if (data.status === "Completed") {
+                frappe.show_alert({
+                    message: __("{0} export ready: <a href='{1}'>download</a>", [__(data.report_name), data.file_url]),
+                    indicator: "green"
+                }, 15);
+            } else if (data.status === "Failed") {
+                frappe.show_alert({message: __("{0} export failed", [__(data.report_name)]), indicator: "red"});
+            }
+        });
+        report.page.add_inner_button(__("Background Export"), () => {
+            frappe.prompt(
+                {fieldname: "file_format", label: __("Format"), fieldtype: "Select", options: "CSV\\nParquet", default: "CSV"},
+                (values) => frappe.call({
+                    method: "compliance_export.start_export",
+                    args: {
+                        report_name: "__REPORT__",
+                        filters: report.get_filter_values(),
+                        file_format: values.file_format.toLowerCase()
+                    },
+                    callback() {
+                        frappe.show_alert(__("Export queued, you will be notified when the file is ready"));
+                    }
+                }),
+                __("Export {0}", [__("__REPORT__")])
+            );
+        });
+    };
+})();
+"""
+
+REPORTS = [
+    {
+        "report_name": "Medical Waste Generation Report",
+        "report_type": "Script Report",
+        "module": "Stock",
+        "ref_doctype": "Stock Ledger Entry",
+        "script": """
+def execute(filters=None):
+    columns = [
+        {"fieldname": "date", "label": "Date", "fieldtype": "Date", "width": 100},
+        {"fieldname": "item_code", "label": "Item Code", "fieldtype": "Link", "options": "Item", "width": 120},
+        {"fieldname": "item_name", "label": "Item Name", "fieldtype": "Data", "width": 200},
+        {"fieldname": "waste_classification", "label": "Waste Type", "fieldtype": "Data", "width": 120},
+        {"fieldname": "qty", "label": "Quantity", "fieldtype": "Float", "width": 100},
+        {"fieldname": "uom", "label": "UOM", "fieldtype": "Data", "width": 80},
+        {"fieldname": "warehouse", "label": "Location", "fieldtype": "Link", "options": "Warehouse", "width": 150},
+        {"fieldname": "department", "label": "Department", "fieldtype": "Data", "width": 120}
+    ]
+    
+    data = frappe.call("report_queries.get_waste_generation_data", filters=filters)
+    chart = frappe.call("report_queries.get_waste_generation_chart", filters=filters)
+    
+    return columns, data, None, chart
+            """,
+        "javascript": """
+frappe.query_reports["Medical Waste Generation Report"] = {
+    filters: [
+        {fieldname: "from_date", label: __("From Date"), fieldtype: "Date"},
+        {fieldname: "to_date", label: __("To Date"), fieldtype: "Date"},
+        {fieldname: "chart_by", label: __("Chart By"), fieldtype: "Select", options: "Date\nWaste Type", default: "Date"}
+    ]
+};
+            """
+    },
+    {
+        "report_name": "Waste Disposal Tracking Report",
+        "report_type": "Script Report", 
+        "module": "Stock",
+        "ref_doctype": "Medical Waste Manifest",
+        "script": """
+def execute(filters=None):
+    columns = [
+        {"fieldname": "manifest_number", "label": "Manifest #", "fieldtype": "Link", "options": "Medical Waste Manifest", "width": 120},
+        {"fieldname": "manifest_date", "label": "Date", "fieldtype": "Date", "width": 100},
+        {"fieldname": "supplier", "label": "Disposal Company", "fieldtype": "Data", "width": 150},
+        {"fieldname": "waste_type", "label": "Waste Type", "fieldtype": "Data", "width": 120},
+        {"fieldname": "quantity", "label": "Quantity", "fieldtype": "Float", "width": 100},
+        {"fieldname": "weight", "label": "Weight (lbs)", "fieldtype": "Float", "width": 100},
+        {"fieldname": "treatment_method", "label": "Treatment", "fieldtype": "Data", "width": 120},
+        {"fieldname": "status", "label": "Status", "fieldtype": "Data", "width": 100}
+    ]
+    
+    data = frappe.call("report_queries.get_waste_disposal_data", filters=filters)
+    
+    return columns, data
+            """,
+        "javascript": """
+frappe.query_reports["Waste Disposal Tracking Report"] = {
+    filters: [
+        {fieldname: "from_date", label: __("From Date"), fieldtype: "Date"},
+        {fieldname: "to_date", label: __("To Date"), fieldtype: "Date"},
+        {fieldname: "paginate", label: __("Load in Pages"), fieldtype: "Check", default: 1}
+    ],
+    onload(report) {
+        report.page.add_inner_button(__("Load More"), () => {
+            const rows = report.data || [];
+            if (!report.get_filter_value("paginate") || !rows.length) return;
+            const last = rows[rows.length - 1];
+            frappe.call({
+                method: "report_queries.get_waste_disposal_page",
+                args: {
+                    filters: report.get_filter_values(),
+                    after: {manifest_date: last.manifest_date, manifest: last.manifest, line: last.line}
+                },
+                callback(r) {
+                    if (!r.message.rows.length) {
+                        frappe.show_alert(__("All rows loaded"));
+                        return;
+                    }
+                    report.data.push(...r.message.rows);
+                    report.datatable.appendRows(r.message.rows);
+                }
+            });
+        });
+    }
+};
+            """
+    },
+    {
+        "report_name": "Training Compliance Report",
+        "report_type": "Script Report",
+        "module": "HR",
+        "ref_doctype": "Training Record",
+        "script": """
+def execute(filters=None):
+    columns = [
+        {"fieldname": "employee", "label": "Employee", "fieldtype": "Link", "options": "Employee", "width": 120},
+        {"fieldname": "employee_name", "label": "Name", "fieldtype": "Data", "width": 150},
+        {"fieldname": "department", "label": "Department", "fieldtype": "Data", "width": 120},
+        {"fieldname": "training_type", "label": "Training Type", "fieldtype": "Data", "width": 150},
+        {"fieldname": "training_date", "label": "Training Date", "fieldtype": "Date", "width": 100},
+        {"fieldname": "expiration_date", "label": "Expires", "fieldtype": "Date", "width": 100},
+        {"fieldname": "status", "label": "Status", "fieldtype": "Data", "width": 100},
+        {"fieldname": "days_until_expiry", "label": "Days to Expiry", "fieldtype": "Int", "width": 120}
+    ]
+    
+    if filters.get("summary"):
+        columns = [
+            {"fieldname": "department", "label": "Department", "fieldtype": "Link", "options": "Department", "width": 150},
+            {"fieldname": "training_type", "label": "Training Type", "fieldtype": "Data", "width": 180},
+            {"fieldname": "expiry_bucket", "label": "Expiry", "fieldtype": "Data", "width": 120},
+            {"fieldname": "record_count", "label": "Records", "fieldtype": "Int", "width": 100}
+        ]
+    
+    data = frappe.call("report_queries.get_training_compliance_data", filters=filters)
+    
+    return columns, data
+            """,
+        "javascript": """
+frappe.query_reports["Training Compliance Report"] = {
+    filters: [
+        {fieldname: "summary", label: __("Summary"), fieldtype: "Check", default: 1},
+        {fieldname: "department", label: __("Department"), fieldtype: "Link", options: "Department"},
+        {fieldname: "training_type", label: __("Training Type"), fieldtype: "Data"},
+        {fieldname: "expiry_bucket", label: __("Expiry"), fieldtype: "Select", options: "\\nExpired\\n< 30 Days\\n< 90 Days\\nOK"}
+    ],
+    onload(report) {
+        // Drill from a summary row into its records
+        report.page.add_inner_button(__("Show Records"), () => {
+            const row = report.datatable && report.datatable.rowmanager.getCheckedRows().length
+                ? report.data[report.datatable.rowmanager.getCheckedRows()[0]]
+                : null;
+            if (row && row.expiry_bucket) {
+                report.set_filter_value({
+                    summary: 0,
+                    department: row.department,
+                    training_type: row.training_type,
+                    expiry_bucket: row.expiry_bucket
+                });
+            } else {
+                report.set_filter_value("summary", 0);
+            }
+        });
+    },
+    get_datatable_options(options) {
+        return Object.assign(options, {checkboxColumn: true});
+    }
+};
+            """
+    },
+    {
+        "report_name": "Incident Summary Report", 
+        "report_type": "Script Report",
+        "module": "Stock",
+        "ref_doctype": "Incident Report",
+        "script": """
+def execute(filters=None):
+    columns = [
+        {"fieldname": "incident_date", "label": "Date", "fieldtype": "Datetime", "width": 150},
+        {"fieldname": "incident_type", "label": "Type", "fieldtype": "Data", "width": 120},
+        {"fieldname": "severity", "label": "Severity", "fieldtype": "Data", "width": 100},
+        {"fieldname": "location", "label": "Location", "fieldtype": "Data", "width": 150},
+        {"fieldname": "department", "label": "Department", "fieldtype": "Data", "width": 120},
+        {"fieldname": "reported_by", "label": "Reported By", "fieldtype": "Data", "width": 120},
+        {"fieldname": "status", "label": "Status", "fieldtype": "Data", "width": 100}
+    ]
+    
+    data = frappe.call("report_queries.get_incident_summary_data", filters=filters)
+    
+    return columns, data
+            """,
+        "javascript": """
+frappe.query_reports["Incident Summary Report"] = {
+    filters: [
+        {fieldname: "from_date", label: __("From Date"), fieldtype: "Date"},
+        {fieldname: "to_date", label: __("To Date"), fieldtype: "Date"},
+        {fieldname: "severity", label: __("Severity"), fieldtype: "Select", options: "\\nLow\\nMedium\\nHigh\\nCritical"},
+        {fieldname: "department", label: __("Department"), fieldtype: "Link", options: "Department"}
+    ]
+};
+            """
+    }
+]
+
+def _routing(routing):
+    """Routing record with each step's workstation taken from its operation"""
+
+    workstations = {op["name"]: op["workstation"] for op in OPERATIONS}
+    return {
+        "routing_name": routing["routing_name"],
+        "operations": [
+            {**step, "workstation": workstations[step["operation"]]}
+            for step in routing["operations"]
+        ]
+    }
+
+def _report(report):
+    """Report record as stored: the script reads `filters` and sets `data`"""
+
+    return {
+        "report_name": report["report_name"],
+        "report_type": report["report_type"],
+        "ref_doctype": report["ref_doctype"],
+        "module": report["module"],
+        "is_standard": "No",
+        # Non-standard Script Reports run report_script with `filters` in
+        # scope and read the result back from `data`
+        "report_script": report["script"] + "\ndata = execute(filters)\n",
+        "javascript": report.get("javascript", "") + EXPORT_BUTTON_JS.replace(
+            "__REPORT__", report["report_name"]
+        )
+    }
+
+# Applied in this order. `key` identifies a record on the site (a tuple
+# when one field is not unique); `raw` sections are flat masters written
+# without document hooks; `tree` sections are nested sets, loaded whole and
+# numbered once.
+SECTIONS = {
+    "item_groups": {
+        "doctype": "Item Group",
+        "key": "item_group_name",
+        "records": [
+            {"item_group_name": name, "parent_item_group": parent_group, "is_group": 1}
+            for name, parent_group in ITEM_GROUPS
+        ],
+        "tree": True
+    },
+    "item_custom_fields": {
+        "doctype": "Custom Field",
+        "key": ("dt", "fieldname"),
+        "records": ITEM_CUSTOM_FIELDS
+    },
+    "uoms": {
+        "doctype": "UOM",
+        "key": "uom_name",
+        "records": UOMS,
+        "raw": True
+    },
+    "stock_custom_fields": {
+        "doctype": "Custom Field",
+        "key": ("dt", "fieldname"),
+        "records": STOCK_CUSTOM_FIELDS
+    },
+    "workstations": {
+        "doctype": "Workstation",
+        "key": "workstation_name",
+        "records": WORKSTATIONS
+    },
+    "operations": {
+        "doctype": "Operation",
+        "key": "name",
+        "records": OPERATIONS
+    },
+    "routings": {
+        "doctype": "Routing",
+        "key": "routing_name",
+        "records": [_routing(routing) for routing in ROUTING_STEPS]
+    },
+    "manufacturing_custom_fields": {
+        "doctype": "Custom Field",
+        "key": ("dt", "fieldname"),
+        "records": MANUFACTURING_CUSTOM_FIELDS
+    },
+    "supplier_groups": {
+        "doctype": "Supplier Group",
+        "key": "supplier_group_name",
+        "records": [{"supplier_group_name": group_name} for group_name in SUPPLIER_GROUPS]
+    },
+    "supplier_custom_fields": {
+        "doctype": "Custom Field",
+        "key": ("dt", "fieldname"),
+        "records": SUPPLIER_CUSTOM_FIELDS
+    },
+    "suppliers": {
+        "doctype": "Supplier",
+        "key": "supplier_name",
+        "records": SUPPLIERS
+    },
+    "buying_custom_fields": {
+        "doctype": "Custom Field",
+        "key": ("dt", "fieldname"),
+        "records": BUYING_CUSTOM_FIELDS
+    },
+    "reports": {
+        "doctype": "Report",
+        "key": "report_name",
+        "records": [_report(report) for report in REPORTS]
+    }
+}
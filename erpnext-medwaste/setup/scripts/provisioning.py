@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Provisioning
+Plans and applies the provisioning spec against the site, one section at a time
+"""
+
+import hashlib
+import json
+
+import frappe
+from frappe.utils import cstr, flt, now_datetime
+
+import medwaste_spec
+from bulk_apply import bulk_apply, key_of
+from custom_field_installer import install_custom_fields
+from tree_loader import load_tree
+
+STATE_TABLE = "__medwaste_spec_state"
+
+def ensure_state_table():
+    """Create the table recording the hash of each applied section"""
+
+    frappe.db.sql_ddl(f"""
+        CREATE TABLE IF NOT EXISTS `{STATE_TABLE}` (
+            `section` VARCHAR(140) NOT NULL,
+            `spec_version` INT NOT NULL,
+            `content_hash` CHAR(40) NOT NULL,
+            `applied_at` DATETIME(6) NOT NULL,
+            PRIMARY KEY (`section`)
+        ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC CHARACTER SET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+def section_hash(name):
+    """Content hash of a spec section, including the spec version"""
+
+    section = medwaste_spec.SECTIONS[name]
+    payload = json.dumps(
+        [medwaste_spec.SPEC_VERSION, section["doctype"], section["key"], section["records"]],
+        sort_keys=True, default=str
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+def _applied_hashes():
+    ensure_state_table()
+    return dict(frappe.db.sql(f"SELECT section, content_hash FROM `{STATE_TABLE}`"))
+
+def _record_applied(name, content_hash):
+    frappe.db.sql(f"""
+        INSERT INTO `{STATE_TABLE}` (section, spec_version, content_hash, applied_at)
+        VALUES (%(section)s, %(version)s, %(hash)s, %(now)s)
+        ON DUPLICATE KEY UPDATE
+            spec_version = VALUES(spec_version),
+            content_hash = VALUES(content_hash),
+            applied_at = VALUES(applied_at)
+    """, {"section": name, "version": medwaste_spec.SPEC_VERSION, "hash": content_hash, "now": now_datetime()})
+
+def _section_names(sections=None):
+    """Spec sections to work on, in spec order; accepts a name, a comma list or a list"""
+
+    if not sections:
+        return list(medwaste_spec.SECTIONS)
+    if isinstance(sections, str):
+        sections = [section.strip() for section in sections.split(",")]
+
+    unknown = set(sections) - set(medwaste_spec.SECTIONS)
+    if unknown:
+        frappe.throw(f"Unknown spec sections: {', '.join(sorted(unknown))}")
+    return [name for name in medwaste_spec.SECTIONS if name in sections]
+
+def same_value(spec_value, live_value):
+    """Compare loosely: the site returns numbers as floats and NULL for empty text"""
+
+    if isinstance(spec_value, (int, float)):
+        return flt(spec_value) == flt(live_value)
+    return cstr(spec_value) == cstr(live_value)
+
+def _live_records(doctype, records, key):
+    """Site values of the spec's fields for the records that exist, by key"""
+
+    key_fields = list(key) if isinstance(key, (list, tuple)) else [key]
+    fields = {field for record in records for field, value in record.items() if not isinstance(value, list)}
+    fields = ["name", *sorted((fields | set(key_fields)) - {"name"})]
+
+    rows = frappe.get_all(
+        doctype,
+        filters={key_fields[0]: ["in", list({record.get(key_fields[0]) for record in records})]},
+        fields=fields
+    )
+    return {key_of(row, key): row for row in rows}
+
+def _changes(doctype, record, live):
+    """Fields of `record` that differ on the site; child tables compare row by row"""
+
+    changes = {
+        field: value for field, value in record.items()
+        if not isinstance(value, list) and not same_value(value, live.get(field))
+    }
+
+    tables = [field for field, value in record.items() if isinstance(value, list)]
+    if tables:
+        doc = frappe.get_doc(doctype, live.name)
+        for field in tables:
+            rows = doc.get(field)
+            if len(rows) != len(record[field]) or any(
+                not same_value(value, row.get(column))
+                for spec_row, row in zip(record[field], rows)
+                for column, value in spec_row.items()
+            ):
+                changes[field] = record[field]
+
+    return changes
+
+def _plan_section(name, content_hash):
+    section = medwaste_spec.SECTIONS[name]
+    live = _live_records(section["doctype"], section["records"], section["key"])
+
+    step = frappe._dict(section=name, hash=content_hash, status="changed", create=[], update=[], in_sync=0)
+    for record in section["records"]:
+        current = live.get(key_of(record, section["key"]))
+        if not current:
+            step.create.append(record)
+            continue
+        changes = _changes(section["doctype"], record, current)
+        if changes:
+            step.update.append(frappe._dict(name=current.name, record=record, changes=changes))
+        else:
+            step.in_sync += 1
+
+    return step
+
+def plan(sections=None, force=False):
+    """Diff the spec against the site and print what apply would change
+
+        bench --site frontend execute provisioning.plan
+        bench --site frontend execute provisioning.plan --kwargs "{'sections': 'uoms,reports', 'force': True}"
+
+    Sections whose content hash matches the last apply are skipped without
+    reading the site; `force=True` diffs them anyway, which also catches
+    edits made on the site by hand.
+    """
+
+    applied = _applied_hashes()
+    steps = []
+    for name in _section_names(sections):
+        content_hash = section_hash(name)
+        if not force and applied.get(name) == content_hash:
+            steps.append(frappe._dict(section=name, hash=content_hash, status="unchanged"))
+            print(f"⏭️  {name}: unchanged since last apply")
+            continue
+
+        step = _plan_section(name, content_hash)
+        if not step.create and not step.update:
+            step.status = "in sync"
+        steps.append(step)
+
+        print(f"📋 {name}: {len(step.create)} to create, {len(step.update)} to update, {step.in_sync} in sync")
+        for update in step.update:
+            print(f"   🔄 {update.name}: {', '.join(sorted(update.changes))}")
+
+    return steps
+
+def _apply_records(section, step):
+    if step.create and section.get("tree"):
+        load_tree(section["doctype"], step.create, key=section["key"])
+    elif step.create:
+        bulk_apply(section["doctype"], step.create, key=section["key"], raw=section.get("raw", False))
+
+    for update in step.update:
+        doc = frappe.get_doc(section["doctype"], update.name)
+        doc.update(update.changes)
+        doc.save()
+        print(f"🔄 Updated {section['doctype']}: {update.name}")
+
+def apply(sections=None, force=False):
+    """Create and update whatever the plan found different, section by section
+
+        bench --site frontend execute provisioning.apply
+
+    Each section is committed with its hash once applied, so a failure
+    leaves the sections before it recorded. Records removed from the spec
+    are left on the site.
+    """
+
+    for step in plan(sections, force):
+        if step.status == "unchanged":
+            continue
+
+        section = medwaste_spec.SECTIONS[step.section]
+        if step.status == "changed" and section["doctype"] == "Custom Field":
+            # Saved together so each DocType's table is altered once
+            install_custom_fields(step.create + [
+                {"dt": update.record["dt"], "fieldname": update.record["fieldname"], **update.changes}
+                for update in step.update
+            ])
+        elif step.status == "changed":
+            _apply_records(section, step)
+
+        _record_applied(step.section, step.hash)
+        frappe.db.commit()
+
+def main():
+    """Apply the whole spec"""
+    try:
+        print(f"📐 Applying provisioning spec v{medwaste_spec.SPEC_VERSION}...")
+        apply()
+        print("\n✅ Provisioning spec applied!")
+
+    except Exception as e:
+        print(f"❌ Error applying provisioning spec: {str(e)}")
+        frappe.db.rollback()
+        raise
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Query Log
+Opt-in statement timing and EXPLAIN capture for report and setup script SQL
+"""
+
+import hashlib
+import json
+import re
+import time
+from contextlib import contextmanager
+
+import frappe
+from frappe.utils import add_days, cint, flt, now_datetime
+
+from sql_tracking import track_sql
+
+LOG_DOCTYPE = "Waste Query Log"
+
+# Statements at or above this duration get their plan captured
+DEFAULT_SLOW_MS = 200
+
+# Only reads are measured for rows examined and explained: measuring needs
+# extra statements on the same cursor, which would clobber rowcount for writes
+READ_STATEMENT = re.compile(r"^\s*\(?\s*(select|with)\b", re.IGNORECASE)
+
+def is_enabled():
+    """Tracing is off unless `medwaste_query_log` is set in site config"""
+    return bool(frappe.conf.get("medwaste_query_log"))
+
+def _slow_ms():
+    return flt(frappe.conf.get("medwaste_query_log_slow_ms") or DEFAULT_SLOW_MS)
+
+def fingerprint(statement):
+    """Hash of the statement with literals stripped, to group repeats"""
+
+    normalized = re.sub(r"'(?:[^'\\]|\\.)*'", "?", statement)
+    normalized = re.sub(r"\b\d+(?:\.\d+)?\b", "?", normalized)
+    normalized = re.sub(r"\(\s*\?(?:\s*,\s*\?)*\s*\)", "(?)", normalized)
+    normalized = " ".join(normalized.split()).lower()
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+def _statement(args, kwargs):
+    """The SQL as sent, with parameters interpolated"""
+
+    query = str(args[0] if args else kwargs.get("query"))
+    values = args[1] if len(args) > 1 else kwargs.get("values")
+    if not values:
+        return query
+    try:
+        return frappe.db.mogrify(query, values)
+    except Exception:
+        return query
+
+def _handler_reads(run_query):
+    """Rows the session has read through the storage engine so far"""
+    return sum(cint(value) for _name, value in run_query("SHOW SESSION STATUS LIKE 'Handler_read%'"))
+
+@contextmanager
+def trace_queries(source, filters=None):
+    """Log every statement run inside the block under `source`
+
+        with trace_queries("Incident Summary Report", filters):
+            data = compute()
+
+    Does nothing unless tracing is enabled. Entries are written by a
+    background job after the block, so the traced request's transaction
+    and timings are left alone. Nested blocks log under the outer source.
+    """
+
+    if not is_enabled() or frappe.flags.medwaste_query_trace:
+        yield
+        return
+
+    entries = []
+    run_query = frappe.db.sql
+
+    # What SHOW STATUS itself reads, so it can be taken off each measurement
+    first = _handler_reads(run_query)
+    overhead = _handler_reads(run_query) - first
+
+    def on_query(run_query, args, kwargs):
+        statement = _statement(args, kwargs)
+
+        # Streamed results are read after the call returns, so only the
+        # statement and its (dispatch) time can be recorded
+        measure_reads = READ_STATEMENT.match(statement) and not kwargs.get("as_iterator")
+        before = _handler_reads(run_query) if measure_reads else None
+
+        start = time.perf_counter()
+        result = run_query(*args, **kwargs)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        entries.append({
+            "statement": statement,
+            "duration_ms": round(duration_ms, 3),
+            "rows_examined": max(_handler_reads(run_query) - before - overhead, 0) if measure_reads else None,
+            "rows_returned": len(result) if isinstance(result, (list, tuple)) else None
+        })
+        return result
+
+    frappe.flags.medwaste_query_trace = True
+    try:
+        with track_sql(on_query):
+            yield
+    finally:
+        frappe.flags.medwaste_query_trace = False
+        if entries:
+            # The long-queue worker is the one with the medwaste modules installed
+            frappe.enqueue(
+                "query_log.write_entries",
+                queue="long",
+                source=source,
+                filters=json.dumps(filters or {}, sort_keys=True, default=str),
+                trace_id=frappe.generate_hash(length=12),
+                entries=entries
+            )
+
+def _explain(statement):
+    try:
+        return json.dumps(frappe.db.sql(f"EXPLAIN {statement}", as_dict=1), indent=1, default=str)
+    except Exception as e:
+        return f"EXPLAIN failed: {e}"
+
+def write_entries(source, filters, trace_id, entries):
+    """Store one traced run, capturing plans for the slow statements"""
+
+    slow_ms = _slow_ms()
+    now = now_datetime()
+    user = frappe.session.user
+
+    rows = []
+    for entry in entries:
+        is_slow = entry["duration_ms"] >= slow_ms
+        explain = _explain(entry["statement"]) if is_slow and READ_STATEMENT.match(entry["statement"]) else None
+        rows.append((
+            frappe.generate_hash(length=16), source, filters, trace_id,
+            fingerprint(entry["statement"]), entry["statement"], entry["duration_ms"],
+            entry["rows_examined"], entry["rows_returned"], cint(is_slow), explain,
+            now, now, user, user
+        ))
+
+    frappe.db.bulk_insert(
+        LOG_DOCTYPE,
+        ["name", "source", "filters", "trace_id", "query_fingerprint", "query", "duration_ms",
+         "rows_examined", "rows_returned", "is_slow", "explain", "creation", "modified",
+         "owner", "modified_by"],
+        rows
+    )
+    frappe.db.commit()
+
+def run_traced(method, **kwargs):
+    """Run a setup script (or any method) with tracing on for this run only
+
+        bench --site frontend execute query_log.run_traced --kwargs "{'method': 'create-compliance-reports.main'}"
+    """
+
+    frappe.local.conf.medwaste_query_log = 1
+    with trace_queries(method, kwargs):
+        return frappe.get_attr(method)(**kwargs)
+
+def print_slowest(source=None, days=7, limit=20):
+    """Statements with the most total time, grouped by fingerprint
+
+        bench --site frontend execute query_log.print_slowest --kwargs "{'source': 'Incident Summary Report'}"
+    """
+
+    rows = frappe.db.sql(f"""
+        SELECT
+            source,
+            query_fingerprint,
+            COUNT(*) as executions,
+            SUM(duration_ms) as total_ms,
+            MAX(duration_ms) as max_ms,
+            MAX(rows_examined) as max_rows_examined,
+            MAX(CASE WHEN is_slow = 1 THEN name END) as example
+        FROM `tab{LOG_DOCTYPE}`
+        WHERE creation >= %(since)s
+        AND (%(source)s IS NULL OR source = %(source)s)
+        GROUP BY source, query_fingerprint
+        ORDER BY total_ms DESC
+        LIMIT %(limit)s
+    """, {"since": add_days(now_datetime(), -int(days)), "source": source, "limit": int(limit)}, as_dict=1)
+
+    print(f"{'Source':<34}{'Fingerprint':<18}{'Runs':>6}{'Total ms':>12}{'Max ms':>10}{'Max rows':>12}  Slow example")
+    for row in rows:
+        print(f"{row.source[:33]:<34}{row.query_fingerprint:<18}{row.executions:>6}{row.total_ms:>12.1f}"
+              f"{row.max_ms:>10.1f}{row.max_rows_examined or 0:>12}  {row.example or '-'}")
+
+def purge(days=30):
+    """Delete log entries older than `days`"""
+
+    frappe.db.sql(
+        f"DELETE FROM `tab{LOG_DOCTYPE}` WHERE creation < %s", add_days(now_datetime(), -int(days))
+    )
+    frappe.db.commit()
+    print(f"🧹 Query log entries older than {days} days removed")
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Compliance Report Cache
+Redis-backed result cache for the compliance Script Reports
+"""
+
+import hashlib
+import json
+import time
+
+import frappe
+
+import query_log
+from doc_event_hooks import ensure_doc_event_hook
+
+# Source DocTypes whose changes change each report's result. The generation
+# report names its items and keeps those under the Medical Waste item group.
+REPORT_SOURCES = {
+    "Medical Waste Generation Report": ["Stock Entry", "Item", "Item Group"],
+    "Waste Disposal Tracking Report": ["Medical Waste Manifest"],
+    "Training Compliance Report": ["Training Record"],
+    "Incident Summary Report": ["Incident Report"]
+}
+
+# Training Record, Item and Item Group are not submittable, so saves and
+# deletes invalidate instead; the disposal and incident reports also list
+# Drafts, and manifests change status after submit
+SOURCE_EVENTS = {
+    "Stock Entry": ["After Submit", "After Cancel"],
+    "Medical Waste Manifest": [
+        "After Save", "After Submit", "After Save (Submitted Document)", "After Cancel", "After Delete"
+    ],
+    "Incident Report": ["After Save", "After Submit", "After Cancel", "After Delete"],
+    "Training Record": ["After Save", "After Delete"],
+    "Item": ["After Save", "After Delete"],
+    "Item Group": ["After Save", "After Delete"]
+}
+
+DEFAULT_TTL = 15 * 60
+DEFAULT_MAX_ENTRIES = 50
+
+KEY_PREFIX = "medwaste:report_cache"
+STATS_KEY = "medwaste:report_cache_stats"
+
+def _ttl():
+    return int(frappe.conf.get("medwaste_report_cache_ttl") or DEFAULT_TTL)
+
+def _max_entries():
+    return int(frappe.conf.get("medwaste_report_cache_max_entries") or DEFAULT_MAX_ENTRIES)
+
+def _index_key(report_name):
+    """Sorted set of a report's cached filter hashes scored by last access"""
+    return frappe.cache.make_key(f"{KEY_PREFIX}_index:{report_name}")
+
+def _entry_key(report_name, filters_hash):
+    return f"{KEY_PREFIX}:{report_name}:{filters_hash}"
+
+def normalize_filters(filters):
+    """Canonical form of report filters: empty values dropped, keys sorted"""
+
+    normalized = {}
+    for key, value in (filters or {}).items():
+        if value in (None, "", [], {}):
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        normalized[key] = value
+    return json.dumps(normalized, sort_keys=True, default=str)
+
+def _filters_hash(filters):
+    return hashlib.sha1(normalize_filters(filters).encode()).hexdigest()
+
+def _counter_key(report_name, outcome):
+    return frappe.cache.make_key(f"{STATS_KEY}:{report_name}:{outcome}")
+
+def _count(report_name, outcome):
+    frappe.cache.incr(_counter_key(report_name, outcome))
+
+def _read_counter(report_name, outcome):
+    return int(frappe.cache.get(_counter_key(report_name, outcome)) or 0)
+
+def _traced(report_name, filters, compute):
+    with query_log.trace_queries(report_name, filters):
+        return compute()
+
+def get_or_compute(report_name, filters, compute):
+    """Return the cached result for these filters, computing it on a miss"""
+
+    if frappe.conf.get("medwaste_report_cache_disabled"):
+        return _traced(report_name, filters, compute)
+
+    filters_hash = _filters_hash(filters)
+    entry_key = _entry_key(report_name, filters_hash)
+    index_key = _index_key(report_name)
+
+    result = frappe.cache.get_value(entry_key)
+    if result is not None:
+        _count(report_name, "hits")
+        frappe.cache.zadd(index_key, {filters_hash: time.time()})
+        return result
+
+    _count(report_name, "misses")
+    result = _traced(report_name, filters, compute)
+    frappe.cache.set_value(entry_key, result, expires_in_sec=_ttl())
+    frappe.cache.zadd(index_key, {filters_hash: time.time()})
+    frappe.cache.expire(index_key, _ttl())
+
+    # Evict least recently used filter sets beyond the size bound
+    overflow = frappe.cache.zcard(index_key) - _max_entries()
+    if overflow > 0:
+        for evicted, _score in frappe.cache.zpopmin(index_key, overflow):
+            frappe.cache.delete_value(_entry_key(report_name, frappe.safe_decode(evicted)))
+
+    return result
+
+def invalidate_report(report_name):
+    """Drop every cached result of one report"""
+
+    index_key = _index_key(report_name)
+    for filters_hash in frappe.cache.zrange(index_key, 0, -1):
+        frappe.cache.delete_value(_entry_key(report_name, frappe.safe_decode(filters_hash)))
+    frappe.cache.delete(index_key)
+
+@frappe.whitelist()
+def on_source_change(doctype, name):
+    """Invalidate the reports that read from `doctype`
+
+    Runs again after commit so a report computed from pre-commit data in
+    the meantime cannot stay cached.
+    """
+
+    for report_name, sources in REPORT_SOURCES.items():
+        if doctype in sources:
+            invalidate_report(report_name)
+            frappe.db.after_commit.add(lambda report_name=report_name: invalidate_report(report_name))
+
+def install_cache_hooks():
+    """Invalidate cached results on the source DocTypes' events"""
+
+    for doctype, events in SOURCE_EVENTS.items():
+        for event in events:
+            ensure_doc_event_hook(
+                f"Report Cache {doctype} {event}", doctype, event,
+                "report_cache.on_source_change"
+            )
+
+@frappe.whitelist()
+def get_stats():
+    """Hit/miss counters and hit rate per report"""
+
+    frappe.only_for("System Manager")
+
+    stats = {}
+    for report_name in REPORT_SOURCES:
+        hits = _read_counter(report_name, "hits")
+        misses = _read_counter(report_name, "misses")
+        stats[report_name] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+            "cached_filter_sets": frappe.cache.zcard(_index_key(report_name))
+        }
+    return stats
+
+def print_stats():
+    """bench --site frontend execute report_cache.print_stats"""
+
+    for report_name, row in get_stats().items():
+        hit_rate = f"{row['hit_rate']:.1%}" if row["hit_rate"] is not None else "-"
+        print(f"📊 {report_name}: {row['hits']} hits, {row['misses']} misses, "
+              f"hit rate {hit_rate}, {row['cached_filter_sets']} cached")
+
+def reset_stats():
+    for report_name in REPORT_SOURCES:
+        frappe.cache.delete(_counter_key(report_name, "hits"), _counter_key(report_name, "misses"))
+    print("✅ Report cache counters reset")
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Compliance Report Queries
+Data sources for the Script Reports created by create-compliance-reports.py
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, flt, get_datetime, getdate
+
+import medical_waste_items
+import query_log
+import report_cache
+import training_expiry_summary
+import waste_generation_rollup
+
+def _check_permission(doctype):
+    """Report data is only served to users who can read the source DocType"""
+    if not frappe.has_permission(doctype, "read"):
+        frappe.throw(_("Not permitted to read {0}").format(doctype), frappe.PermissionError)
+
+def _date_filter(filters, key):
+    value = filters.get(key)
+    return getdate(value) if value else None
+
+def _generation_rollup_query(from_date, to_date):
+    """Daily generation totals from the pre-aggregated rollup"""
+
+    query = f"""
+        SELECT
+            r.posting_date as date,
+            r.item_code,
+            i.item_name,
+            i.waste_classification,
+            r.qty,
+            i.stock_uom as uom,
+            r.warehouse,
+            r.generation_department as department
+        FROM `{waste_generation_rollup.ROLLUP_TABLE}` r
+        JOIN `{medical_waste_items.ITEM_TABLE}` mw ON r.item_code = mw.item_code
+        JOIN `tabItem` i ON r.item_code = i.name
+        WHERE (%(from_date)s IS NULL OR r.posting_date >= %(from_date)s)
+        AND (%(to_date)s IS NULL OR r.posting_date <= %(to_date)s)
+        ORDER BY r.posting_date DESC
+    """
+    return query, {"from_date": from_date, "to_date": to_date}
+
+def _generation_ledger_query(from_date, to_date):
+    """Daily generation totals aggregated straight from the Stock Ledger"""
+
+    query = f"""
+        SELECT
+            sle.posting_date as date,
+            sle.item_code,
+            i.item_name,
+            i.waste_classification,
+            SUM(sle.actual_qty) as qty,
+            i.stock_uom as uom,
+            IFNULL(sle.warehouse, '') as warehouse,
+            IFNULL(sle.generation_department, '') as department
+        FROM `tabStock Ledger Entry` sle
+        JOIN `{medical_waste_items.ITEM_TABLE}` mw ON sle.item_code = mw.item_code
+        JOIN `tabItem` i ON sle.item_code = i.name
+        WHERE sle.voucher_type = 'Stock Entry'
+        AND sle.is_cancelled = 0
+        AND sle.actual_qty > 0
+        AND (%(from_date)s IS NULL OR sle.posting_date >= %(from_date)s)
+        AND (%(to_date)s IS NULL OR sle.posting_date <= %(to_date)s)
+        GROUP BY sle.posting_date, sle.item_code, sle.warehouse, sle.generation_department
+        ORDER BY sle.posting_date DESC
+    """
+    return query, {"from_date": from_date, "to_date": to_date}
+
+def _generation_queries(filters):
+    """Split the date range between rollup and ledger, newest segment first
+
+    Dates on or after the rollup's coverage start are read from the rollup;
+    only the part of the range before it falls back to the Stock Ledger.
+    """
+
+    medical_waste_items.get_item_codes()
+
+    from_date = _date_filter(filters, "from_date")
+    to_date = _date_filter(filters, "to_date")
+    covered_from = waste_generation_rollup.get_covered_from()
+
+    if covered_from is None:
+        return [_generation_ledger_query(from_date, to_date)]
+
+    queries = []
+    if to_date is None or to_date >= covered_from:
+        rollup_from = covered_from if from_date is None else max(from_date, covered_from)
+        queries.append(_generation_rollup_query(rollup_from, to_date))
+
+    if from_date is None or from_date < covered_from:
+        ledger_to = add_days(covered_from, -1)
+        if to_date is not None and to_date < ledger_to:
+            ledger_to = to_date
+        queries.append(_generation_ledger_query(from_date, ledger_to))
+
+    return queries
+
+# Chart By filter of the generation report -> the row field its chart totals by
+GENERATION_CHART_FIELDS = {"Date": "date", "Waste Type": "waste_classification"}
+
+@frappe.whitelist()
+def get_waste_generation_data(filters=None):
+    """Rows for the Medical Waste Generation Report"""
+
+    _check_permission("Stock Ledger Entry")
+
+    # Chart By only shapes the chart; the rows are cached once for both
+    filters = frappe._dict({key: value for key, value in (filters or {}).items() if key != "chart_by"})
+    return report_cache.get_or_compute(
+        "Medical Waste Generation Report", filters,
+        lambda: _compute_waste_generation_data(filters)
+    )
+
+@frappe.whitelist()
+def get_waste_generation_chart(filters=None):
+    """Chart of the Medical Waste Generation Report: quantity per day, or per waste type
+
+    Totals the report's cached rows, so it follows the Medical Waste item
+    resolver like the report does. The dashboard charts are Report charts
+    reading this through the report's Chart By filter.
+    """
+
+    filters = frappe._dict(filters or {})
+    chart_by = filters.get("chart_by") or "Date"
+    if chart_by not in GENERATION_CHART_FIELDS:
+        frappe.throw(_("Chart By must be one of {0}").format(", ".join(GENERATION_CHART_FIELDS)))
+    fieldname = GENERATION_CHART_FIELDS[chart_by]
+
+    totals = {}
+    for row in get_waste_generation_data(filters):
+        key = row.get(fieldname) or _("Not Set")
+        totals[key] = totals.get(key, 0) + flt(row.get("qty"))
+
+    labels = sorted(totals, key=str)
+    return {
+        "data": {
+            "labels": [str(label) for label in labels],
+            "datasets": [{"name": _("Quantity"), "values": [flt(totals[label], 3) for label in labels]}]
+        },
+        "type": "line" if chart_by == "Date" else "donut"
+    }
+
+def _compute_waste_generation_data(filters):
+    data = []
+    for query, params in _generation_queries(filters):
+        data.extend(frappe.db.sql(query, params, as_dict=1))
+    return data
+
+def _stream(query, params):
+    """Yield rows through a server-side (unbuffered) cursor
+
+    Rows are fetched from MariaDB as they are consumed, so memory stays flat
+    regardless of result size. No other query may run on this connection
+    until the iterator is exhausted or closed.
+    """
+
+    with frappe.db.unbuffered_cursor():
+        yield from frappe.db.sql(query, params, as_dict=1, as_iterator=True)
+
+def iter_waste_generation_rows(filters=None):
+    """Stream every Medical Waste Generation Report row"""
+
+    _check_permission("Stock Ledger Entry")
+
+    for query, params in _generation_queries(frappe._dict(filters or {})):
+        yield from _stream(query, params)
+
+DISPOSAL_PAGE_LENGTH = 500
+
+def _disposal_query(filters, after=None, limit=None):
+    """Manifest line query ordered by the (manifest_date, manifest, line) keyset
+
+    `after` is the cursor returned with the previous page. Newest manifests
+    come first; lines within a manifest keep their table order. A page's
+    manifests are picked first, in (manifest_date, name) index order and
+    limited, so the ordering of their lines only sorts that page's rows.
+    """
+
+    params = {
+        "from_date": _date_filter(filters, "from_date"),
+        "to_date": _date_filter(filters, "to_date")
+    }
+    manifest_condition = ""
+    line_condition = ""
+    if after:
+        params.update({
+            "after_date": getdate(after["manifest_date"]),
+            "after_manifest": after["manifest"],
+            "after_line": int(after["line"])
+        })
+        # The cursor's manifest is picked again for the lines it has left
+        manifest_condition = """
+            AND (m.manifest_date < %(after_date)s
+                OR (m.manifest_date = %(after_date)s AND m.name <= %(after_manifest)s))"""
+        line_condition = "WHERE NOT (m.name = %(after_manifest)s AND mi.idx <= %(after_line)s)"
+
+    manifest_limit_clause = limit_clause = ""
+    if limit:
+        # Every picked manifest has a line, so `limit` manifests give `limit`
+        # rows; one more covers a cursor manifest with none left
+        params["limit"] = int(limit)
+        params["manifest_limit"] = int(limit) + (1 if after else 0)
+        manifest_limit_clause = "LIMIT %(manifest_limit)s"
+        limit_clause = "LIMIT %(limit)s"
+
+    query = f"""
+        SELECT
+            m.manifest_number,
+            m.manifest_date,
+            m.transporter_name as supplier,
+            mi.waste_classification as waste_type,
+            mi.quantity,
+            mi.weight_lbs as weight,
+            m.treatment_method,
+            m.status,
+            m.name as manifest,
+            mi.idx as line
+        FROM (
+            SELECT m.name, m.manifest_number, m.manifest_date, m.transporter_name,
+                m.treatment_method, m.status
+            FROM `tabMedical Waste Manifest` m
+            WHERE (%(from_date)s IS NULL OR m.manifest_date >= %(from_date)s)
+            AND (%(to_date)s IS NULL OR m.manifest_date <= %(to_date)s){manifest_condition}
+            AND EXISTS (
+                SELECT 1 FROM `tabMedical Waste Manifest Item` mwi
+                WHERE mwi.parent = m.name AND mwi.parenttype = 'Medical Waste Manifest'
+            )
+            ORDER BY m.manifest_date DESC, m.name DESC
+            {manifest_limit_clause}
+        ) m
+        JOIN `tabMedical Waste Manifest Item` mi
+            ON mi.parent = m.name AND mi.parenttype = 'Medical Waste Manifest'
+        {line_condition}
+        ORDER BY m.manifest_date DESC, m.name DESC, mi.idx ASC
+        {limit_clause}
+    """
+    return query, params
+
+@frappe.whitelist()
+def get_waste_disposal_page(filters=None, after=None, page_length=DISPOSAL_PAGE_LENGTH):
+    """One page of the Waste Disposal Tracking Report
+
+    Returns the rows and the cursor for the next page (None on the last one).
+    Each page reads one page of manifests off the (manifest_date, name) index
+    from the cursor on, so late pages cost the same as early ones.
+    """
+
+    _check_permission("Medical Waste Manifest")
+
+    filters = frappe._dict(frappe.parse_json(filters) or {})
+    after = frappe.parse_json(after) if after else None
+    page_length = min(int(page_length or DISPOSAL_PAGE_LENGTH), 5000)
+
+    # Fetch one extra row to learn whether another page exists
+    query, params = _disposal_query(filters, after, page_length + 1)
+    with query_log.trace_queries("Waste Disposal Tracking Report", {**filters, "after": after}):
+        rows = frappe.db.sql(query, params, as_dict=1)
+
+    next_cursor = None
+    if len(rows) > page_length:
+        rows = rows[:page_length]
+        last = rows[-1]
+        next_cursor = {
+            "manifest_date": str(last.manifest_date),
+            "manifest": last.manifest,
+            "line": last.line
+        }
+
+    return {"rows": rows, "next": next_cursor}
+
+@frappe.whitelist()
+def get_waste_disposal_data(filters=None):
+    """Rows for the Waste Disposal Tracking Report
+
+    With the `paginate` filter set only the first page is returned and the
+    report's Load More button pulls the rest through get_waste_disposal_page.
+    """
+
+    _check_permission("Medical Waste Manifest")
+
+    filters = frappe._dict(filters or {})
+    return report_cache.get_or_compute(
+        "Waste Disposal Tracking Report", filters,
+        lambda: _compute_waste_disposal_data(filters)
+    )
+
+def _compute_waste_disposal_data(filters):
+    if filters.get("paginate"):
+        return get_waste_disposal_page(filters)["rows"]
+
+    query, params = _disposal_query(filters)
+    return frappe.db.sql(query, params, as_dict=1)
+
+def iter_waste_disposal_rows(filters=None):
+    """Stream every Waste Disposal Tracking Report row"""
+
+    _check_permission("Medical Waste Manifest")
+
+    query, params = _disposal_query(frappe._dict(filters or {}))
+    yield from _stream(query, params)
+
+@frappe.whitelist()
+def get_training_compliance_data(filters=None):
+    """Rows for the Training Compliance Report"""
+
+    _check_permission("Training Record")
+
+    filters = frappe._dict(filters or {})
+    return report_cache.get_or_compute(
+        "Training Compliance Report", filters,
+        lambda: _compute_training_compliance_data(filters)
+    )
+
+def _compute_training_compliance_data(filters):
+    if filters.get("summary"):
+        return training_expiry_summary.get_summary(
+            filters.get("department"), filters.get("training_type"), filters.get("expiry_bucket")
+        )
+
+    query, params = _training_query(filters)
+    return frappe.db.sql(query, params, as_dict=1)
+
+def _training_query(filters):
+    conditions = ["tr.expiration_date IS NOT NULL"]
+    params = {}
+
+    if filters.get("department"):
+        conditions.append("tr.department = %(department)s")
+        params["department"] = filters.get("department")
+
+    # Drilling into one bucket becomes an expiration_date range on the index
+    if filters.get("expiry_bucket"):
+        from_date, to_date = training_expiry_summary.bucket_date_range(filters.get("expiry_bucket"))
+        if from_date:
+            conditions.append("tr.expiration_date >= %(from_date)s")
+            params["from_date"] = from_date
+        if to_date:
+            conditions.append("tr.expiration_date < %(to_date)s")
+            params["to_date"] = to_date
+
+    if filters.get("training_type"):
+        conditions.append("tr.training_type = %(training_type)s")
+        params["training_type"] = filters.get("training_type")
+
+    query = f"""
+        SELECT
+            tr.employee,
+            tr.employee_name,
+            tr.department,
+            tr.training_type,
+            tr.training_date,
+            tr.expiration_date,
+            tr.status,
+            DATEDIFF(tr.expiration_date, CURDATE()) as days_until_expiry
+        FROM `tabTraining Record` tr
+        WHERE {" AND ".join(conditions)}
+        ORDER BY tr.expiration_date ASC
+    """
+    return query, params
+
+def iter_training_compliance_rows(filters=None):
+    """Stream every row-level Training Compliance Report row"""
+
+    _check_permission("Training Record")
+
+    query, params = _training_query(frappe._dict(filters or {}))
+    yield from _stream(query, params)
+
+@frappe.whitelist()
+def get_incident_summary_data(filters=None):
+    """Rows for the Incident Summary Report"""
+
+    _check_permission("Incident Report")
+
+    filters = frappe._dict(filters or {})
+    return report_cache.get_or_compute(
+        "Incident Summary Report", filters,
+        lambda: _compute_incident_summary_data(filters)
+    )
+
+def _compute_incident_summary_data(filters):
+    query, params = _incident_query(filters)
+    data = frappe.db.sql(query, params, as_dict=1)
+
+    # One lookup for the distinct reporters instead of a join on every row
+    employee_names = _employee_names({row.reported_by for row in data if row.reported_by})
+    for row in data:
+        row.reported_by = employee_names.get(row.reported_by)
+
+    return data
+
+def _employee_names(employees=None):
+    """Map employee id to name, for the given ids or for every employee"""
+
+    filters = {}
+    if employees is not None:
+        if not employees:
+            return {}
+        filters = {"name": ["in", list(employees)]}
+
+    return dict(frappe.get_all(
+        "Employee", filters=filters, fields=["name", "employee_name"], as_list=True
+    ))
+
+def _incident_query(filters):
+    conditions = []
+    params = {}
+
+    # Half-open datetime bounds keep the incident_date index usable;
+    # to_date is inclusive for the user, so compare against the next midnight
+    from_date = _date_filter(filters, "from_date")
+    if from_date:
+        conditions.append("ir.incident_date >= %(from_datetime)s")
+        params["from_datetime"] = get_datetime(from_date)
+
+    to_date = _date_filter(filters, "to_date")
+    if to_date:
+        conditions.append("ir.incident_date < %(to_datetime)s")
+        params["to_datetime"] = get_datetime(add_days(to_date, 1))
+
+    for fieldname in ("severity", "department"):
+        if filters.get(fieldname):
+            conditions.append(f"ir.{fieldname} = %({fieldname})s")
+            params[fieldname] = filters.get(fieldname)
+
+    query = f"""
+        SELECT
+            ir.incident_date,
+            ir.incident_type,
+            ir.severity,
+            ir.location,
+            ir.department,
+            ir.reported_by,
+            CASE
+                WHEN ir.docstatus = 0 THEN 'Draft'
+                WHEN ir.docstatus = 1 THEN 'Submitted'
+                ELSE 'Cancelled'
+            END as status
+        FROM `tabIncident Report` ir
+        {"WHERE " + " AND ".join(conditions) if conditions else ""}
+        ORDER BY ir.incident_date DESC
+    """
+    return query, params
+
+def iter_incident_summary_rows(filters=None):
+    """Stream every Incident Summary Report row
+
+    Reporter names are loaded up front because the streaming connection
+    cannot serve lookups until the stream is finished.
+    """
+
+    _check_permission("Incident Report")
+
+    employee_names = _employee_names()
+    query, params = _incident_query(frappe._dict(filters or {}))
+    for row in _stream(query, params):
+        row.reported_by = employee_names.get(row.reported_by)
+        yield row
+
+def get_row_count(report_name, filters=None):
+    """Rows a full, unpaginated run of the report would return
+
+    Used by the export engine to report progress as a percentage.
+    """
+
+    filters = frappe._dict(filters or {})
+    builders = {
+        "Medical Waste Generation Report": lambda: _generation_queries(filters),
+        "Waste Disposal Tracking Report": lambda: [_disposal_query(filters)],
+        "Training Compliance Report": lambda: [_training_query(filters)],
+        "Incident Summary Report": lambda: [_incident_query(filters)]
+    }
+
+    return sum(
+        frappe.db.sql(f"SELECT COUNT(*) FROM ({query}) report_rows", params)[0][0]
+        for query, params in builders[report_name]()
+    )
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Schema Drift
+Compares the Custom Fields and DocTypes the setup defines with the site and repairs them in one batch
+"""
+
+import importlib
+
+import frappe
+
+import medwaste_spec
+from custom_field_installer import install_custom_fields
+from provisioning import same_value
+
+# Setup scripts whose CUSTOM_DOCTYPES list the DocTypes they create, in creation order
+DOCTYPE_MODULES = ["create-custom-doctypes", "setup-buying-module"]
+
+# Set when a DocType is created and not compared afterwards
+CREATE_ONLY = {"doctype", "name", "custom", "fields", "permissions"}
+
+def create_doctype(definition):
+    """Insert a custom DocType from its definition unless it exists"""
+
+    if frappe.db.exists("DocType", definition["name"]):
+        print(f"⚠️  {definition['name']} DocType already exists")
+        return
+
+    frappe.get_doc(definition).insert()
+    print(f"✅ Created {definition['name']} DocType")
+
+def _definitions():
+    # Imported here: those scripts import create_doctype from this module
+    return [
+        definition
+        for module in DOCTYPE_MODULES
+        for definition in importlib.import_module(module).CUSTOM_DOCTYPES
+    ]
+
+def _diff(spec, live, skip=()):
+    return {
+        field: value for field, value in spec.items()
+        if field not in skip and not isinstance(value, list) and not same_value(value, live.get(field))
+    }
+
+def _custom_field_drift():
+    """Spec Custom Fields that are missing or differ, from one query"""
+
+    fields = [
+        record
+        for section in medwaste_spec.SECTIONS.values() if section["doctype"] == "Custom Field"
+        for record in section["records"]
+    ]
+    columns = {column for field in fields for column in field}
+    live = {
+        (row.dt, row.fieldname): row
+        for row in frappe.get_all(
+            "Custom Field",
+            filters={"dt": ["in", list({field["dt"] for field in fields})]},
+            fields=sorted(columns)
+        )
+    }
+
+    drift = []
+    for field in fields:
+        current = live.get((field["dt"], field["fieldname"]))
+        if not current:
+            drift.append(frappe._dict(dt=field["dt"], fieldname=field["fieldname"], missing=True, fix=field))
+            continue
+        changes = _diff(field, current, skip={"dt", "fieldname"})
+        if changes:
+            drift.append(frappe._dict(
+                dt=field["dt"], fieldname=field["fieldname"], missing=False,
+                fix={"dt": field["dt"], "fieldname": field["fieldname"], **changes}
+            ))
+
+    return drift
+
+def _doctype_drift():
+    """Setup DocTypes that are missing or differ, from one query each for DocTypes and DocFields"""
+
+    definitions = _definitions()
+    names = [definition["name"] for definition in definitions]
+
+    properties = {key for definition in definitions for key in definition} - CREATE_ONLY
+    live = {
+        row.name: row
+        for row in frappe.get_all("DocType", filters={"name": ["in", names]}, fields=["name", *sorted(properties)])
+    }
+
+    columns = {column for definition in definitions for field in definition["fields"] for column in field}
+    live_fields = {}
+    for row in frappe.get_all(
+        "DocField",
+        filters={"parent": ["in", names], "parenttype": "DocType"},
+        fields=["parent", *sorted(columns)]
+    ):
+        live_fields.setdefault(row.parent, {})[row.fieldname] = row
+
+    drift = []
+    for definition in definitions:
+        name = definition["name"]
+        if name not in live:
+            drift.append(frappe._dict(name=name, missing=True, definition=definition))
+            continue
+
+        current_fields = live_fields.get(name, {})
+        item = frappe._dict(
+            name=name, missing=False,
+            changes=_diff(definition, live[name], skip=CREATE_ONLY),
+            missing_fields=[field for field in definition["fields"] if field["fieldname"] not in current_fields],
+            field_changes={},
+            extra_fields=sorted(set(current_fields) - {field["fieldname"] for field in definition["fields"]})
+        )
+        for field in definition["fields"]:
+            if field["fieldname"] in current_fields:
+                changes = _diff(field, current_fields[field["fieldname"]], skip={"fieldname"})
+                if changes:
+                    item.field_changes[field["fieldname"]] = changes
+
+        if item.changes or item.missing_fields or item.field_changes or item.extra_fields:
+            drift.append(item)
+
+    return drift
+
+def scan():
+    """Report where the site's Custom Fields and custom DocTypes differ from the setup
+
+        bench --site all execute schema_drift.scan
+
+    Reads the live meta in three queries whatever the number of fields, so
+    it is cheap enough to run after every deploy. Fields on the site that
+    the setup doesn't define are reported but never removed.
+    """
+
+    drift = frappe._dict(custom_fields=_custom_field_drift(), doctypes=_doctype_drift())
+
+    for field in drift.custom_fields:
+        if field.missing:
+            print(f"❌ Custom Field {field.dt}-{field.fieldname}: missing")
+        else:
+            print(f"🔄 Custom Field {field.dt}-{field.fieldname}: {', '.join(sorted(set(field.fix) - {'dt', 'fieldname'}))}")
+
+    for doctype in drift.doctypes:
+        if doctype.missing:
+            print(f"❌ DocType {doctype.name}: missing")
+            continue
+        if doctype.changes:
+            print(f"🔄 DocType {doctype.name}: {', '.join(sorted(doctype.changes))}")
+        for field in doctype.missing_fields:
+            print(f"❌ DocType {doctype.name}: field {field['fieldname']} missing")
+        for fieldname, changes in doctype.field_changes.items():
+            print(f"🔄 DocType {doctype.name}: field {fieldname}: {', '.join(sorted(changes))}")
+        for fieldname in doctype.extra_fields:
+            print(f"ℹ️  DocType {doctype.name}: field {fieldname} not in setup, left as is")
+
+    repairable = [doctype for doctype in drift.doctypes if doctype.missing or doctype.changes
+                  or doctype.missing_fields or doctype.field_changes]
+    if drift.custom_fields or repairable:
+        print(f"⚠️  Drift: {len(drift.custom_fields)} Custom Fields, {len(repairable)} DocTypes")
+    else:
+        print("✅ No schema drift found")
+
+    return drift
+
+def repair(dry_run=False):
+    """Scan, then bring every drifted Custom Field and DocType back to the setup
+
+        bench --site all execute schema_drift.repair
+        bench --site all execute schema_drift.repair --kwargs "{'dry_run': True}"
+
+    Custom Fields are saved together per DocType with one schema update
+    each, and every drifted DocType is loaded and saved once with all of
+    its changes. Everything is committed together at the end, though the
+    ALTER TABLEs a save runs commit implicitly on MariaDB.
+    """
+
+    drift = scan()
+    if dry_run:
+        return drift
+
+    if drift.custom_fields:
+        install_custom_fields([field.fix for field in drift.custom_fields])
+
+    for item in drift.doctypes:
+        if item.missing:
+            create_doctype(item.definition)
+            continue
+        if not (item.changes or item.missing_fields or item.field_changes):
+            continue
+
+        doc = frappe.get_doc("DocType", item.name)
+        doc.update(item.changes)
+        for row in doc.fields:
+            row.update(item.field_changes.get(row.fieldname, {}))
+        for field in item.missing_fields:
+            doc.append("fields", field)
+        doc.save()
+        print(f"🔧 Repaired {item.name} DocType")
+
+    frappe.db.commit()
+    return drift
+
+def main():
+    """Repair schema drift on the site"""
+    try:
+        print("🩺 Checking custom fields and DocTypes for schema drift...")
+        repair()
+        print("\n✅ Schema drift check completed!")
+
+    except Exception as e:
+        print(f"❌ Error repairing schema drift: {str(e)}")
+        frappe.db.rollback()
+        raise
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,11 @@ Sets up ERPNext Stock module for comprehensive waste tracking
 import frappe
 from frappe import _
 
+import provisioning
+from bulk_apply import bulk_apply
+from setup_profiler import profiled, profiled_run
+
+@profiled
 def create_stock_settings():
     """Configure stock settings for medical waste management"""
     
@@ -29,30 +34,13 @@ def create_stock_settings():
     stock_settings.save()
     print("✅ Updated stock settings for medical waste tracking")
 
+@profiled
 def create_uoms():
     """Create Units of Measure specific to medical waste"""
     
-    uoms = [
-        {"uom_name": "Gallon", "must_be_whole_number": 1},
-        {"uom_name": "Pound", "must_be_whole_number": 0},
-        {"uom_name": "Kilogram", "must_be_whole_number": 0},
-        {"uom_name": "Cubic Foot", "must_be_whole_number": 0},
-        {"uom_name": "Liter", "must_be_whole_number": 0},
-        {"uom_name": "Container", "must_be_whole_number": 1},
-        {"uom_name": "Bag", "must_be_whole_number": 1},
-        {"uom_name": "Sharps Container", "must_be_whole_number": 1}
-    ]
-    
-    for uom_data in uoms:
-        if not frappe.db.exists("UOM", uom_data["uom_name"]):
-            uom = frappe.get_doc({
-                "doctype": "UOM",
-                "uom_name": uom_data["uom_name"],
-                "must_be_whole_number": uom_data["must_be_whole_number"]
-            })
-            uom.insert()
-            print(f"✅ Created UOM: {uom_data['uom_name']}")
+    provisioning.apply("uoms")
 
+@profiled
 def setup_batch_naming():
     """Configure batch naming for waste tracking"""
     
@@ -69,6 +57,7 @@ def setup_batch_naming():
         # These would be configured through the UI typically
         print(f"📝 Batch naming series configured: {series['prefix']}")
 
+@profiled
 def create_stock_entry_types():
     """Create custom stock entry types for waste operations"""
     
@@ -100,17 +89,9 @@ def create_stock_entry_types():
         }
     ]
     
-    for entry_type in entry_types:
-        if not frappe.db.exists("Stock Entry Type", entry_type["name"]):
-            doc = frappe.get_doc({
-                "doctype": "Stock Entry Type",
-                "name": entry_type["name"],
-                "purpose": entry_type["purpose"],
-                "add_to_transit": entry_type["add_to_transit"]
-            })
-            doc.insert()
-            print(f"✅ Created Stock Entry Type: {entry_type['name']}")
+    bulk_apply("Stock Entry Type", entry_types, key="name")
 
+@profiled
 def setup_item_attributes():
     """Create item attributes for waste classification"""
     
@@ -137,100 +118,21 @@ def setup_item_attributes():
         }
     ]
     
-    for attr in attributes:
-        if not frappe.db.exists("Item Attribute", attr["attribute_name"]):
-            item_attr = frappe.get_doc({
-                "doctype": "Item Attribute",
-                "attribute_name": attr["attribute_name"],
-                "item_attribute_values": [{"attribute_value": val} for val in attr["values"]]
-            })
-            item_attr.insert()
-            print(f"✅ Created Item Attribute: {attr['attribute_name']}")
-
-def create_stock_reports_customization():
-    """Add custom fields to stock reports for waste tracking"""
-    
-    # Add custom fields to Stock Ledger Entry
-    custom_fields = [
-        {
-            "dt": "Stock Ledger Entry",
-            "fieldname": "waste_batch_id",
-            "label": "Waste Batch ID", 
-            "fieldtype": "Data"
-        },
-        {
-            "dt": "Stock Ledger Entry",
-            "fieldname": "generation_department",
-            "label": "Generation Department",
-            "fieldtype": "Link",
-            "options": "Department"
-        },
-        {
-            "dt": "Stock Ledger Entry", 
-            "fieldname": "disposal_date",
-            "label": "Disposal Date",
-            "fieldtype": "Date"
-        },
+    bulk_apply("Item Attribute", [
         {
-            "dt": "Stock Ledger Entry",
-            "fieldname": "manifest_number",
-            "label": "Manifest Number",
-            "fieldtype": "Data"
+            "attribute_name": attr["attribute_name"],
+            "item_attribute_values": [{"attribute_value": val} for val in attr["values"]]
         }
-    ]
-    
-    for field in custom_fields:
-        if not frappe.db.exists("Custom Field", {"dt": field["dt"], "fieldname": field["fieldname"]}):
-            custom_field = frappe.get_doc({
-                "doctype": "Custom Field",
-                "dt": field["dt"],
-                "fieldname": field["fieldname"],
-                "label": field["label"],
-                "fieldtype": field["fieldtype"],
-                "options": field.get("options", "")
-            })
-            custom_field.insert()
-            print(f"✅ Added custom field to {field['dt']}: {field['label']}")
+        for attr in attributes
+    ], key="attribute_name")
 
-def setup_pick_lists():
-    """Configure pick lists for waste collection routes"""
-    
-    # Add custom fields to Pick List
-    custom_fields = [
-        {
-            "fieldname": "collection_route",
-            "label": "Collection Route",
-            "fieldtype": "Data"
-        },
-        {
-            "fieldname": "collection_time",
-            "label": "Scheduled Collection Time",
-            "fieldtype": "Time"
-        },
-        {
-            "fieldname": "collector_name", 
-            "label": "Collector Name",
-            "fieldtype": "Data"
-        },
-        {
-            "fieldname": "special_handling",
-            "label": "Special Handling Instructions",
-            "fieldtype": "Text"
-        }
-    ]
+@profiled
+def create_stock_reports_customization():
+    """Add waste tracking fields to stock ledger entries, pick lists and reconciliations"""
     
-    for field in custom_fields:
-        if not frappe.db.exists("Custom Field", {"dt": "Pick List", "fieldname": field["fieldname"]}):
-            custom_field = frappe.get_doc({
-                "doctype": "Custom Field",
-                "dt": "Pick List", 
-                "fieldname": field["fieldname"],
-                "label": field["label"],
-                "fieldtype": field["fieldtype"]
-            })
-            custom_field.insert()
-            print(f"✅ Added Pick List field: {field['label']}")
+    provisioning.apply("stock_custom_fields")
 
+@profiled
 def create_delivery_routes():
     """Set up delivery routes for waste collection"""
     
@@ -257,52 +159,16 @@ def create_delivery_routes():
         }
     ]
     
-    for route in routes:
-        if not frappe.db.exists("Driver", route["driver"]):
-            driver = frappe.get_doc({
-                "doctype": "Driver",
-                "full_name": route["driver"],
-                "employee": route["driver"]  # Would link to actual employee
-            })
-            driver.insert()
-            print(f"✅ Created driver: {route['driver']}")
-
-def setup_stock_reconciliation():
-    """Configure stock reconciliation for periodic waste audits"""
-    
-    # Add custom fields for reconciliation
-    custom_fields = [
+    # Drivers are named by series, so match on full_name
+    bulk_apply("Driver", [
         {
-            "fieldname": "audit_type",
-            "label": "Audit Type",
-            "fieldtype": "Select", 
-            "options": "\\nDaily Count\\nWeekly Audit\\nMonthly Reconciliation\\nCompliance Audit"
-        },
-        {
-            "fieldname": "auditor_name",
-            "label": "Auditor Name",
-            "fieldtype": "Data"
-        },
-        {
-            "fieldname": "audit_findings",
-            "label": "Audit Findings", 
-            "fieldtype": "Text"
+            "full_name": route["driver"],
+            "employee": route["driver"]  # Would link to actual employee
         }
-    ]
-    
-    for field in custom_fields:
-        if not frappe.db.exists("Custom Field", {"dt": "Stock Reconciliation", "fieldname": field["fieldname"]}):
-            custom_field = frappe.get_doc({
-                "doctype": "Custom Field",
-                "dt": "Stock Reconciliation",
-                "fieldname": field["fieldname"], 
-                "label": field["label"],
-                "fieldtype": field["fieldtype"],
-                "options": field.get("options", "")
-            })
-            custom_field.insert()
-            print(f"✅ Added Stock Reconciliation field: {field['label']}")
+        for route in routes
+    ], key="full_name")
 
+@profiled_run
 def main():
     """Main setup function for stock module"""
     try:
@@ -320,18 +186,12 @@ def main():
         print("\n📋 Creating stock entry types...")
         create_stock_entry_types()
         
-        print("\n📊 Adding custom fields to stock reports...")
+        print("\n📊 Adding custom fields to stock documents...")
         create_stock_reports_customization()
         
-        print("\n🚚 Setting up pick lists...")
-        setup_pick_lists()
-        
         print("\n🛣️  Creating delivery routes...")
         create_delivery_routes()
         
-        print("\n🔍 Configuring stock reconciliation...")
-        setup_stock_reconciliation()
-        
         frappe.db.commit()
         print("\n✅ Stock module configuration completed!")
         
@@ -6,75 +6,20 @@ Consolidated setup script for medical waste management in ERPNext
 
 import frappe
 
+import medwaste_spec
+from custom_field_installer import install_custom_fields
+from tree_loader import load_tree
+
 def setup_medical_waste():
     """Setup medical waste management system"""
     
-    def create_item_group(name, parent_group="All Item Groups", is_group=1):
-        """Create an item group if it doesn't exist"""
-        if not frappe.db.exists("Item Group", name):
-            item_group = frappe.get_doc({
-                "doctype": "Item Group",
-                "item_group_name": name,
-                "parent_item_group": parent_group,
-                "is_group": is_group
-            })
-            item_group.insert()
-            print(f"✅ Created Item Group: {name}")
-            return item_group
-        else:
-            print(f"⚠️  Item Group already exists: {name}")
-            return frappe.get_doc("Item Group", name)
-
     def create_medical_waste_item_groups():
         """Create hierarchical item groups for medical waste management"""
         
-        # Main medical waste group
-        medical_waste = create_item_group("Medical Waste", "All Item Groups", 1)
-        
-        # Primary waste categories
-        infectious_waste = create_item_group("Infectious Waste", "Medical Waste", 1)
-        sharps_waste = create_item_group("Sharps Waste", "Medical Waste", 1)
-        pharmaceutical_waste = create_item_group("Pharmaceutical Waste", "Medical Waste", 1)
-        pathological_waste = create_item_group("Pathological Waste", "Medical Waste", 1)
-        chemotherapy_waste = create_item_group("Chemotherapy Waste", "Medical Waste", 1)
-        
-        # Infectious waste subcategories
-        create_item_group("Blood Products", "Infectious Waste", 1)
-        create_item_group("Cultures and Stocks", "Infectious Waste", 1)
-        create_item_group("Laboratory Waste", "Infectious Waste", 1)
-        create_item_group("Surgery Waste", "Infectious Waste", 1)
-        create_item_group("Isolation Waste", "Infectious Waste", 1)
-        
-        # Sharps waste subcategories
-        create_item_group("Needles and Syringes", "Sharps Waste", 1)
-        create_item_group("Scalpels and Blades", "Sharps Waste", 1)
-        create_item_group("Glass Waste", "Sharps Waste", 1)
-        create_item_group("Other Sharp Objects", "Sharps Waste", 1)
-        
-        # Pharmaceutical waste subcategories
-        create_item_group("Expired Medications", "Pharmaceutical Waste", 1)
-        create_item_group("Controlled Substances", "Pharmaceutical Waste", 1)
-        create_item_group("Vaccines and Biologicals", "Pharmaceutical Waste", 1)
-        create_item_group("IV Solutions", "Pharmaceutical Waste", 1)
-        
-        # Pathological waste subcategories
-        create_item_group("Human Tissues", "Pathological Waste", 1)
-        create_item_group("Organs and Body Parts", "Pathological Waste", 1)
-        create_item_group("Placental Material", "Pathological Waste", 1)
-        create_item_group("Anatomical Remains", "Pathological Waste", 1)
-        
-        # Chemotherapy waste subcategories
-        create_item_group("Chemo Drugs", "Chemotherapy Waste", 1)
-        create_item_group("Chemo Contaminated Items", "Chemotherapy Waste", 1)
-        create_item_group("Chemo PPE", "Chemotherapy Waste", 1)
-        
-        # Waste containers
-        containers = create_item_group("Waste Containers", "Medical Waste", 1)
-        create_item_group("Red Bags", "Waste Containers", 1)
-        create_item_group("Sharps Containers", "Waste Containers", 1)
-        create_item_group("Yellow Bags", "Waste Containers", 1)
-        create_item_group("Black Bags", "Waste Containers", 1)
-        create_item_group("Rigid Containers", "Waste Containers", 1)
+        load_tree("Item Group", [
+            {"item_group_name": name, "parent_item_group": parent_group, "is_group": 1}
+            for name, parent_group in medwaste_spec.ITEM_GROUPS
+        ], key="item_group_name")
 
     def setup_warehouses():
         """Create warehouses for different waste storage areas"""
@@ -106,15 +51,7 @@ def setup_medical_waste():
             }
         ]
         
-        for wh_data in warehouses:
-            if not frappe.db.exists("Warehouse", wh_data["warehouse_name"]):
-                warehouse = frappe.get_doc({
-                    "doctype": "Warehouse",
-                    "warehouse_name": wh_data["warehouse_name"],
-                    "warehouse_type": wh_data["warehouse_type"]
-                })
-                warehouse.insert()
-                print(f"✅ Created warehouse: {wh_data['warehouse_name']}")
+        load_tree("Warehouse", warehouses, key="warehouse_name")
 
     def create_waste_item_template():
         """Create custom fields for waste items"""
@@ -168,21 +105,8 @@ def setup_medical_waste():
             }
         ]
         
-        # Add custom fields to Item doctype
-        for field in custom_fields:
-            if not frappe.db.exists("Custom Field", {"dt": "Item", "fieldname": field["fieldname"]}):
-                custom_field = frappe.get_doc({
-                    "doctype": "Custom Field",
-                    "dt": "Item",
-                    "fieldname": field["fieldname"],
-                    "label": field["label"],
-                    "fieldtype": field["fieldtype"],
-                    "options": field.get("options", ""),
-                    "reqd": field.get("reqd", 0),
-                    "description": field.get("description", "")
-                })
-                custom_field.insert()
-                print(f"✅ Added custom field: {field['label']}")
+        # Add custom fields to Item doctype, altering tabItem once
+        install_custom_fields([{"dt": "Item", **field} for field in custom_fields], update=False)
 
     def create_sample_waste_items():
         """Create sample waste items for testing"""
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Setup Pipeline
+Runs the setup steps in dependency order, independent ones side by side in worker processes
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import frappe
+from frappe.utils import cint, now_datetime
+
+from setup_profiler import profile_step, profiled_run
+
+# Worker processes when `medwaste_setup_workers` isn't set in site config
+DEFAULT_WORKERS = 4
+
+# Each step runs `method` once the steps in `after` have finished. The
+# dependencies are what a step reads from the others, so any order that
+# respects them gives the same site. `meta` lists the DocTypes whose meta
+# the step changes (Custom Fields, created DocTypes): steps sharing one
+# never run at the same time, as both would ALTER and re-cache it.
+STEPS = {
+    "item_categories": {
+        "label": "Setting up item categories",
+        "method": "setup-item-categories.main",
+        "after": [],
+        "meta": ["Item"]
+    },
+    "stock_module": {
+        "label": "Configuring stock module",
+        "method": "setup-stock-module.main",
+        "after": [],
+        "meta": ["Stock Ledger Entry", "Pick List", "Stock Reconciliation"]
+    },
+    "custom_doctypes": {
+        "label": "Creating custom doctypes",
+        "method": "create-custom-doctypes.main",
+        "after": [],
+        "meta": [
+            "Medical Waste Manifest Item", "Medical Waste Manifest", "Waste Container Tracking",
+            "Inspection Area", "Compliance Inspection", "Training Record", "Affected Personnel",
+            "Incident Report", "Waste Query Log"
+        ]
+    },
+    "manufacturing": {
+        "label": "Setting up manufacturing workflows",
+        # BOMs consume the sample waste items, treatment items use the
+        # Liter UOM and a Work Order field links to Medical Waste Manifest
+        "method": "setup-manufacturing-workflows.main",
+        "after": ["item_categories", "stock_module", "custom_doctypes"],
+        "meta": ["Quality Inspection", "Work Order"]
+    },
+    "buying": {
+        "label": "Configuring buying module",
+        "method": "setup-buying-module.main",
+        "after": [],
+        "meta": [
+            "Supplier", "Purchase Order", "Supplier Quotation", "Purchase Receipt",
+            "Supplier Scorecard", "Supplier Waste Type"
+        ]
+    },
+    "compliance_reports": {
+        "label": "Creating compliance reports",
+        # Hooks attach to the custom doctypes; the item resolver expands the
+        # Medical Waste item group; the reports read the Stock Ledger Entry
+        # generation_department field
+        "method": "create-compliance-reports.main",
+        "after": ["item_categories", "stock_module", "custom_doctypes"],
+        "meta": []
+    },
+    "rollup_backfill": {
+        "label": "Backfilling waste generation rollup",
+        # Groups the ledger by generation_department
+        "method": "waste_generation_rollup.backfill",
+        "after": ["stock_module", "compliance_reports"],
+        "meta": []
+    },
+    "kpi_reconcile": {
+        "label": "Computing KPIs from existing data",
+        "method": "kpi_engine.reconcile",
+        "after": ["compliance_reports", "buying"],
+        "meta": []
+    }
+}
+
+def step_order(steps=None):
+    """Steps to run in dependency order, including what the named ones need
+
+    Ties keep the order of STEPS, so a full run follows the listing above.
+    """
+
+    wanted = set()
+    pending = list(steps or STEPS)
+    while pending:
+        name = pending.pop()
+        if name not in STEPS:
+            frappe.throw(f"Unknown setup step: {name}")
+        if name not in wanted:
+            wanted.add(name)
+            pending.extend(STEPS[name]["after"])
+
+    order = []
+    done = set()
+    while len(order) < len(wanted):
+        ready = [
+            name for name in STEPS
+            if name in wanted and name not in done and set(STEPS[name]["after"]) <= done
+        ]
+        if not ready:
+            frappe.throw(f"Setup steps depend on each other: {', '.join(sorted(wanted - done))}")
+        order.append(ready[0])
+        done.add(ready[0])
+
+    return order
+
+def _touched_doctypes(since):
+    """Custom DocTypes and DocTypes with Custom Fields changed since `since`"""
+
+    return [row[0] for row in frappe.db.sql("""
+        SELECT name FROM `tabDocType` WHERE custom = 1 AND modified >= %(since)s
+        UNION
+        SELECT DISTINCT dt FROM `tabCustom Field` WHERE modified >= %(since)s
+    """, {"since": since})]
+
+def sync_meta(doctypes):
+    """Bring tables and cached meta in line for just these DocTypes
+
+    Stands in for `bench migrate` between steps: the setup scripts only add
+    custom DocTypes and Custom Fields, so the app sync, patches and fixtures
+    a migrate runs have nothing to do.
+    """
+
+    for doctype in doctypes:
+        frappe.clear_cache(doctype=doctype)
+        frappe.db.updatedb(doctype)
+    frappe.db.commit()
+
+def _run_step(name, sync_only=None):
+    """Run one step, then sync the meta it changed; `sync_only` limits the sync to those DocTypes"""
+
+    since = now_datetime()
+    with profile_step(name):
+        frappe.get_attr(STEPS[name]["method"])()
+
+        touched = _touched_doctypes(since)
+        if sync_only is not None:
+            touched = [doctype for doctype in touched if doctype in sync_only]
+        if touched:
+            with profile_step("sync_meta"):
+                sync_meta(touched)
+            print(f"🔄 Synced meta for {len(touched)} DocTypes")
+
+def connect_worker():
+    """Pool initializer for forked workers
+
+    Forked after the parent closed its connection: open one of our own.
+    """
+    frappe.connect()
+
+def _run_in_worker(name):
+    """Run a step in a worker process and hand its profile records back to the parent"""
+
+    # The worker holds a copy of the parent's profile session from the fork
+    session = frappe.flags.medwaste_profile
+    first = len(session.steps) if session else 0
+
+    # Steps running next to this one may be changing other DocTypes right now,
+    # so only the declared ones are synced here
+    _run_step(name, sync_only=set(STEPS[name]["meta"]))
+    return session.steps[first:] if session else []
+
+def _can_start(name, done, running):
+    step = STEPS[name]
+    if not set(step["after"]) <= done:
+        return False
+    meta = set(step["meta"])
+    return not any(meta & set(STEPS[other]["meta"]) for other in running.values())
+
+def _run_parallel(order, workers):
+    """Run the steps on up to `workers` processes, each as soon as it may start"""
+
+    session = frappe.flags.medwaste_profile
+    pending = list(order)
+    done = set()
+    running = {}
+    started = {}
+    failed = None
+
+    frappe.db.commit()
+    frappe.db.close()
+    try:
+        with ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("fork"), initializer=connect_worker
+        ) as pool:
+            while pending or running:
+                # Earlier steps first, so steps sharing meta keep their listed order
+                for name in list(pending) if not failed else []:
+                    if len(running) >= workers:
+                        break
+                    if _can_start(name, done, running):
+                        pending.remove(name)
+                        print(f"\n🔷 Step {len(order) - len(pending)}/{len(order)}: {STEPS[name]['label']}...")
+                        started[name] = time.perf_counter()
+                        running[pool.submit(_run_in_worker, name)] = name
+
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        records = future.result()
+                    except Exception as e:
+                        print(f"❌ Setup step '{name}' failed: {str(e)}")
+                        failed = failed or (name, e)
+                        continue
+                    if session:
+                        session.steps.extend(records)
+                    done.add(name)
+                    print(f"✅ Step '{name}' finished in {time.perf_counter() - started[name]:.1f}s")
+    finally:
+        frappe.connect()
+
+    if failed:
+        # Steps already running were let finish; nothing after them was started
+        name, error = failed
+        print(f"❌ Setup stopped at step '{name}'")
+        raise error
+
+@profiled_run
+def run(steps=None, workers=None):
+    """Run the setup pipeline
+
+        bench --site frontend execute setup_pipeline.run
+        bench --site frontend execute setup_pipeline.run --kwargs "{'steps': ['compliance_reports']}"
+        bench --site frontend execute setup_pipeline.run --kwargs "{'workers': 1}"
+
+    Naming steps runs them after the steps they depend on. Every script is
+    idempotent, so re-running finished steps only costs their checks. The
+    profile printed at the end breaks each step down by script function.
+
+    Steps whose dependencies are done run side by side, each in a worker
+    process with its own database connection, unless they change the meta
+    of the same DocType. `workers` defaults to `medwaste_setup_workers` in
+    site config; 1 runs every step in this process, one after another.
+    """
+
+    order = step_order(steps)
+    workers = cint(workers or frappe.conf.get("medwaste_setup_workers") or DEFAULT_WORKERS)
+
+    if workers > 1 and len(order) > 1:
+        started = now_datetime()
+        _run_parallel(order, workers)
+
+        # Anything a step changed without declaring it in `meta`
+        declared = {doctype for name in order for doctype in STEPS[name]["meta"]}
+        undeclared = [doctype for doctype in _touched_doctypes(started) if doctype not in declared]
+        if undeclared:
+            with profile_step("sync_meta"):
+                sync_meta(undeclared)
+            print(f"🔄 Synced meta for {len(undeclared)} DocTypes")
+    else:
+        for position, name in enumerate(order, 1):
+            print(f"\n🔷 Step {position}/{len(order)}: {STEPS[name]['label']}...")
+            try:
+                _run_step(name)
+            except Exception:
+                print(f"❌ Setup stopped at step '{name}'")
+                raise
+
+    if not steps:
+        # A full run is what a snapshot of this site would stand for
+        frappe.get_attr("site_snapshot.mark_provisioned")()
+
+    return order
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Setup Profiler
+Records wall time, queries, rows written and peak memory for each setup step
+"""
+
+import cProfile
+import functools
+import json
+import os
+import pstats
+import re
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import frappe
+from frappe.utils import cint, now_datetime
+
+from sql_tracking import track_sql
+
+# Statements whose cursor rowcount counts as rows written
+WRITE_STATEMENT = re.compile(r"^\s*(insert|update|delete|replace)\b", re.IGNORECASE)
+
+# Under the site directory unless `medwaste_profile_dir` is set in site config
+PROFILE_DIR = "medwaste_profiles"
+
+CPROFILE_LINES = 25
+
+def _profile_dir():
+    path = frappe.conf.get("medwaste_profile_dir") or frappe.get_site_path(PROFILE_DIR)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def _rowcount():
+    cursor = getattr(frappe.db, "_cursor", None)
+    return max(cint(getattr(cursor, "rowcount", 0)), 0)
+
+def _write_cprofile(session, name, position, profiler):
+    # The position keeps repeated calls of the same step apart
+    path = os.path.join(_profile_dir(), f"{session.name}-{session.started:%Y%m%d-%H%M%S}-{position}-{name}.prof")
+    profiler.dump_stats(path)
+    print(f"\n🔬 cProfile of {name} (full stats in {path}):")
+    pstats.Stats(profiler).sort_stats("cumulative").print_stats(CPROFILE_LINES)
+
+@contextmanager
+def profile_step(name):
+    """Measure the block as one step of the running profile
+
+        with profile_step("sync_meta"):
+            sync_meta(touched)
+
+    Does nothing outside profile_run. Steps can be nested: queries, rows
+    and memory of an inner step count towards the outer one too. The step
+    named by `medwaste_profile_step` in site config also runs under cProfile.
+    """
+
+    session = frappe.flags.medwaste_profile
+    if not session:
+        yield
+        return
+
+    record = frappe._dict(
+        step=name, depth=len(session.stack), wall_s=0.0, queries=0, sql_s=0.0,
+        rows_written=0, peak_kb=None, failed=False
+    )
+    position = len(session.steps)
+    session.steps.append(record)
+    parent = session.stack[-1] if session.stack else None
+
+    # tracemalloc keeps one peak, so it is reset per step and folded back
+    # into the enclosing step's peak on the way in and out
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        current, peak = tracemalloc.get_traced_memory()
+        if parent:
+            parent.peak_seen = max(parent.peak_seen, peak)
+        tracemalloc.reset_peak()
+        record.update(base=current, peak_seen=current)
+
+    def on_query(run_query, args, kwargs):
+        result = run_query(*args, **kwargs)
+        if WRITE_STATEMENT.match(str(args[0] if args else kwargs.get("query", ""))):
+            record.rows_written += _rowcount()
+        return result
+
+    profiler = cProfile.Profile() if name == session.cprofile_step else None
+    session.stack.append(record)
+    start = time.perf_counter()
+    try:
+        with track_sql(on_query) as stats:
+            if profiler:
+                profiler.enable()
+            try:
+                yield record
+            finally:
+                if profiler:
+                    profiler.disable()
+    except Exception:
+        record.failed = True
+        raise
+    finally:
+        record.wall_s = time.perf_counter() - start
+        record.queries = stats.queries
+        record.sql_s = stats.sql_time
+        session.stack.pop()
+
+        if tracing:
+            peak = max(record.pop("peak_seen"), tracemalloc.get_traced_memory()[1])
+            record.peak_kb = round((peak - record.pop("base")) / 1024, 1)
+            if parent:
+                parent.peak_seen = max(parent.peak_seen, peak)
+            tracemalloc.reset_peak()
+
+        if profiler:
+            _write_cprofile(session, name, position, profiler)
+
+@contextmanager
+def profile_run(name):
+    """Profile a whole setup run, then print the step table and write the JSON profile
+
+    A run started inside another one is recorded as a step of the outer
+    run, so the pipeline gets one table and one file for every script.
+    Peak memory comes from tracemalloc, which slows Python-heavy steps;
+    set `medwaste_profile_memory` to 0 in site config to leave it off, or
+    `medwaste_profile_disabled` to 1 to skip profiling altogether.
+    """
+
+    if frappe.conf.get("medwaste_profile_disabled"):
+        yield None
+        return
+
+    if frappe.flags.medwaste_profile:
+        with profile_step(name) as record:
+            yield record
+        return
+
+    session = frappe._dict(
+        name=name, started=now_datetime(), steps=[], stack=[],
+        cprofile_step=frappe.conf.get("medwaste_profile_step")
+    )
+    trace_memory = cint(frappe.conf.get("medwaste_profile_memory", 1)) and not tracemalloc.is_tracing()
+    if trace_memory:
+        tracemalloc.start()
+
+    frappe.flags.medwaste_profile = session
+    try:
+        with profile_step(name) as record:
+            yield record
+    finally:
+        frappe.flags.medwaste_profile = None
+        if trace_memory:
+            tracemalloc.stop()
+        print_profile(session)
+        write_profile(session)
+
+def print_profile(session):
+    """Print one row per step, indented under the step it ran in"""
+
+    print(f"\n⏱️  Profile of {session.name}:")
+    print(f"  {'Step':<44}{'Wall s':>9}{'Queries':>9}{'SQL s':>9}{'Rows written':>14}{'Peak KB':>11}")
+    for record in session.steps:
+        label = ("  " * record.depth + record.step + (" ❌" if record.failed else ""))[:43]
+        peak = f"{record.peak_kb:>11.1f}" if record.peak_kb is not None else f"{'-':>11}"
+        print(f"  {label:<44}{record.wall_s:>9.2f}{record.queries:>9}{record.sql_s:>9.2f}"
+              f"{record.rows_written:>14}{peak}")
+
+def write_profile(session):
+    """Write the steps as JSON next to earlier profiles; returns the path"""
+
+    path = os.path.join(_profile_dir(), f"{session.name}-{session.started:%Y%m%d-%H%M%S}.json")
+    with open(path, "w") as f:
+        json.dump({
+            "name": session.name,
+            "site": frappe.local.site,
+            "started": str(session.started),
+            "steps": [
+                {**record, "wall_s": round(record.wall_s, 4), "sql_s": round(record.sql_s, 4)}
+                for record in session.steps
+            ]
+        }, f, indent=1)
+
+    print(f"📝 Profile written to {path}")
+    return path
+
+def profiled(fn):
+    """Record every call of a setup step function as a step named after it"""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with profile_step(fn.__name__):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+def profiled_run(fn):
+    """Profile a setup script's main(), named after its module"""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with profile_run(fn.__module__):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+def run_profiled(method, step=None, **kwargs):
+    """Run a setup script with one of its steps under cProfile
+
+        bench --site frontend execute setup_profiler.run_profiled --kwargs "{'method': 'setup-manufacturing-workflows.main', 'step': 'create_bom_templates'}"
+    """
+
+    if step:
+        frappe.local.conf.medwaste_profile_step = step
+    return frappe.get_attr(method)(**kwargs)
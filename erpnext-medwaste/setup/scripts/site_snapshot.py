@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Site Snapshots
+Captures a configured site as a snapshot keyed by the setup it was built from
+"""
+
+import glob
+import hashlib
+import json
+import os
+import shutil
+
+import frappe
+from frappe.utils import now_datetime
+from frappe.utils.backups import new_backup
+
+import medwaste_spec
+import provisioning
+
+# Next to the sites, on the sites volume, so every bench container sees them
+SNAPSHOT_DIR = "medwaste_snapshots"
+
+KEY_DEFAULT = "medwaste_snapshot_key"
+
+def _app_versions():
+    return {
+        app: getattr(frappe.get_module(app), "__version__", None)
+        for app in ("frappe", "erpnext")
+    }
+
+def snapshot_key():
+    """Hash of everything a full setup run depends on
+
+    The spec sections, every script next to this one and the app versions:
+    a site set up from the same key is the same site, so its snapshot can
+    stand in for running the setup again. All scripts count, not only the
+    step entry points, since the steps import the helper modules.
+    """
+
+    scripts_dir = os.path.dirname(os.path.abspath(__file__))
+    sources = {}
+    for path in sorted(glob.glob(os.path.join(scripts_dir, "*.py"))):
+        with open(path, "rb") as f:
+            sources[os.path.basename(path)] = hashlib.sha1(f.read()).hexdigest()
+
+    payload = json.dumps({
+        "spec_version": medwaste_spec.SPEC_VERSION,
+        "sections": {name: provisioning.section_hash(name) for name in medwaste_spec.SECTIONS},
+        "scripts": sources,
+        "apps": _app_versions()
+    }, sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+def _snapshot_root():
+    return os.path.abspath(frappe.get_site_path("..", SNAPSHOT_DIR))
+
+def snapshot_path(key=None):
+    return os.path.join(_snapshot_root(), key or snapshot_key())
+
+def mark_provisioned():
+    """Record on the site that a full setup ran with the current key"""
+
+    frappe.db.set_default(KEY_DEFAULT, snapshot_key())
+    frappe.db.commit()
+
+def is_provisioned():
+    """Whether the site was fully set up from the current key
+
+        bench --site frontend execute site_snapshot.is_provisioned
+    """
+
+    return frappe.db.get_default(KEY_DEFAULT) == snapshot_key()
+
+def capture():
+    """Dump the database and site files of a set-up site as the snapshot for its key
+
+        bench --site frontend execute site_snapshot.capture
+
+    The site config is left out: a restored site gets its own database
+    credentials. An existing snapshot for the key is replaced.
+    """
+
+    key = snapshot_key()
+    if frappe.db.get_default(KEY_DEFAULT) != key:
+        frappe.throw("The site was not set up from the current scripts and spec; run setup_pipeline.run first")
+
+    target = snapshot_path(key)
+    staging = f"{target}.partial"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    print(f"📸 Capturing snapshot {key} from {frappe.local.site}...")
+    backup = new_backup(ignore_files=False, backup_path=staging, ignore_conf=True, force=True)
+
+    # Fixed names, so restoring needs nothing but the key
+    files = {
+        "database.sql.gz": backup.backup_path_db,
+        "public-files.tar": backup.backup_path_files,
+        "private-files.tar": backup.backup_path_private_files
+    }
+    for name, path in files.items():
+        os.replace(path, os.path.join(staging, name))
+
+    with open(os.path.join(staging, "manifest.json"), "w") as f:
+        json.dump({
+            "key": key,
+            "spec_version": medwaste_spec.SPEC_VERSION,
+            "apps": _app_versions(),
+            "source_site": frappe.local.site,
+            "captured_at": str(now_datetime()),
+            "files": sorted(files)
+        }, f, indent=1)
+
+    # Swapped in whole, so a restore never sees a half-written snapshot
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(staging, target)
+
+    print(f"✅ Snapshot {key} written to {target}")
+    return key
+
+def list_snapshots():
+    """Print the captured snapshots, marking the one matching the current key
+
+        bench --site frontend execute site_snapshot.list_snapshots
+    """
+
+    root = _snapshot_root()
+    current = snapshot_key()
+    for key in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+        manifest_path = os.path.join(root, key, "manifest.json")
+        if not os.path.exists(manifest_path):
+            continue
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        marker = "👉" if key == current else "  "
+        print(f"{marker} {key}  spec v{manifest['spec_version']}  from {manifest['source_site']}  {manifest['captured_at']}")
+
+if __name__ == "__main__":
+    # Run from the sites directory to get the key without a site:
+    #   ../env/bin/python ../site_snapshot.py
+    print(snapshot_key())
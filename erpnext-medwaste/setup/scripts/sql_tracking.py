@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Medical Waste SQL Tracking
+Counts and times the queries a block of code sends through frappe.db.sql
+"""
+
+import time
+from contextlib import contextmanager
+
+import frappe
+
+@contextmanager
+def track_sql(on_query=None):
+    """Count queries run inside the block
+
+        with track_sql() as stats:
+            run_report()
+        print(stats.queries, stats.sql_time)
+
+    Everything Frappe does with the database goes through frappe.db.sql,
+    so get_value, get_all and document saves are counted too. Blocks can
+    be nested; each one sees the queries run inside it.
+
+    `on_query(run_query, args, kwargs)` replaces the plain call when given,
+    for callers that need to look at each statement; it must call
+    `run_query(*args, **kwargs)` and return its result.
+    """
+
+    db = frappe.db
+    stats = frappe._dict(queries=0, sql_time=0.0)
+    shadowed = db.__dict__.get("sql")
+    original = db.sql
+
+    def tracked_sql(*args, **kwargs):
+        stats.queries += 1
+        start = time.perf_counter()
+        try:
+            if on_query:
+                return on_query(original, args, kwargs)
+            return original(*args, **kwargs)
+        finally:
+            stats.sql_time += time.perf_counter() - start
+
+    db.sql = tracked_sql
+    try:
+        yield stats
+    finally:
+        if shadowed is None:
+            del db.sql
+        else:
+            db.sql = shadowed
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Training Expiry Summary
+Maintains Training Record counts per department, training type and expiry date
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, getdate, today
+
+from doc_event_hooks import ensure_doc_event_hook
+
+COUNTS_TABLE = "__training_expiry_counts"
+RECORDS_TABLE = "__training_expiry_records"
+
+# (bucket, lower bound in days from today, upper bound exclusive)
+EXPIRY_BUCKETS = [
+    ("Expired", None, 0),
+    ("< 30 Days", 0, 30),
+    ("< 90 Days", 30, 90),
+    ("OK", 90, None)
+]
+
+def ensure_summary_tables():
+    """Create the count table and the per-record mirror it is derived from
+
+    Counts are kept per expiration_date rather than per bucket: buckets move
+    with the calendar, dates don't, so nothing needs recounting overnight.
+    """
+
+    frappe.db.sql_ddl(f"""
+        CREATE TABLE IF NOT EXISTS `{COUNTS_TABLE}` (
+            `department` VARCHAR(140) NOT NULL DEFAULT '',
+            `training_type` VARCHAR(140) NOT NULL DEFAULT '',
+            `expiration_date` DATE NOT NULL,
+            `record_count` INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (`department`, `training_type`, `expiration_date`),
+            KEY `expiration_date` (`expiration_date`)
+        ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC CHARACTER SET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    frappe.db.sql_ddl(f"""
+        CREATE TABLE IF NOT EXISTS `{RECORDS_TABLE}` (
+            `name` VARCHAR(140) NOT NULL,
+            `department` VARCHAR(140) NOT NULL DEFAULT '',
+            `training_type` VARCHAR(140) NOT NULL DEFAULT '',
+            `expiration_date` DATE NOT NULL,
+            PRIMARY KEY (`name`)
+        ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC CHARACTER SET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+def install_summary_hooks():
+    """Keep the counts current as Training Records change"""
+
+    for event in ("After Insert", "After Save", "After Delete"):
+        ensure_doc_event_hook(
+            f"Training Expiry Summary {event}", "Training Record", event,
+            "training_expiry_summary.sync_training_record"
+        )
+
+def _bump(key, delta):
+    frappe.db.sql(f"""
+        INSERT INTO `{COUNTS_TABLE}` (department, training_type, expiration_date, record_count)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE record_count = record_count + VALUES(record_count)
+    """, (*key, delta))
+
+@frappe.whitelist()
+def sync_training_record(doctype, name):
+    """Move one Training Record's contribution to match its current values
+
+    Compares the record with the mirror row it was last counted as, so the
+    call is idempotent and also handles edits and deletes.
+    """
+
+    if doctype != "Training Record":
+        return
+
+    current = frappe.db.get_value(
+        "Training Record", name, ["department", "training_type", "expiration_date"]
+    )
+    counted = frappe.db.sql(f"""
+        SELECT department, training_type, expiration_date
+        FROM `{RECORDS_TABLE}` WHERE name = %s FOR UPDATE
+    """, name)
+
+    new_key = None
+    if current and current[2]:
+        new_key = (current[0] or "", current[1] or "", current[2])
+    old_key = tuple(counted[0]) if counted else None
+
+    if new_key == old_key:
+        return
+
+    if old_key:
+        _bump(old_key, -1)
+        frappe.db.sql(f"DELETE FROM `{RECORDS_TABLE}` WHERE name = %s", name)
+    if new_key:
+        _bump(new_key, 1)
+        frappe.db.sql(f"""
+            INSERT INTO `{RECORDS_TABLE}` (name, department, training_type, expiration_date)
+            VALUES (%s, %s, %s, %s)
+        """, (name, *new_key))
+
+    frappe.db.sql(f"DELETE FROM `{COUNTS_TABLE}` WHERE record_count <= 0")
+
+def rebuild():
+    """Recount everything from Training Record
+
+        bench --site frontend execute training_expiry_summary.rebuild
+    """
+
+    ensure_summary_tables()
+    frappe.db.sql(f"DELETE FROM `{RECORDS_TABLE}`")
+    frappe.db.sql(f"DELETE FROM `{COUNTS_TABLE}`")
+
+    frappe.db.sql(f"""
+        INSERT INTO `{RECORDS_TABLE}` (name, department, training_type, expiration_date)
+        SELECT name, IFNULL(department, ''), IFNULL(training_type, ''), expiration_date
+        FROM `tabTraining Record`
+        WHERE expiration_date IS NOT NULL
+    """)
+    frappe.db.sql(f"""
+        INSERT INTO `{COUNTS_TABLE}` (department, training_type, expiration_date, record_count)
+        SELECT department, training_type, expiration_date, COUNT(*)
+        FROM `{RECORDS_TABLE}`
+        GROUP BY department, training_type, expiration_date
+    """)
+    frappe.db.commit()
+
+    record_count = frappe.db.sql(f"SELECT COUNT(*) FROM `{RECORDS_TABLE}`")[0][0]
+    print(f"✅ Training expiry summary rebuilt ({record_count} records)")
+
+def bucket_date_range(bucket):
+    """Return the (from, to-exclusive) expiration_date bounds of a bucket"""
+
+    for label, lower, upper in EXPIRY_BUCKETS:
+        if label == bucket:
+            return (
+                add_days(getdate(today()), lower) if lower is not None else None,
+                add_days(getdate(today()), upper) if upper is not None else None
+            )
+    frappe.throw(_("Unknown expiry bucket: {0}").format(bucket))
+
+def get_summary(department=None, training_type=None, expiry_bucket=None):
+    """Counts per (department, training_type, expiry bucket) from the aggregate
+
+    Each filter narrows the aggregate query; a bucket becomes an
+    expiration_date range, and only that bucket's counts are returned.
+    """
+
+    from_date, to_date = bucket_date_range(expiry_bucket) if expiry_bucket else (None, None)
+
+    bucket_columns = []
+    for label, lower, upper in EXPIRY_BUCKETS:
+        conditions = []
+        if lower is not None:
+            conditions.append(f"expiration_date >= DATE_ADD(CURDATE(), INTERVAL {lower} DAY)")
+        if upper is not None:
+            conditions.append(f"expiration_date < DATE_ADD(CURDATE(), INTERVAL {upper} DAY)")
+        bucket_columns.append(
+            f"SUM(CASE WHEN {' AND '.join(conditions)} THEN record_count ELSE 0 END) as `{label}`"
+        )
+
+    rows = frappe.db.sql(f"""
+        SELECT department, training_type, {", ".join(bucket_columns)}
+        FROM `{COUNTS_TABLE}`
+        WHERE (%(department)s IS NULL OR department = %(department)s)
+        AND (%(training_type)s IS NULL OR training_type = %(training_type)s)
+        AND (%(from_date)s IS NULL OR expiration_date >= %(from_date)s)
+        AND (%(to_date)s IS NULL OR expiration_date < %(to_date)s)
+        GROUP BY department, training_type
+        ORDER BY department, training_type
+    """, {
+        "department": department, "training_type": training_type,
+        "from_date": from_date, "to_date": to_date
+    }, as_dict=1)
+
+    data = []
+    for row in rows:
+        for label, _lower, _upper in EXPIRY_BUCKETS:
+            if expiry_bucket and label != expiry_bucket:
+                continue
+            if row[label]:
+                data.append(frappe._dict(
+                    department=row.department,
+                    training_type=row.training_type,
+                    expiry_bucket=label,
+                    record_count=int(row[label])
+                ))
+    return data
+
+def main():
+    """Install the summary tables and hooks and count existing records"""
+    try:
+        print("🎓 Installing training expiry summary...")
+        ensure_summary_tables()
+        install_summary_hooks()
+        rebuild()
+        print("✅ Training expiry summary installed")
+
+    except Exception as e:
+        print(f"❌ Error installing training expiry summary: {str(e)}")
+        frappe.db.rollback()
+        raise
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Tree Loader
+Loads whole Item Group / Warehouse hierarchies and numbers the nested set once
+"""
+
+import frappe
+
+from bulk_apply import key_of
+
+# Any non-zero bounds make NestedSet treat a node as already placed
+PENDING_BOUND = -1
+
+UPDATE_CHUNK = 500
+
+def _parent_field(doctype):
+    return getattr(frappe.new_doc(doctype), "nsm_parent_field", None) or f"parent_{frappe.scrub(doctype)}"
+
+def _names_by_key(doctype, records, key, parent_field):
+    """Saved name of every node the records mention, as node or as parent, by key"""
+
+    values = {record.get(key) for record in records} | {record.get(parent_field) for record in records}
+    values.discard(None)
+    return {
+        row[key]: row.name
+        for row in frappe.get_all(doctype, filters={key: ["in", list(values)]}, fields=list({"name", key}))
+    }
+
+def rebuild_bounds(doctype, parent_field=None):
+    """Number lft/rgt for the whole tree in one pass, writing only nodes that moved
+
+    Siblings are ordered by name, as Frappe's rebuild_tree does.
+    """
+
+    parent_field = parent_field or _parent_field(doctype)
+    rows = frappe.db.sql(f"SELECT name, `{parent_field}`, lft, rgt FROM `tab{doctype}` ORDER BY name")
+
+    children = {}
+    current = {}
+    for name, parent, lft, rgt in rows:
+        children.setdefault(parent or "", []).append(name)
+        current[name] = (lft, rgt)
+
+    lefts = {}
+    bounds = {}
+    counter = 1
+    stack = [(name, False) for name in reversed(children.get("", []))]
+    while stack:
+        name, leaving = stack.pop()
+        if leaving:
+            bounds[name] = (lefts[name], counter)
+        else:
+            lefts[name] = counter
+            stack.append((name, True))
+            stack.extend((child, False) for child in reversed(children.get(name, [])))
+        counter += 1
+
+    moved = [(name, lft, rgt) for name, (lft, rgt) in bounds.items() if current[name] != (lft, rgt)]
+    for start in range(0, len(moved), UPDATE_CHUNK):
+        chunk = moved[start:start + UPDATE_CHUNK]
+        cases = " ".join(["WHEN %s THEN %s"] * len(chunk))
+        frappe.db.sql(f"""
+            UPDATE `tab{doctype}`
+            SET lft = CASE name {cases} END,
+                rgt = CASE name {cases} END
+            WHERE name IN ({", ".join(["%s"] * len(chunk))})
+        """, (
+            [value for name, lft, _rgt in chunk for value in (name, lft)]
+            + [value for name, _lft, rgt in chunk for value in (name, rgt)]
+            + [name for name, _lft, _rgt in chunk]
+        ))
+
+    return len(moved)
+
+def load_tree(doctype, records, key="name"):
+    """Insert the missing nodes of a hierarchy, then number the nested set once
+
+        load_tree("Item Group", [
+            {"item_group_name": "Medical Waste", "parent_item_group": "All Item Groups", "is_group": 1},
+            ...
+        ], key="item_group_name")
+
+    NestedSet shifts lft/rgt of every node to the right of a new one on each
+    insert, so loading a few hundred nodes rewrote the tree a few hundred
+    times. Here nodes are inserted with placeholder bounds and the tree is
+    numbered once at the end. Records go through Document.insert() in the
+    order given, parents before children, so validation and naming still run.
+
+    Parents may be given by `key` (e.g. warehouse_name) and are resolved to
+    the name the parent was saved under, such as "All Warehouses - MW".
+    Nothing is committed here; the calling script commits or rolls back.
+    """
+
+    parent_field = _parent_field(doctype)
+    names = _names_by_key(doctype, records, key, parent_field)
+    present = {key_of(record, key) for record in records} & set(names)
+
+    created = 0
+    try:
+        for record in records:
+            record_key = key_of(record, key)
+            if record_key in present:
+                continue
+
+            doc = frappe.get_doc({"doctype": doctype, **record})
+            if doc.get(parent_field) in names:
+                doc.set(parent_field, names[doc.get(parent_field)])
+            doc.lft = doc.rgt = PENDING_BOUND
+            doc.set(getattr(doc, "nsm_oldparent_field", "old_parent"), doc.get(parent_field))
+            doc.insert()
+
+            names[record_key] = doc.name
+            present.add(record_key)
+            created += 1
+    finally:
+        # Also after a failed insert, so the nodes already saved get real bounds
+        if created:
+            rebuild_bounds(doctype, parent_field)
+
+    print(f"{'✅' if created else '⚠️ '} {doctype}: {created} created, {len(records) - created} already present")
+    return frappe._dict(created=created, skipped=len(records) - created)
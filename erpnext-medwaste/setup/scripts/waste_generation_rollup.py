@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Medical Waste Generation Daily Rollup
+Maintains per-day waste generation totals behind the Medical Waste Generation Report
+"""
+
+import frappe
+from frappe.utils import getdate
+
+import report_cache
+from doc_event_hooks import ensure_doc_event_hook
+
+ROLLUP_TABLE = "__waste_generation_daily"
+VOUCHER_TABLE = "__waste_generation_vouchers"
+# What each applied voucher added to the rollup, so a cancel removes exactly that
+VOUCHER_ROWS_TABLE = "__waste_generation_voucher_rows"
+COVERAGE_TABLE = "__waste_generation_coverage"
+
+# Backfilling without a start date covers the whole ledger
+FULL_HISTORY = "1900-01-01"
+
+def ensure_rollup_tables():
+    """Create the rollup, applied-voucher, voucher-rows and coverage tables if missing"""
+
+    frappe.db.sql_ddl(f"""
+        CREATE TABLE IF NOT EXISTS `{ROLLUP_TABLE}` (
+            `posting_date` DATE NOT NULL,
+            `item_code` VARCHAR(140) NOT NULL,
+            `warehouse` VARCHAR(140) NOT NULL DEFAULT '',
+            `generation_department` VARCHAR(140) NOT NULL DEFAULT '',
+            `qty` DECIMAL(21,9) NOT NULL DEFAULT 0,
+            `entry_count` INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (`posting_date`, `item_code`, `warehouse`, `generation_department`),
+            KEY `item_code_posting_date` (`item_code`, `posting_date`)
+        ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC CHARACTER SET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    frappe.db.sql_ddl(f"""
+        CREATE TABLE IF NOT EXISTS `{VOUCHER_TABLE}` (
+            `voucher_no` VARCHAR(140) NOT NULL,
+            `posting_date` DATE NOT NULL,
+            PRIMARY KEY (`voucher_no`),
+            KEY `posting_date` (`posting_date`)
+        ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC CHARACTER SET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    rows_table_existed = frappe.db.sql("SHOW TABLES LIKE %s", VOUCHER_ROWS_TABLE.replace("_", "\\_"))
+    frappe.db.sql_ddl(f"""
+        CREATE TABLE IF NOT EXISTS `{VOUCHER_ROWS_TABLE}` (
+            `voucher_no` VARCHAR(140) NOT NULL,
+            `posting_date` DATE NOT NULL,
+            `item_code` VARCHAR(140) NOT NULL,
+            `warehouse` VARCHAR(140) NOT NULL DEFAULT '',
+            `generation_department` VARCHAR(140) NOT NULL DEFAULT '',
+            `qty` DECIMAL(21,9) NOT NULL DEFAULT 0,
+            `entry_count` INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (`voucher_no`, `posting_date`, `item_code`, `warehouse`, `generation_department`),
+            KEY `posting_date` (`posting_date`)
+        ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC CHARACTER SET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    if not rows_table_existed:
+        # Vouchers applied before the table existed: their live ledger rows
+        # are what they added
+        _record_voucher_rows(f"sle.voucher_no IN (SELECT voucher_no FROM `{VOUCHER_TABLE}`)")
+
+    frappe.db.sql_ddl(f"""
+        CREATE TABLE IF NOT EXISTS `{COVERAGE_TABLE}` (
+            `id` TINYINT NOT NULL,
+            `covered_from` DATE NOT NULL,
+            PRIMARY KEY (`id`)
+        ) ENGINE=InnoDB
+    """)
+
+def install_rollup_hooks():
+    """Keep the rollup current on Stock Entry submit and cancel"""
+
+    ensure_doc_event_hook(
+        "Waste Generation Rollup Submit", "Stock Entry", "After Submit",
+        "waste_generation_rollup.sync_stock_entry"
+    )
+    ensure_doc_event_hook(
+        "Waste Generation Rollup Cancel", "Stock Entry", "After Cancel",
+        "waste_generation_rollup.sync_stock_entry"
+    )
+
+def get_covered_from():
+    """Return the first posting date the rollup is complete from, or None"""
+
+    covered_from = frappe.db.sql(
+        f"SELECT covered_from FROM `{COVERAGE_TABLE}` WHERE id = 1"
+    )
+    return getdate(covered_from[0][0]) if covered_from else None
+
+def _record_voucher_rows(condition, params=None):
+    """Store what the matching Stock Entries add to the rollup, per voucher
+
+    Only live positive rows count. Cancelled rows are left out: on cancel
+    ERPNext adds reversal rows with the quantity negated, which turns the
+    source lines of a transfer or repack positive.
+    """
+
+    frappe.db.sql(f"""
+        INSERT IGNORE INTO `{VOUCHER_ROWS_TABLE}`
+            (voucher_no, posting_date, item_code, warehouse, generation_department, qty, entry_count)
+        SELECT
+            sle.voucher_no,
+            sle.posting_date,
+            sle.item_code,
+            IFNULL(sle.warehouse, ''),
+            IFNULL(sle.generation_department, ''),
+            SUM(sle.actual_qty),
+            COUNT(*)
+        FROM `tabStock Ledger Entry` sle
+        WHERE sle.voucher_type = 'Stock Entry'
+        AND sle.is_cancelled = 0
+        AND sle.actual_qty > 0
+        AND {condition}
+        GROUP BY sle.voucher_no, sle.posting_date, sle.item_code, sle.warehouse, sle.generation_department
+    """, params)
+
+def _voucher_rows(voucher_no):
+    """The rollup rows stored for an applied Stock Entry"""
+
+    return frappe.db.sql(f"""
+        SELECT posting_date, item_code, warehouse, generation_department, qty, entry_count
+        FROM `{VOUCHER_ROWS_TABLE}`
+        WHERE voucher_no = %s
+    """, voucher_no, as_dict=1)
+
+def _apply_rows(rows, sign):
+    """Add (sign=1) or remove (sign=-1) aggregated rows from the rollup"""
+
+    for row in rows:
+        frappe.db.sql(f"""
+            INSERT INTO `{ROLLUP_TABLE}`
+                (posting_date, item_code, warehouse, generation_department, qty, entry_count)
+            VALUES (%(posting_date)s, %(item_code)s, %(warehouse)s, %(generation_department)s,
+                %(qty)s, %(entry_count)s)
+            ON DUPLICATE KEY UPDATE
+                qty = qty + VALUES(qty),
+                entry_count = entry_count + VALUES(entry_count)
+        """, {
+            "posting_date": row.posting_date,
+            "item_code": row.item_code,
+            "warehouse": row.warehouse,
+            "generation_department": row.generation_department,
+            "qty": sign * row.qty,
+            "entry_count": sign * row.entry_count
+        })
+
+    if sign < 0 and rows:
+        frappe.db.sql(f"DELETE FROM `{ROLLUP_TABLE}` WHERE entry_count <= 0")
+
+@frappe.whitelist()
+def sync_stock_entry(doctype, name):
+    """Bring the rollup in line with a Stock Entry's current ledger state
+
+    Idempotent: the applied-voucher table records which entries are already
+    counted, so repeated calls for the same submit or cancel change nothing.
+    """
+
+    if doctype != "Stock Entry":
+        return
+
+    is_active = frappe.db.exists("Stock Ledger Entry", {
+        "voucher_type": "Stock Entry",
+        "voucher_no": name,
+        "is_cancelled": 0
+    })
+    is_applied = frappe.db.sql(
+        f"SELECT voucher_no FROM `{VOUCHER_TABLE}` WHERE voucher_no = %s FOR UPDATE", name
+    )
+
+    if is_active and not is_applied:
+        _record_voucher_rows("sle.voucher_no = %(voucher_no)s", {"voucher_no": name})
+        _apply_rows(_voucher_rows(name), 1)
+        frappe.db.sql(
+            f"INSERT INTO `{VOUCHER_TABLE}` (voucher_no, posting_date) VALUES (%s, %s)",
+            (name, frappe.db.get_value("Stock Entry", name, "posting_date"))
+        )
+    elif is_applied and not is_active:
+        # Exactly what the submit added; the ledger now also holds the reversals
+        _apply_rows(_voucher_rows(name), -1)
+        frappe.db.sql(f"DELETE FROM `{VOUCHER_ROWS_TABLE}` WHERE voucher_no = %s", name)
+        frappe.db.sql(f"DELETE FROM `{VOUCHER_TABLE}` WHERE voucher_no = %s", name)
+
+def backfill(from_date=None):
+    """Rebuild the rollup from the Stock Ledger for every date from `from_date` on
+
+    Run once after installing the hooks:
+        bench --site frontend execute waste_generation_rollup.backfill
+        bench --site frontend execute waste_generation_rollup.backfill --kwargs "{'from_date': '2023-01-01'}"
+    """
+
+    ensure_rollup_tables()
+    install_rollup_hooks()
+
+    from_date = getdate(from_date or FULL_HISTORY)
+    params = {"from_date": from_date}
+
+    print(f"🔄 Rebuilding waste generation rollup from {from_date}...")
+    frappe.db.sql(f"DELETE FROM `{ROLLUP_TABLE}` WHERE posting_date >= %(from_date)s", params)
+    frappe.db.sql(f"DELETE FROM `{VOUCHER_TABLE}` WHERE posting_date >= %(from_date)s", params)
+    frappe.db.sql(f"DELETE FROM `{VOUCHER_ROWS_TABLE}` WHERE posting_date >= %(from_date)s", params)
+
+    frappe.db.sql(f"""
+        INSERT INTO `{ROLLUP_TABLE}`
+            (posting_date, item_code, warehouse, generation_department, qty, entry_count)
+        SELECT
+            sle.posting_date,
+            sle.item_code,
+            IFNULL(sle.warehouse, ''),
+            IFNULL(sle.generation_department, ''),
+            SUM(sle.actual_qty),
+            COUNT(*)
+        FROM `tabStock Ledger Entry` sle
+        WHERE sle.voucher_type = 'Stock Entry'
+        AND sle.is_cancelled = 0
+        AND sle.actual_qty > 0
+        AND sle.posting_date >= %(from_date)s
+        GROUP BY sle.posting_date, sle.item_code, sle.warehouse, sle.generation_department
+    """, params)
+
+    frappe.db.sql(f"""
+        INSERT IGNORE INTO `{VOUCHER_TABLE}` (voucher_no, posting_date)
+        SELECT sle.voucher_no, MIN(sle.posting_date)
+        FROM `tabStock Ledger Entry` sle
+        WHERE sle.voucher_type = 'Stock Entry'
+        AND sle.is_cancelled = 0
+        AND sle.actual_qty > 0
+        AND sle.posting_date >= %(from_date)s
+        GROUP BY sle.voucher_no
+    """, params)
+    _record_voucher_rows("sle.posting_date >= %(from_date)s", params)
+
+    covered_from = get_covered_from()
+    if covered_from is None or from_date < covered_from:
+        frappe.db.sql(f"""
+            INSERT INTO `{COVERAGE_TABLE}` (id, covered_from) VALUES (1, %(from_date)s)
+            ON DUPLICATE KEY UPDATE covered_from = VALUES(covered_from)
+        """, params)
+
+    frappe.db.commit()
+    report_cache.invalidate_report("Medical Waste Generation Report")
+    row_count = frappe.db.sql(f"SELECT COUNT(*) FROM `{ROLLUP_TABLE}`")[0][0]
+    print(f"✅ Waste generation rollup rebuilt ({row_count} daily rows)")
+
+def main():
+    """Install the rollup tables and hooks; run backfill() separately"""
+    try:
+        print("📊 Installing waste generation rollup...")
+        ensure_rollup_tables()
+        install_rollup_hooks()
+        frappe.db.commit()
+        print("✅ Waste generation rollup installed")
+
+    except Exception as e:
+        print(f"❌ Error installing waste generation rollup: {str(e)}")
+        frappe.db.rollback()
+        raise
+
+if __name__ == "__main__":
+    main()
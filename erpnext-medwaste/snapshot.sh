@@ -0,0 +1,83 @@
+#!/bin/bash
+# Capture a set-up site as a snapshot, or create a new site from one
+#   ./snapshot.sh capture [site]      (default: frontend)
+#   ./snapshot.sh new-site <site>     restore the snapshot matching the current
+#                                     scripts and spec, or set the site up and
+#                                     capture one when there is none yet
+#   ./snapshot.sh list
+
+BENCH=/home/frappe/frappe-bench
+SNAPSHOTS=$BENCH/sites/medwaste_snapshots
+
+# Load environment variables
+if [ -f .env ]; then
+    set -a
+    source .env
+    set +a
+fi
+
+copy_scripts() {
+    echo "📁 Copying setup scripts to container..."
+    docker compose cp setup/scripts/. backend:$BENCH/
+    docker compose cp setup/scripts/. queue-long:$BENCH/
+}
+
+case "$1" in
+    capture)
+        SITE=${2:-frontend}
+        copy_scripts
+        if ! docker compose exec backend bench --site "$SITE" execute site_snapshot.capture; then
+            echo "❌ Snapshot capture failed, see the output above"
+            exit 1
+        fi
+        ;;
+
+    new-site)
+        SITE=$2
+        if [ -z "$SITE" ]; then
+            echo "Usage: ./snapshot.sh new-site <site>"
+            exit 1
+        fi
+        copy_scripts
+
+        # The key needs no site: it hashes the spec, scripts and app versions
+        KEY=$(docker compose exec -T -w $BENCH/sites backend ../env/bin/python ../site_snapshot.py | tail -n 1 | tr -d '\r')
+        SNAPSHOT=$SNAPSHOTS/$KEY
+
+        if docker compose exec -T backend test -f "$SNAPSHOT/manifest.json"; then
+            echo "⚡ Restoring snapshot $KEY into $SITE..."
+            # restore creates the site when it doesn't exist yet
+            if ! docker compose exec backend bench --site "$SITE" restore "$SNAPSHOT/database.sql.gz" \
+                --with-public-files "$SNAPSHOT/public-files.tar" \
+                --with-private-files "$SNAPSHOT/private-files.tar" \
+                --mariadb-root-password "$DB_ROOT_PASSWORD" \
+                --admin-password "$ADMIN_PASSWORD" \
+                --force; then
+                echo "❌ Restore failed, see the output above"
+                exit 1
+            fi
+        else
+            echo "🏗️  No snapshot for $KEY yet; setting $SITE up from scratch..."
+            if ! docker compose exec backend bench new-site "$SITE" \
+                --mariadb-root-password "$DB_ROOT_PASSWORD" \
+                --admin-password "$ADMIN_PASSWORD" \
+                --install-app "${INSTALL_APPS:-erpnext}" \
+                || ! docker compose exec backend bench --site "$SITE" execute setup_pipeline.run \
+                || ! docker compose exec backend bench --site "$SITE" execute site_snapshot.capture; then
+                echo "❌ Setup failed, see the output above"
+                exit 1
+            fi
+        fi
+        echo "✅ Site $SITE is ready"
+        ;;
+
+    list)
+        copy_scripts
+        docker compose exec backend bench --site "${2:-frontend}" execute site_snapshot.list_snapshots
+        ;;
+
+    *)
+        echo "Usage: ./snapshot.sh capture [site] | new-site <site> | list [site]"
+        exit 1
+        ;;
+esac